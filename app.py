@@ -8,11 +8,13 @@ from routes.acompanhamentos_routes import acompanhamentos_routes
 from routes.auth_routes import auth_bp
 from routes.planos_routes import planos_routes
 from routes.cep_routes import cep_routes
+from routes.sync_routes import sync_routes
 """ from routes.routes_setor import bp as setor_bp """
 from routes.routes_setor import setores_funcoes_bp
 from routes.routes_setor import bp as setores_bp
 from flasgger import Swagger
 from config import Config
+from json_provider import FastJSONProvider
 
 from flask_migrate import Migrate
 
@@ -28,6 +30,9 @@ except ImportError as e:
 app = Flask(__name__, template_folder='../cuidar-plus/cuidar-plus', static_folder='../cuidar-plus/cuidar-plus')
 app.config.from_object(Config)
 
+# Codificação JSON das respostas (orjson quando disponível)
+app.json = FastJSONProvider(app)
+
 # Configurar CORS
 CORS(app, resources=Config.CORS_RESOURCES, supports_credentials=True)
 
@@ -156,6 +161,7 @@ app.register_blueprint(convenios_routes)
 app.register_blueprint(acompanhamentos_routes)
 app.register_blueprint(planos_routes)
 app.register_blueprint(cep_routes)
+app.register_blueprint(sync_routes)
 """ app.register_blueprint(setor_bp)
 app.register_blueprint(setores_funcoes_bp) """
 app.register_blueprint(setores_bp)
@@ -42,3 +42,62 @@ class Config:
             "supports_credentials": True,
         }
     }
+
+    # Cache local de consultas de CEP (ViaCEP)
+    CEP_CACHE_MAX_SIZE = int(os.getenv('CEP_CACHE_MAX_SIZE', 5000))
+    CEP_CACHE_TTL = int(os.getenv('CEP_CACHE_TTL', 86400))  # segundos
+    CEP_CACHE_NEGATIVE_TTL = int(os.getenv('CEP_CACHE_NEGATIVE_TTL', 3600))  # segundos
+
+    # Base offline de CEPs (snapshot SQLite gerado por scripts/importar_base_cep.py)
+    CEP_OFFLINE_DB = os.getenv('CEP_OFFLINE_DB', os.path.join(BASE_DIR, 'data', 'cep.sqlite'))
+    CEP_OFFLINE_CHECK_INTERVAL = int(os.getenv('CEP_OFFLINE_CHECK_INTERVAL', 30))  # segundos
+
+    # Cliente HTTP para serviços externos (ViaCEP, ip-api)
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))  # segundos
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 5))  # segundos
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))
+    HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', 0.2))  # segundos
+    HTTP_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('HTTP_CIRCUIT_FAILURE_THRESHOLD', 5))
+    HTTP_CIRCUIT_RESET_TIMEOUT = int(os.getenv('HTTP_CIRCUIT_RESET_TIMEOUT', 30))  # segundos
+
+    # Consulta de CEPs em lote (POST /cep/lote)
+    CEP_LOTE_MAX = int(os.getenv('CEP_LOTE_MAX', 500))
+    CEP_LOTE_CONCORRENCIA = int(os.getenv('CEP_LOTE_CONCORRENCIA', 8))
+
+    # Exportação de pacientes (GET /pacientes/exportar)
+    PACIENTES_EXPORT_CHUNK_SIZE = int(os.getenv('PACIENTES_EXPORT_CHUNK_SIZE', 1000))
+
+    # Registro de acompanhamentos em lote (POST /acompanhamentos/lote)
+    ACOMPANHAMENTOS_LOTE_MAX = int(os.getenv('ACOMPANHAMENTOS_LOTE_MAX', 1000))
+
+    # Sincronização incremental (GET /sync): alterações mais recentes que a
+    # margem ficam para a próxima chamada, evitando pular transações em andamento
+    SYNC_MARGEM_SEGUNDOS = int(os.getenv('SYNC_MARGEM_SEGUNDOS', 5))
+
+    # Retenção das marcas de exclusão (registro_excluido); clientes com marca
+    # d'água mais antiga precisam de sincronização completa
+    REGISTRO_EXCLUIDO_RETENCAO_DIAS = int(os.getenv('REGISTRO_EXCLUIDO_RETENCAO_DIAS', 90))
+
+    # Cache local das respostas dos catálogos (convênios/planos, setores/funções)
+    CATALOGO_CACHE_MAX_ENTRADAS = int(os.getenv('CATALOGO_CACHE_MAX_ENTRADAS', 512))
+
+    # Contadores de pacientes por convênio/plano/status mantidos pelos eventos
+    # do modelo; ao habilitar, execute scripts/recalcular_contagem_pacientes.py
+    PACIENTES_CONTADORES = os.getenv('PACIENTES_CONTADORES', 'false').lower() in ('1', 'true')
+
+    # Argon2 (hash e verificação de senhas). Ajuste por implantação medindo com
+    # scripts/benchmark_argon2.py; hashes antigos são refeitos no login
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 3))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 65536))  # KiB
+    ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 4))
+    # Pool dedicado: no máximo ARGON2_WORKERS operações simultâneas e
+    # ARGON2_FILA_MAX aguardando; acima disso o login responde 503
+    ARGON2_WORKERS = int(os.getenv('ARGON2_WORKERS', os.cpu_count() or 2))
+    ARGON2_FILA_MAX = int(os.getenv('ARGON2_FILA_MAX', 32))
+    ARGON2_ESPERA_MAX = float(os.getenv('ARGON2_ESPERA_MAX', 5))  # segundos
+
+    # Rehash de senhas em segundo plano após o login (fila local por processo)
+    REHASH_FILA_MAX = int(os.getenv('REHASH_FILA_MAX', 1000))
+    REHASH_TENTATIVAS = int(os.getenv('REHASH_TENTATIVAS', 3))
+    REHASH_BACKOFF = float(os.getenv('REHASH_BACKOFF', 0.5))  # segundos
@@ -0,0 +1,111 @@
+"""
+Codificação e decodificação de JSON da aplicação.
+
+Usa orjson quando instalado e a biblioteca padrão caso contrário, com a mesma
+saída nos dois casos: JSON compacto em UTF-8, datas e horas em ISO 8601 e
+Decimal como texto. É usado nas respostas do Flask (FastJSONProvider) e nas
+colunas JSON dos modelos (dumps/loads).
+"""
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(obj):
+    """Tipos não suportados nativamente pelo codificador"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if not HAS_ORJSON:
+        if isinstance(obj, (datetime, date, time)):
+            return obj.isoformat()
+        if isinstance(obj, uuid.UUID):
+            return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+def dumps_bytes(obj, sort_keys=False):
+    """Codifica obj em JSON (bytes UTF-8)"""
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+    return dumps(obj, sort_keys=sort_keys).encode('utf-8')
+
+
+def _chaves_em_texto(obj):
+    """Converte as chaves dos dicionários para texto, como o JSON as representa"""
+    if isinstance(obj, dict):
+        return {json.dumps(k) if not isinstance(k, str) else k: _chaves_em_texto(v)
+                for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_chaves_em_texto(v) for v in obj]
+    return obj
+
+
+def dumps(obj, sort_keys=False):
+    """Codifica obj em JSON (texto)"""
+    if HAS_ORJSON:
+        return dumps_bytes(obj, sort_keys=sort_keys).decode('utf-8')
+    try:
+        return json.dumps(obj, default=_default, sort_keys=sort_keys,
+                          ensure_ascii=False, separators=(',', ':'))
+    except TypeError:
+        if not sort_keys:
+            raise
+        # Chaves de tipos diferentes (ex: int e str) não podem ser ordenadas
+        return json.dumps(_chaves_em_texto(obj), default=_default, sort_keys=True,
+                          ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(data):
+    """
+    Decodifica um texto ou bytes JSON.
+
+    :raises json.JSONDecodeError: se o conteúdo for inválido (orjson.JSONDecodeError
+                                  é subclasse dela)
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Provider JSON do Flask baseado em dumps/loads deste módulo.
+
+    Respeita a configuração sort_keys do provider. Respostas formatadas para
+    leitura (modo debug com indentação) continuam usando o codificador padrão.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() - {'sort_keys'}:
+            # Opções de formatação específicas da biblioteca padrão
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys))
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(obj)
+        return self._app.response_class(
+            dumps_bytes(obj, sort_keys=self.sort_keys), mimetype=self.mimetype
+        )
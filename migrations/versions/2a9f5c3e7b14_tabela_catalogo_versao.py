@@ -0,0 +1,38 @@
+"""Tabela catalogo_versao (versões dos catálogos para ETag e cache)
+
+Revision ID: 2a9f5c3e7b14
+Revises: 6c1d7e4b9f08
+Create Date: 2026-10-18 13:24:39.381562
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a9f5c3e7b14'
+down_revision = '6c1d7e4b9f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalogo_versao = op.create_table('catalogo_versao',
+    sa.Column('nome', sa.String(length=50), nullable=False),
+    sa.Column('versao', sa.Integer(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('nome')
+    )
+    # Uma linha por catálogo desde o início: o incremento é sempre um UPDATE e
+    # duas primeiras gravações concorrentes não disputam o INSERT da linha
+    agora = datetime.utcnow()
+    op.bulk_insert(catalogo_versao, [
+        {'nome': 'convenios', 'versao': 1, 'atualizado_em': agora},
+        {'nome': 'setores', 'versao': 1, 'atualizado_em': agora},
+    ])
+
+
+def downgrade():
+    op.drop_table('catalogo_versao')
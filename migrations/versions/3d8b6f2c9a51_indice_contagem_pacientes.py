@@ -0,0 +1,26 @@
+"""Índice das contagens de pacientes por convênio, plano e status
+
+Revision ID: 3d8b6f2c9a51
+Revises: 7a2c9e5d3f18
+Create Date: 2026-10-18 12:02:14.518230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8b6f2c9a51'
+down_revision = '7a2c9e5d3f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('paciente', schema=None) as batch_op:
+        batch_op.create_index('ix_paciente_convenio_plano_status', ['convenio_id', 'plano_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('paciente', schema=None) as batch_op:
+        batch_op.drop_index('ix_paciente_convenio_plano_status')
@@ -0,0 +1,51 @@
+"""Tabela paciente_ngram (índice de trigramas para busca por trecho)
+
+Revision ID: 4f6b2d8e1a37
+Revises: 3d8b6f2c9a51
+Create Date: 2026-10-18 13:05:21.640117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from models.paciente_ngram import PacienteNgram
+
+
+# revision identifiers, used by Alembic.
+revision = '4f6b2d8e1a37'
+down_revision = '3d8b6f2c9a51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('paciente_ngram',
+    sa.Column('paciente_id', sa.Integer(), nullable=False),
+    sa.Column('campo', sa.String(length=10), nullable=False),
+    sa.Column('ngram', sa.String(length=3), nullable=False),
+    sa.ForeignKeyConstraint(['paciente_id'], ['paciente.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('paciente_id', 'campo', 'ngram')
+    )
+    with op.batch_alter_table('paciente_ngram', schema=None) as batch_op:
+        batch_op.create_index('ix_paciente_ngram_busca', ['campo', 'ngram', 'paciente_id'], unique=False)
+
+    # Indexa os pacientes existentes: a busca por trecho filtra pelos
+    # candidatos do índice e, sem ele, não encontraria nenhum paciente
+    bind = op.get_bind()
+    paciente_ngram = sa.table('paciente_ngram', sa.column('paciente_id'), sa.column('campo'), sa.column('ngram'))
+    paciente = sa.table('paciente', sa.column('id'), sa.column('nome_completo'), sa.column('cpf'))
+    linhas = []
+    for id_, nome, cpf in bind.execute(sa.select(paciente.c.id, paciente.c.nome_completo, paciente.c.cpf)).all():
+        linhas.extend(PacienteNgram.linhas_paciente(id_, nome, cpf))
+        if len(linhas) >= 20000:
+            bind.execute(paciente_ngram.insert(), linhas)
+            linhas = []
+    if linhas:
+        bind.execute(paciente_ngram.insert(), linhas)
+
+
+def downgrade():
+    with op.batch_alter_table('paciente_ngram', schema=None) as batch_op:
+        batch_op.drop_index('ix_paciente_ngram_busca')
+
+    op.drop_table('paciente_ngram')
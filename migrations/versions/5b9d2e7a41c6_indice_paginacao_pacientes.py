@@ -0,0 +1,26 @@
+"""Índice para paginação por cursor de pacientes
+
+Revision ID: 5b9d2e7a41c6
+Revises: c3e5a8f1d2b4
+Create Date: 2026-10-18 11:03:17.552914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9d2e7a41c6'
+down_revision = 'c3e5a8f1d2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('paciente', schema=None) as batch_op:
+        batch_op.create_index('ix_paciente_nome_completo_id', ['nome_completo', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('paciente', schema=None) as batch_op:
+        batch_op.drop_index('ix_paciente_nome_completo_id')
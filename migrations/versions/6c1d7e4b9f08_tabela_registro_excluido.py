@@ -0,0 +1,37 @@
+"""Tabela registro_excluido (marcas de exclusão do feed de sincronização)
+
+Revision ID: 6c1d7e4b9f08
+Revises: b8e3f1a6c942
+Create Date: 2026-10-18 13:18:02.955410
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1d7e4b9f08'
+down_revision = 'b8e3f1a6c942'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('registro_excluido',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entidade', sa.String(length=30), nullable=False),
+    sa.Column('registro_id', sa.Integer(), nullable=False),
+    sa.Column('excluido_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('registro_excluido', schema=None) as batch_op:
+        batch_op.create_index('ix_registro_excluido_excluido_em_id', ['excluido_em', 'id'], unique=False)
+        batch_op.create_index('ix_registro_excluido_entidade_excluido_em', ['entidade', 'excluido_em'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('registro_excluido', schema=None) as batch_op:
+        batch_op.drop_index('ix_registro_excluido_entidade_excluido_em')
+        batch_op.drop_index('ix_registro_excluido_excluido_em_id')
+
+    op.drop_table('registro_excluido')
@@ -0,0 +1,40 @@
+"""Índices de updated_at para o feed de sincronização
+
+Revision ID: 7a2c9e5d3f18
+Revises: e1f4c7b09a23
+Create Date: 2026-10-18 11:41:06.874120
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2c9e5d3f18'
+down_revision = 'e1f4c7b09a23'
+branch_labels = None
+depends_on = None
+
+TABELAS = ('paciente', 'convenio', 'plano', 'acompanhamento')
+
+
+def upgrade():
+    # Registros sem updated_at ficariam fora do feed
+    agora = datetime.utcnow()
+    for nome in TABELAS:
+        tabela = sa.table(nome, sa.column('created_at'), sa.column('updated_at'))
+        op.execute(
+            tabela.update()
+            .where(tabela.c.updated_at.is_(None))
+            .values(updated_at=sa.func.coalesce(tabela.c.created_at, agora))
+        )
+        with op.batch_alter_table(nome, schema=None) as batch_op:
+            batch_op.create_index(f'ix_{nome}_updated_at_id', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    for nome in TABELAS:
+        with op.batch_alter_table(nome, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{nome}_updated_at_id')
@@ -0,0 +1,43 @@
+"""Tabela sinal_vital (série temporal de sinais vitais)
+
+Revision ID: b8e3f1a6c942
+Revises: 4f6b2d8e1a37
+Create Date: 2026-10-18 13:11:48.207355
+
+A série dos acompanhamentos existentes é preenchida com scripts/reindexar_sinais_vitais.py.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3f1a6c942'
+down_revision = '4f6b2d8e1a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sinal_vital',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('acompanhamento_id', sa.Integer(), nullable=False),
+    sa.Column('paciente_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(), nullable=False),
+    sa.Column('metrica', sa.String(length=50), nullable=False),
+    sa.Column('valor', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['acompanhamento_id'], ['acompanhamento.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['paciente_id'], ['paciente.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sinal_vital', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sinal_vital_acompanhamento_id'), ['acompanhamento_id'], unique=False)
+        batch_op.create_index('ix_sinal_vital_paciente_metrica_data', ['paciente_id', 'metrica', 'data_hora'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sinal_vital', schema=None) as batch_op:
+        batch_op.drop_index('ix_sinal_vital_paciente_metrica_data')
+        batch_op.drop_index(batch_op.f('ix_sinal_vital_acompanhamento_id'))
+
+    op.drop_table('sinal_vital')
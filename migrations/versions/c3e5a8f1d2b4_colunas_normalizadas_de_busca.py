@@ -0,0 +1,65 @@
+"""Colunas normalizadas de busca em paciente e user
+
+Revision ID: c3e5a8f1d2b4
+Revises: aa1aeb053428
+Create Date: 2026-10-18 10:12:41.208533
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils import normalize_text, only_digits
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a8f1d2b4'
+down_revision = 'aa1aeb053428'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('paciente', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('nome_normalizado', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('cpf_digitos', sa.String(length=11), nullable=True))
+        batch_op.create_index('ix_paciente_nome_normalizado', ['nome_normalizado'], unique=False)
+        batch_op.create_index('ix_paciente_cpf_digitos', ['cpf_digitos'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('nome_normalizado', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('email_normalizado', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('cpf_digitos', sa.String(length=11), nullable=True))
+        batch_op.create_index('ix_user_nome_normalizado', ['nome_normalizado'], unique=False)
+        batch_op.create_index('ix_user_email_normalizado', ['email_normalizado'], unique=False)
+        batch_op.create_index('ix_user_cpf_digitos', ['cpf_digitos'], unique=False)
+
+    # Preenche as colunas dos registros existentes com a mesma normalização dos modelos
+    bind = op.get_bind()
+    paciente = sa.table('paciente', sa.column('id'), sa.column('nome_completo'), sa.column('cpf'),
+                        sa.column('nome_normalizado'), sa.column('cpf_digitos'))
+    for id_, nome, cpf in bind.execute(sa.select(paciente.c.id, paciente.c.nome_completo, paciente.c.cpf)).all():
+        bind.execute(paciente.update().where(paciente.c.id == id_).values(
+            nome_normalizado=normalize_text(nome), cpf_digitos=only_digits(cpf)))
+
+    user = sa.table('user', sa.column('id'), sa.column('nome'), sa.column('email'), sa.column('cpf'),
+                    sa.column('nome_normalizado'), sa.column('email_normalizado'), sa.column('cpf_digitos'))
+    for id_, nome, email, cpf in bind.execute(sa.select(user.c.id, user.c.nome, user.c.email, user.c.cpf)).all():
+        bind.execute(user.update().where(user.c.id == id_).values(
+            nome_normalizado=normalize_text(nome), email_normalizado=normalize_text(email),
+            cpf_digitos=only_digits(cpf)))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_cpf_digitos')
+        batch_op.drop_index('ix_user_email_normalizado')
+        batch_op.drop_index('ix_user_nome_normalizado')
+        batch_op.drop_column('cpf_digitos')
+        batch_op.drop_column('email_normalizado')
+        batch_op.drop_column('nome_normalizado')
+
+    with op.batch_alter_table('paciente', schema=None) as batch_op:
+        batch_op.drop_index('ix_paciente_cpf_digitos')
+        batch_op.drop_index('ix_paciente_nome_normalizado')
+        batch_op.drop_column('cpf_digitos')
+        batch_op.drop_column('nome_normalizado')
@@ -0,0 +1,33 @@
+"""Tabela paciente_contagem (contadores de pacientes por convênio, plano e status)
+
+Revision ID: d7a4e2b8c615
+Revises: 2a9f5c3e7b14
+Create Date: 2026-10-18 13:31:17.064829
+
+Os contadores são preenchidos com scripts/recalcular_contagem_pacientes.py ao
+habilitar PACIENTES_CONTADORES.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a4e2b8c615'
+down_revision = '2a9f5c3e7b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('paciente_contagem',
+    sa.Column('convenio_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('plano_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('convenio_id', 'plano_id', 'status')
+    )
+
+
+def downgrade():
+    op.drop_table('paciente_contagem')
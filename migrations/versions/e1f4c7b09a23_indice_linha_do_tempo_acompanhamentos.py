@@ -0,0 +1,26 @@
+"""Índice da linha do tempo de acompanhamentos
+
+Revision ID: e1f4c7b09a23
+Revises: 5b9d2e7a41c6
+Create Date: 2026-10-18 11:20:52.310447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f4c7b09a23'
+down_revision = '5b9d2e7a41c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('acompanhamento', schema=None) as batch_op:
+        batch_op.create_index('ix_acompanhamento_paciente_data_hora', ['paciente_id', 'data_hora'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('acompanhamento', schema=None) as batch_op:
+        batch_op.drop_index('ix_acompanhamento_paciente_data_hora')
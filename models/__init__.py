@@ -3,9 +3,14 @@ from db import db  # Import db to make it available to all models
 
 # Import all models to make them accessible from models package
 from .pacientes import Paciente
+from .paciente_ngram import PacienteNgram
+from .paciente_contagem import PacienteContagem
 from .acompanhamento import Acompanhamento
+from .sinal_vital import SinalVital
 from .convenio import Convenio
 from .plano import Plano
 from .user import User
 from .setores_funcoes import Setor, Funcao
+from .registro_excluido import RegistroExcluido
+from .catalogo_versao import CatalogoVersao
 # Import other models as needed
\ No newline at end of file
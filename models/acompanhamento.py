@@ -1,6 +1,8 @@
 from datetime import datetime
 from db import db
-import json
+import json_provider
+from models.sinal_vital import SinalVital
+from sqlalchemy import event, inspect
 
 class Acompanhamento(db.Model):
     __tablename__ = 'acompanhamento'
@@ -22,84 +24,91 @@ class Acompanhamento(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Linha do tempo do paciente (filtro por período e paginação por data)
+        db.Index('ix_acompanhamento_paciente_data_hora', 'paciente_id', 'data_hora'),
+        # Feed de sincronização (GET /sync)
+        db.Index('ix_acompanhamento_updated_at_id', 'updated_at', 'id'),
+    )
+    
     # Getters e setters para os campos JSON
     @property
     def sinais_vitais(self):
         if not self.sinais_vitais_json:
             return None
-        return json.loads(self.sinais_vitais_json)
+        return json_provider.loads(self.sinais_vitais_json)
     
     @sinais_vitais.setter
     def sinais_vitais(self, value):
         if value is None:
             self.sinais_vitais_json = None
         else:
-            self.sinais_vitais_json = json.dumps(value)
+            self.sinais_vitais_json = json_provider.dumps(value)
     
     @property
     def avaliacao_feridas(self):
         if not self.avaliacao_feridas_json:
             return None
-        return json.loads(self.avaliacao_feridas_json)
+        return json_provider.loads(self.avaliacao_feridas_json)
     
     @avaliacao_feridas.setter
     def avaliacao_feridas(self, value):
         if value is None:
             self.avaliacao_feridas_json = None
         else:
-            self.avaliacao_feridas_json = json.dumps(value)
+            self.avaliacao_feridas_json = json_provider.dumps(value)
     
     @property
     def avaliacao_dispositivos(self):
         if not self.avaliacao_dispositivos_json:
             return None
-        return json.loads(self.avaliacao_dispositivos_json)
+        return json_provider.loads(self.avaliacao_dispositivos_json)
     
     @avaliacao_dispositivos.setter
     def avaliacao_dispositivos(self, value):
         if value is None:
             self.avaliacao_dispositivos_json = None
         else:
-            self.avaliacao_dispositivos_json = json.dumps(value)
+            self.avaliacao_dispositivos_json = json_provider.dumps(value)
     
     @property
     def intervencoes(self):
         if not self.intervencoes_json:
             return None
-        return json.loads(self.intervencoes_json)
+        return json_provider.loads(self.intervencoes_json)
     
     @intervencoes.setter
     def intervencoes(self, value):
         if value is None:
             self.intervencoes_json = None
         else:
-            self.intervencoes_json = json.dumps(value)
+            self.intervencoes_json = json_provider.dumps(value)
     
     @property
     def plano_acao(self):
         if not self.plano_acao_json:
             return None
-        return json.loads(self.plano_acao_json)
+        return json_provider.loads(self.plano_acao_json)
     
     @plano_acao.setter
     def plano_acao(self, value):
         if value is None:
             self.plano_acao_json = None
         else:
-            self.plano_acao_json = json.dumps(value)
+            self.plano_acao_json = json_provider.dumps(value)
     
     @property
     def comunicacao(self):
         if not self.comunicacao_json:
             return None
-        return json.loads(self.comunicacao_json)
+        return json_provider.loads(self.comunicacao_json)
     
     @comunicacao.setter
     def comunicacao(self, value):
         if value is None:
             self.comunicacao_json = None
         else:
-            self.comunicacao_json = json.dumps(value)
+            self.comunicacao_json = json_provider.dumps(value)
     
     def to_dict(self):
         return {
@@ -117,4 +126,23 @@ class Acompanhamento(db.Model):
             'comunicacao': self.comunicacao,
             'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
             'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else None
-        }
\ No newline at end of file
+        }
+
+
+# Manutenção da série de sinais vitais na mesma transação da escrita
+@event.listens_for(Acompanhamento, 'after_insert')
+def _indexar_sinais_vitais_inseridos(mapper, connection, target):
+    SinalVital.reindexar(connection, target)
+
+
+@event.listens_for(Acompanhamento, 'after_update')
+def _indexar_sinais_vitais_atualizados(mapper, connection, target):
+    estado = inspect(target)
+    if any(getattr(estado.attrs, campo).history.has_changes()
+           for campo in ('sinais_vitais_json', 'data_hora', 'paciente_id')):
+        SinalVital.reindexar(connection, target)
+
+
+@event.listens_for(Acompanhamento, 'before_delete')
+def _remover_sinais_vitais(mapper, connection, target):
+    SinalVital.remover(connection, target.id)
@@ -0,0 +1,86 @@
+from datetime import datetime
+from db import db
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.convenio import Convenio
+from models.plano import Plano
+from models.setores_funcoes import Setor, Funcao
+
+# Catálogos de dados de referência e os modelos que os compõem
+CATALOGOS = {
+    'convenios': (Convenio, Plano),
+    'setores': (Setor, Funcao),
+}
+
+
+class CatalogoVersao(db.Model):
+    """
+    Versão de cada catálogo de dados de referência (convênios/planos e
+    setores/funções).
+
+    Incrementada pelos eventos de gravação do ORM na mesma transação da
+    alteração. Por ficar no banco, a versão é a mesma para todos os processos
+    da API e serve de base para os ETags e para invalidar o cache local de
+    cada processo.
+    """
+    __tablename__ = 'catalogo_versao'
+
+    nome = db.Column(db.String(50), primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=1)
+    atualizado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def incrementar(cls, connection, nome):
+        """Incrementa a versão do catálogo usando a conexão informada"""
+        tabela = cls.__table__
+        agora = datetime.utcnow()
+        atualizar = (
+            tabela.update()
+            .where(tabela.c.nome == nome)
+            .values(versao=tabela.c.versao + 1, atualizado_em=agora)
+        )
+        if connection.execute(atualizar).rowcount > 0:
+            return
+        # Linha ainda não existe (a migration a cria; bancos criados com
+        # create_all, não). O INSERT fica em um savepoint: se uma gravação
+        # concorrente criou a linha antes, o incremento volta a ser um UPDATE
+        try:
+            with connection.begin_nested():
+                connection.execute(tabela.insert().values(nome=nome, versao=1, atualizado_em=agora))
+        except IntegrityError:
+            connection.execute(atualizar)
+
+    @classmethod
+    def atual(cls, nome):
+        """Versão atual do catálogo (0 se nunca foi alterado)"""
+        versao = db.session.scalar(db.select(cls.versao).where(cls.nome == nome))
+        return versao or 0
+
+
+def _incrementar_catalogo(nome):
+    def listener(mapper, connection, target):
+        CatalogoVersao.incrementar(connection, nome)
+    return listener
+
+
+_CATALOGO_POR_MODEL = {}
+for _nome, _models in CATALOGOS.items():
+    for _model in _models:
+        _CATALOGO_POR_MODEL[_model] = _nome
+        for _evento in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(_model, _evento, _incrementar_catalogo(_nome))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _incrementar_catalogo_em_lote(estado):
+    """
+    INSERT/UPDATE/DELETE em lote (query.delete(), session.execute(update(...)))
+    não disparam os eventos de mapper; incrementa a versão do catálogo aqui.
+    """
+    if not (estado.is_insert or estado.is_update or estado.is_delete) or estado.bind_mapper is None:
+        return
+    nome = _CATALOGO_POR_MODEL.get(estado.bind_mapper.class_)
+    if nome:
+        CatalogoVersao.incrementar(estado.session.connection(), nome)
@@ -1,5 +1,6 @@
 from datetime import datetime
 from db import db
+from sqlalchemy.orm import selectinload, raiseload
 
 class Convenio(db.Model):
     __tablename__ = 'convenio'
@@ -12,18 +13,38 @@ class Convenio(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Feed de sincronização (GET /sync)
+        db.Index('ix_convenio_updated_at_id', 'updated_at', 'id'),
+    )
+    
     # Relacionamentos
     planos = db.relationship('Plano', backref='convenio', lazy=True, cascade="all, delete-orphan")
     pacientes = db.relationship('Paciente', backref='convenio', lazy=True)
     
-    def to_dict(self):
-        return {
+    @classmethod
+    def consulta(cls, incluir_planos=True):
+        """
+        Consulta de convênios com a estratégia de carregamento dos planos.
+
+        Com incluir_planos, os planos de todos os convênios retornados são
+        carregados em uma única consulta adicional (selectinload), em vez de
+        uma por convênio; sem, acessar os planos lança erro (raiseload) em vez
+        de disparar uma consulta por convênio.
+        """
+        opcao = selectinload(cls.planos) if incluir_planos else raiseload(cls.planos)
+        return cls.query.options(opcao)
+
+    def to_dict(self, incluir_planos=True):
+        dados = {
             'id': self.id,
             'nome': self.nome,
             'codigo': self.codigo,
             'tipo': self.tipo,
             'ativo': self.ativo,
             'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else None,
-            'planos': [plano.to_dict() for plano in self.planos] if self.planos else []
-        }
\ No newline at end of file
+            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else None
+        }
+        if incluir_planos:
+            dados['planos'] = [plano.to_dict() for plano in self.planos]
+        return dados
\ No newline at end of file
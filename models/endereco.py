@@ -1,5 +1,6 @@
 from db import db
 import json
+import json_provider
 from sqlalchemy import Column, Integer, String, Text
 
 class Endereco:
@@ -70,7 +71,7 @@ class Endereco:
     
     def to_json(self):
         """Converte o objeto para uma string JSON"""
-        return json.dumps(self.to_dict())
+        return json_provider.dumps(self.to_dict())
     
     @classmethod
     def from_json(cls, json_str):
@@ -78,7 +79,7 @@ class Endereco:
         if not json_str:
             return None
         try:
-            data = json.loads(json_str)
+            data = json_provider.loads(json_str)
             return cls.from_dict(data)
         except json.JSONDecodeError:
             return None
\ No newline at end of file
@@ -0,0 +1,67 @@
+from db import db
+from sqlalchemy.exc import IntegrityError
+
+# Convênio/plano ausente é gravado como 0 (colunas da chave primária não aceitam NULL)
+SEM_VINCULO = 0
+
+
+class PacienteContagem(db.Model):
+    """
+    Contadores de pacientes por (convênio, plano, status).
+
+    Mantidos de forma incremental pelos eventos de inserção, atualização e
+    exclusão de Paciente, na mesma transação da escrita, quando
+    Config.PACIENTES_CONTADORES está habilitado. Permitem responder às
+    contagens por convênio/plano lendo uma linha por combinação, sem percorrer
+    os pacientes. Ao habilitar, popule a tabela com
+    scripts/recalcular_contagem_pacientes.py.
+    """
+    __tablename__ = 'paciente_contagem'
+
+    convenio_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    plano_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    status = db.Column(db.String(20), primary_key=True)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def chave(convenio_id, plano_id, status):
+        return (convenio_id or SEM_VINCULO, plano_id or SEM_VINCULO, status)
+
+    @classmethod
+    def ajustar(cls, connection, chave, delta):
+        """Soma delta ao contador da chave (convenio_id, plano_id, status) usando a conexão informada"""
+        tabela = cls.__table__
+        convenio_id, plano_id, status = chave
+        atualizar = (
+            tabela.update()
+            .where(tabela.c.convenio_id == convenio_id, tabela.c.plano_id == plano_id, tabela.c.status == status)
+            .values(quantidade=tabela.c.quantidade + delta)
+        )
+        if connection.execute(atualizar).rowcount > 0:
+            return
+        # Primeira ocorrência da chave. O INSERT fica em um savepoint: se uma
+        # transação concorrente criou a linha antes, o ajuste volta a ser um
+        # UPDATE em vez de falhar a gravação do paciente
+        try:
+            with connection.begin_nested():
+                connection.execute(tabela.insert().values(
+                    convenio_id=convenio_id, plano_id=plano_id, status=status, quantidade=delta
+                ))
+        except IntegrityError:
+            connection.execute(atualizar)
+
+    @classmethod
+    def substituir(cls, connection, linhas):
+        """
+        Substitui todos os contadores.
+
+        :param linhas: tuplas (convenio_id, plano_id, status, quantidade)
+        """
+        tabela = cls.__table__
+        connection.execute(tabela.delete())
+        valores = [
+            dict(zip(('convenio_id', 'plano_id', 'status'), cls.chave(c, p, s)), quantidade=q)
+            for c, p, s, q in linhas
+        ]
+        if valores:
+            connection.execute(tabela.insert(), valores)
@@ -0,0 +1,79 @@
+from db import db
+from utils import normalize_text, only_digits
+
+TAMANHO_NGRAM = 3
+
+
+class PacienteNgram(db.Model):
+    """
+    Índice de trigramas do nome e do CPF dos pacientes.
+
+    Permite resolver buscas por trecho (LIKE '%valor%'), que não usam índice
+    no banco, consultando primeiro os ids candidatos por igualdade de n-grama.
+    Mantido pelos eventos de inserção, atualização e exclusão de Paciente.
+    """
+    __tablename__ = 'paciente_ngram'
+
+    paciente_id = db.Column(db.Integer, db.ForeignKey('paciente.id', ondelete='CASCADE'), primary_key=True)
+    campo = db.Column(db.String(10), primary_key=True)  # 'nome' ou 'cpf'
+    ngram = db.Column(db.String(TAMANHO_NGRAM), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_paciente_ngram_busca', 'campo', 'ngram', 'paciente_id'),
+    )
+
+    @staticmethod
+    def normalizar(campo, valor):
+        """Normaliza o valor do campo da mesma forma na indexação e na busca"""
+        if campo == 'cpf':
+            return only_digits(valor)
+        return normalize_text(valor)
+
+    @staticmethod
+    def gerar_ngrams(texto):
+        """Conjunto de substrings de tamanho TAMANHO_NGRAM do texto"""
+        return {texto[i:i + TAMANHO_NGRAM] for i in range(len(texto) - TAMANHO_NGRAM + 1)}
+
+    @classmethod
+    def linhas_paciente(cls, paciente_id, nome, cpf):
+        """Linhas do índice para um paciente"""
+        linhas = []
+        for campo, valor in (('nome', nome), ('cpf', cpf)):
+            for ngram in cls.gerar_ngrams(cls.normalizar(campo, valor)):
+                linhas.append({'paciente_id': paciente_id, 'campo': campo, 'ngram': ngram})
+        return linhas
+
+    @classmethod
+    def reindexar(cls, connection, paciente_id, nome, cpf):
+        """Substitui as linhas do índice de um paciente usando a conexão informada"""
+        tabela = cls.__table__
+        connection.execute(tabela.delete().where(tabela.c.paciente_id == paciente_id))
+        linhas = cls.linhas_paciente(paciente_id, nome, cpf)
+        if linhas:
+            connection.execute(tabela.insert(), linhas)
+
+    @classmethod
+    def remover(cls, connection, paciente_id):
+        tabela = cls.__table__
+        connection.execute(tabela.delete().where(tabela.c.paciente_id == paciente_id))
+
+    @classmethod
+    def candidatos(cls, campo, valor):
+        """
+        Subconsulta com os ids dos pacientes cujo campo contém todos os n-gramas
+        do valor buscado.
+
+        O resultado é um superconjunto dos pacientes que contêm o valor; a
+        consulta deve manter o filtro original para descartar falsos positivos.
+
+        :return: subconsulta de ids ou None se o valor for curto demais para o índice
+        """
+        ngrams = cls.gerar_ngrams(cls.normalizar(campo, valor))
+        if not ngrams:
+            return None
+        return (
+            db.select(cls.paciente_id)
+            .where(cls.campo == campo, cls.ngram.in_(ngrams))
+            .group_by(cls.paciente_id)
+            .having(db.func.count() == len(ngrams))
+        )
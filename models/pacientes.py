@@ -1,7 +1,11 @@
 from datetime import datetime
 from db import db
-from utils import convert_utc_to_db_format, convert_ddmmyyyy_to_db_format
+from utils import convert_utc_to_db_format, convert_ddmmyyyy_to_db_format, normalize_text, only_digits
 from models.endereco import Endereco
+from models.paciente_ngram import PacienteNgram
+from models.paciente_contagem import PacienteContagem
+from config import Config
+from sqlalchemy import event, inspect
 import json
 
 class Paciente(db.Model):
@@ -9,8 +13,18 @@ class Paciente(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     nome_completo = db.Column(db.String(100), nullable=False)
     cpf = db.Column(db.String(11), unique=True, nullable=False)
-    convenio_id = db.Column(db.Integer, db.ForeignKey('convenio.id', ondelete='SET NULL'), nullable=True)
-    plano_id = db.Column(db.Integer, db.ForeignKey('plano.id', ondelete='SET NULL'), nullable=True)
+    # Colunas de busca (sem acentos, minúsculas), preenchidas pelos eventos do modelo
+    nome_normalizado = db.Column(db.String(100), nullable=True, index=True)
+    cpf_digitos = db.Column(db.String(11), nullable=True, index=True)
+    # active_history: o valor anterior é carregado ao alterar um atributo
+    # expirado, para que os contadores por convênio/plano/status saibam de onde
+    # o paciente saiu
+    convenio_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('convenio.id', ondelete='SET NULL'), nullable=True), active_history=True
+    )
+    plano_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('plano.id', ondelete='SET NULL'), nullable=True), active_history=True
+    )
     numero_carteirinha = db.Column(db.String(50), nullable=True)
     acomodacao = db.Column(db.String(50), nullable=False)
     telefone = db.Column(db.String(15), nullable=False)
@@ -21,7 +35,8 @@ class Paciente(db.Model):
     cid_secundario = db.Column(db.String(10), nullable=True)
     data_nascimento = db.Column(db.Date, nullable=False)
     endereco_json = db.Column(db.Text, nullable=True)
-    status = db.Column(db.String(20), nullable=False, default='em-avaliacao')
+    # Ver convenio_id: valor anterior necessário para os contadores
+    status = db.column_property(db.Column(db.String(20), nullable=False, default='em-avaliacao'), active_history=True)
     genero = db.Column(db.String(20), nullable=True)
     estado_civil = db.Column(db.String(20), nullable=True)
     profissao = db.Column(db.String(50), nullable=True)
@@ -34,13 +49,34 @@ class Paciente(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Ordenação e cursor da busca avançada
+        db.Index('ix_paciente_nome_completo_id', 'nome_completo', 'id'),
+        # Feed de sincronização (GET /sync)
+        db.Index('ix_paciente_updated_at_id', 'updated_at', 'id'),
+        # Contagens agrupadas por convênio/plano/status (GET /pacientes/contagem)
+        db.Index('ix_paciente_convenio_plano_status', 'convenio_id', 'plano_id', 'status'),
+    )
+
     # Relacionamentos
     acompanhamentos = db.relationship('Acompanhamento', backref='paciente', lazy=True, cascade="all, delete-orphan")
 
     @property
     def endereco(self):
-        """Retorna o objeto Endereco a partir do JSON armazenado"""
-        return Endereco.from_json(self.endereco_json)
+        """
+        Retorna o objeto Endereco a partir do JSON armazenado.
+
+        O resultado é memorizado por instância e associado ao texto de
+        endereco_json que o originou: qualquer nova atribuição (pelo setter ou
+        diretamente na coluna) invalida o valor memorizado. Alterações feitas
+        no objeto retornado só são persistidas atribuindo-o de volta.
+        """
+        cache = self.__dict__.get('_endereco_cache')
+        if cache is not None and cache[0] == self.endereco_json:
+            return cache[1]
+        endereco = Endereco.from_json(self.endereco_json)
+        self._endereco_cache = (self.endereco_json, endereco)
+        return endereco
     
     @endereco.setter
     def endereco(self, endereco):
@@ -49,9 +85,20 @@ class Paciente(db.Model):
             self.endereco_json = None
         else:
             self.endereco_json = endereco.to_json()
+        self._endereco_cache = (self.endereco_json, endereco)
     
-    def to_dict(self):
-        endereco_dict = self.endereco.to_dict() if self.endereco else {}
+    def to_dict(self, expandir_endereco=False):
+        """
+        Serializa o paciente.
+
+        Por padrão 'endereco' é devolvido como o texto JSON armazenado, sem
+        decodificação (formato consumido pelos clientes atuais). Com
+        expandir_endereco=True ele é devolvido como objeto (dict ou None).
+        """
+        if expandir_endereco:
+            endereco = self.endereco.to_dict() if self.endereco else None
+        else:
+            endereco = self.endereco_json
         
         return {
             'id': self.id,
@@ -68,7 +115,7 @@ class Paciente(db.Model):
             'cid_primario': self.cid_primario,
             'cid_secundario': self.cid_secundario,
             'data_nascimento': self.data_nascimento.strftime('%Y-%m-%d') if self.data_nascimento else None,
-            'endereco': self.endereco_json,
+            'endereco': endereco,
             'status': self.status,
             'genero': self.genero,
             'estado_civil': self.estado_civil,
@@ -118,4 +165,94 @@ class Paciente(db.Model):
             # Não é mais necessário mapear 'logradouro' para 'rua', pois agora usamos a nomenclatura da ViaCEP
             paciente.endereco = Endereco.from_dict(endereco_data)
 
-        return paciente
\ No newline at end of file
+        return paciente
+
+    @classmethod
+    def desvincular(cls, convenio_id=None, plano_id=None):
+        """
+        Remove, em um único UPDATE, o vínculo dos pacientes com um convênio ou
+        plano que será excluído.
+
+        Tem o mesmo efeito do ON DELETE SET NULL, mas também atualiza
+        updated_at (feed de sincronização) e os contadores por convênio/plano,
+        que os eventos do ORM não atualizam em operações em lote.
+        """
+        if plano_id is not None:
+            condicao, valores = cls.plano_id == plano_id, {'plano_id': None}
+        else:
+            condicao, valores = cls.convenio_id == convenio_id, {'convenio_id': None}
+
+        if Config.PACIENTES_CONTADORES:
+            connection = db.session.connection()
+            grupos = db.session.execute(
+                db.select(cls.convenio_id, cls.plano_id, cls.status, db.func.count(cls.id))
+                .where(condicao)
+                .group_by(cls.convenio_id, cls.plano_id, cls.status)
+            ).all()
+            for convenio_atual, plano_atual, status, quantidade in grupos:
+                novo = {'convenio_id': convenio_atual, 'plano_id': plano_atual, **valores}
+                PacienteContagem.ajustar(connection, PacienteContagem.chave(convenio_atual, plano_atual, status), -quantidade)
+                PacienteContagem.ajustar(connection, PacienteContagem.chave(novo['convenio_id'], novo['plano_id'], status), quantidade)
+
+        db.session.execute(
+            db.update(cls).where(condicao).values(updated_at=datetime.utcnow(), **valores),
+            execution_options={'synchronize_session': False}
+        )
+
+
+# Colunas normalizadas de busca
+@event.listens_for(Paciente, 'before_insert')
+@event.listens_for(Paciente, 'before_update')
+def _normalizar_campos_busca(mapper, connection, target):
+    target.nome_normalizado = normalize_text(target.nome_completo)
+    target.cpf_digitos = only_digits(target.cpf)
+
+
+# Manutenção do índice de n-gramas (nome e CPF) na mesma transação da escrita
+@event.listens_for(Paciente, 'after_insert')
+def _indexar_paciente_inserido(mapper, connection, target):
+    PacienteNgram.reindexar(connection, target.id, target.nome_completo, target.cpf)
+
+
+@event.listens_for(Paciente, 'after_update')
+def _indexar_paciente_atualizado(mapper, connection, target):
+    estado = inspect(target)
+    if estado.attrs.nome_completo.history.has_changes() or estado.attrs.cpf.history.has_changes():
+        PacienteNgram.reindexar(connection, target.id, target.nome_completo, target.cpf)
+
+
+@event.listens_for(Paciente, 'before_delete')
+def _remover_paciente_do_indice(mapper, connection, target):
+    PacienteNgram.remover(connection, target.id)
+
+
+# Contadores por convênio/plano/status na mesma transação da escrita
+@event.listens_for(Paciente, 'after_insert')
+def _contar_paciente_inserido(mapper, connection, target):
+    if Config.PACIENTES_CONTADORES:
+        chave = PacienteContagem.chave(target.convenio_id, target.plano_id, target.status)
+        PacienteContagem.ajustar(connection, chave, 1)
+
+
+@event.listens_for(Paciente, 'after_update')
+def _contar_paciente_atualizado(mapper, connection, target):
+    if not Config.PACIENTES_CONTADORES:
+        return
+    estado = inspect(target)
+
+    def anterior(atributo):
+        historico = estado.attrs[atributo].history
+        return historico.deleted[0] if historico.deleted else getattr(target, atributo)
+
+    chave_anterior = PacienteContagem.chave(anterior('convenio_id'), anterior('plano_id'), anterior('status'))
+    chave_atual = PacienteContagem.chave(target.convenio_id, target.plano_id, target.status)
+    if chave_anterior != chave_atual:
+        PacienteContagem.ajustar(connection, chave_anterior, -1)
+        PacienteContagem.ajustar(connection, chave_atual, 1)
+
+
+@event.listens_for(Paciente, 'after_delete')
+def _contar_paciente_excluido(mapper, connection, target):
+    if Config.PACIENTES_CONTADORES:
+        chave = PacienteContagem.chave(target.convenio_id, target.plano_id, target.status)
+        PacienteContagem.ajustar(connection, chave, -1)
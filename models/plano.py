@@ -13,6 +13,11 @@ class Plano(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Feed de sincronização (GET /sync)
+        db.Index('ix_plano_updated_at_id', 'updated_at', 'id'),
+    )
+    
     # Relacionamentos
     pacientes = db.relationship('Paciente', backref='plano', lazy=True)
     
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from db import db
+from sqlalchemy import event
+
+from models.pacientes import Paciente
+from models.convenio import Convenio
+from models.plano import Plano
+from models.acompanhamento import Acompanhamento
+from models.user import User
+
+# Entidades publicadas no feed de sincronização (GET /sync)
+ENTIDADES_SYNC = {
+    'pacientes': Paciente,
+    'convenios': Convenio,
+    'planos': Plano,
+    'acompanhamentos': Acompanhamento,
+}
+
+# Entidades com exclusões registradas; usuários são excluídos logicamente
+# (status 'Inativo') e registrados pela rota de exclusão
+ENTIDADES_REGISTRADAS = dict(ENTIDADES_SYNC, usuarios=User)
+
+
+class RegistroExcluido(db.Model):
+    """
+    Marca de exclusão (tombstone) das entidades sincronizadas.
+
+    Permite que os clientes de sincronização saibam quais registros removidos
+    devem apagar localmente. Gravada pelos eventos de exclusão do ORM na mesma
+    transação do DELETE.
+    """
+    __tablename__ = 'registro_excluido'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entidade = db.Column(db.String(30), nullable=False)
+    registro_id = db.Column(db.Integer, nullable=False)
+    excluido_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_registro_excluido_excluido_em_id', 'excluido_em', 'id'),
+        db.Index('ix_registro_excluido_entidade_excluido_em', 'entidade', 'excluido_em'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'entidade': self.entidade,
+            'registro_id': self.registro_id,
+            'excluido_em': self.excluido_em.isoformat(' ', 'seconds')
+        }
+
+    @classmethod
+    def registrar(cls, connection, entidade, registro_ids):
+        """Grava as marcas de exclusão usando a conexão informada"""
+        agora = datetime.utcnow()
+        linhas = [{'entidade': entidade, 'registro_id': i, 'excluido_em': agora} for i in registro_ids]
+        if linhas:
+            connection.execute(cls.__table__.insert(), linhas)
+
+    @classmethod
+    def consultar(cls, de=None, ate=None, entidades=None):
+        """
+        Consulta as marcas de exclusão em um intervalo de tempo, em ordem de
+        exclusão. Usada para invalidação de caches e replicação.
+
+        :param de: início do intervalo (inclusivo)
+        :param ate: fim do intervalo (exclusivo)
+        :param entidades: nomes das entidades; None para todas
+        """
+        consulta = cls.query
+        if entidades:
+            consulta = consulta.filter(cls.entidade.in_(entidades))
+        if de is not None:
+            consulta = consulta.filter(cls.excluido_em >= de)
+        if ate is not None:
+            consulta = consulta.filter(cls.excluido_em < ate)
+        return consulta.order_by(cls.excluido_em, cls.id)
+
+    @staticmethod
+    def limite_retencao(retencao_dias):
+        """Data a partir da qual as marcas de exclusão são mantidas"""
+        return datetime.utcnow() - timedelta(days=retencao_dias)
+
+    @classmethod
+    def compactar(cls, retencao_dias, lote=5000):
+        """
+        Remove as marcas de exclusão mais antigas que a retenção, em lotes,
+        para que o registro não cresça indefinidamente. Clientes com marca
+        d'água anterior à retenção precisam de uma sincronização completa.
+
+        :return: quantidade de marcas removidas
+        """
+        limite = cls.limite_retencao(retencao_dias)
+        total = 0
+        while True:
+            ids = db.session.scalars(
+                db.select(cls.id).where(cls.excluido_em < limite).order_by(cls.id).limit(lote)
+            ).all()
+            if not ids:
+                return total
+            db.session.execute(db.delete(cls).where(cls.id.in_(ids)))
+            db.session.commit()
+            total += len(ids)
+
+
+def _registrar_exclusao(entidade):
+    def after_delete(mapper, connection, target):
+        RegistroExcluido.registrar(connection, entidade, [target.id])
+    return after_delete
+
+
+for _entidade, _model in ENTIDADES_SYNC.items():
+    event.listen(_model, 'after_delete', _registrar_exclusao(_entidade))
@@ -0,0 +1,193 @@
+from functools import lru_cache
+
+from sqlalchemy import select
+from werkzeug.exceptions import BadRequest
+
+import json_provider
+from models.pacientes import Paciente
+from models.user import User
+from models.convenio import Convenio
+from models.plano import Plano
+from models.acompanhamento import Acompanhamento
+
+
+# Formatadores reutilizados por todos os serializadores. Recebem o valor da
+# coluna (inclusive None) e devolvem o valor já pronto para o JSON.
+def data_hora(valor):
+    """datetime -> 'YYYY-MM-DD HH:MM:SS' (mesmo formato de strftime, mais rápido)"""
+    return valor.isoformat(' ', 'seconds') if valor is not None else None
+
+def data_iso(valor):
+    """date/datetime -> ISO 8601"""
+    return valor.isoformat() if valor is not None else None
+
+def json_ou(padrao):
+    """Texto JSON -> objeto, ou o valor padrão se vazio"""
+    def formatar(valor):
+        return json_provider.loads(valor) if valor else padrao
+    return formatar
+
+
+class Campo:
+    """
+    Campo do JSON de saída, lido de uma coluna do modelo.
+
+    Campos brutos são colunas que já guardam um fragmento JSON: em
+    serializar_json o texto armazenado é copiado direto para a resposta, sem
+    decodificar e codificar de novo.
+    """
+
+    def __init__(self, nome, coluna=None, formatar=None, bruto=False):
+        self.nome = nome
+        self.coluna = coluna or nome
+        self.formatar = formatar
+        self.bruto = bruto
+
+
+class RowSerializer:
+    """
+    Serializador de linhas para listas grandes.
+
+    Trabalha sobre as tuplas (Row) de um select() com apenas as colunas
+    necessárias, sem montar objetos do ORM. Para cada conjunto de campos
+    solicitado (projeção), a lista de colunas e os formatadores são resolvidos
+    uma única vez e reaproveitados em todas as linhas e requisições.
+
+    A saída é a mesma do to_dict do modelo para os campos informados.
+    """
+
+    def __init__(self, model, campos, extras=()):
+        """
+        :param model: classe do modelo
+        :param campos: lista de Campo ou nomes de coluna, na ordem do to_dict
+        :param extras: campos aceitos na projeção mas preenchidos pela rota
+                       (ex: relacionamentos)
+        """
+        self.model = model
+        self.campos = [c if isinstance(c, Campo) else Campo(c) for c in campos]
+        self._por_nome = {c.nome: c for c in self.campos}
+        self.extras = tuple(extras)
+        self.nomes = tuple(c.nome for c in self.campos) + self.extras
+        for campo in self.campos:
+            # Valida a configuração na importação, não na primeira requisição
+            getattr(model, campo.coluna)
+        self._compilar = lru_cache(maxsize=64)(self._compilar)
+
+    def campos_solicitados(self, fields):
+        """
+        Converte o parâmetro fields (ex: 'id,nome') na projeção a ser usada.
+
+        :return: tupla com os nomes dos campos, na ordem padrão do modelo
+        :raises BadRequest: se algum campo não existir
+        """
+        if not fields:
+            return self.nomes
+        pedidos = {f.strip() for f in fields.split(',') if f.strip()}
+        invalidos = pedidos - set(self.nomes)
+        if invalidos:
+            raise BadRequest(f"Campos inválidos: {', '.join(sorted(invalidos))}")
+        return tuple(n for n in self.nomes if n in pedidos)
+
+    def _compilar(self, nomes):
+        campos = [self._por_nome[n] for n in nomes if n in self._por_nome]
+        colunas = [getattr(self.model, c.coluna) for c in campos]
+        chaves = tuple(c.nome for c in campos)
+        formatadores = tuple((i, c.formatar) for i, c in enumerate(campos) if c.formatar)
+
+        if not formatadores:
+            def converter(row):
+                return dict(zip(chaves, row))
+        else:
+            def converter(row):
+                valores = list(row)
+                for i, formatar in formatadores:
+                    valores[i] = formatar(valores[i])
+                return dict(zip(chaves, valores))
+
+        comuns = tuple((i, c.nome, c.formatar) for i, c in enumerate(campos) if not c.bruto)
+        brutos = tuple((i, f'"{c.nome}":'.encode('utf-8')) for i, c in enumerate(campos) if c.bruto)
+
+        def converter_json(row):
+            dados = {nome: formatar(row[i]) if formatar else row[i] for i, nome, formatar in comuns}
+            partes = [json_provider.dumps_bytes(dados)[:-1]]  # sem o '}' final
+            separador = b',' if dados else b''
+            for i, chave in brutos:
+                valor = row[i]
+                partes.append(separador + chave + (valor.encode('utf-8') if valor else b'null'))
+                separador = b','
+            partes.append(b'}')
+            return b''.join(partes)
+
+        return colunas, converter, converter_json
+
+    def select(self, nomes=None):
+        """select() apenas com as colunas dos campos solicitados"""
+        colunas, _, _ = self._compilar(nomes or self.nomes)
+        return select(*colunas)
+
+    def serializar(self, rows, nomes=None):
+        """Converte as linhas de self.select(nomes) em dicionários"""
+        _, converter, _ = self._compilar(nomes or self.nomes)
+        return [converter(row) for row in rows]
+
+    def serializar_json(self, rows, nomes=None):
+        """
+        Converte as linhas de self.select(nomes) direto em um array JSON (bytes).
+
+        Os campos brutos são copiados do banco sem decodificação; os demais
+        seguem a mesma formatação de serializar.
+        """
+        _, _, converter_json = self._compilar(nomes or self.nomes)
+        return b'[' + b','.join(converter_json(row) for row in rows) + b']'
+
+
+paciente_serializer = RowSerializer(Paciente, [
+    'id', 'nome_completo', 'cpf', 'convenio_id', 'plano_id', 'numero_carteirinha',
+    'acomodacao', 'telefone', 'telefone_secundario', 'email', 'alergias',
+    'cid_primario', 'cid_secundario',
+    Campo('data_nascimento', formatar=data_iso),
+    Campo('endereco', 'endereco_json'),  # texto JSON, como em Paciente.to_dict
+    'status', 'genero', 'estado_civil', 'profissao', 'nacionalidade',
+    Campo('data_validade', formatar=data_iso),
+    'contato_emergencia', 'telefone_emergencia', 'case_responsavel', 'medico_responsavel',
+    Campo('created_at', formatar=data_hora),
+    Campo('updated_at', formatar=data_hora),
+])
+
+user_serializer = RowSerializer(User, [
+    'id', 'nome', 'email', 'cargo', 'cpf', 'cep', 'setor', 'funcao',
+    Campo('endereco', '_endereco', json_ou({})),
+    Campo('permissions', '_permissions', json_ou([])),
+    'status', 'especialidade', 'registro_categoria', 'telefone',
+    Campo('data_admissao', formatar=data_iso),
+    'tipo_acesso',
+    Campo('created_at', formatar=data_iso),
+    Campo('updated_at', formatar=data_iso),
+    'tipo_contratacao',
+])
+
+plano_serializer = RowSerializer(Plano, [
+    'id', 'convenio_id', 'nome', 'codigo', 'tipo_acomodacao', 'ativo',
+    Campo('created_at', formatar=data_hora),
+    Campo('updated_at', formatar=data_hora),
+])
+
+convenio_serializer = RowSerializer(Convenio, [
+    'id', 'nome', 'codigo', 'tipo', 'ativo',
+    Campo('created_at', formatar=data_hora),
+    Campo('updated_at', formatar=data_hora),
+], extras=('planos',))
+
+acompanhamento_serializer = RowSerializer(Acompanhamento, [
+    'id', 'paciente_id',
+    Campo('data_hora', formatar=data_hora),
+    'tipo_atendimento', 'motivo_atendimento', 'descricao',
+    Campo('sinais_vitais', 'sinais_vitais_json', json_ou(None), bruto=True),
+    Campo('avaliacao_feridas', 'avaliacao_feridas_json', json_ou(None), bruto=True),
+    Campo('avaliacao_dispositivos', 'avaliacao_dispositivos_json', json_ou(None), bruto=True),
+    Campo('intervencoes', 'intervencoes_json', json_ou(None), bruto=True),
+    Campo('plano_acao', 'plano_acao_json', json_ou(None), bruto=True),
+    Campo('comunicacao', 'comunicacao_json', json_ou(None), bruto=True),
+    Campo('created_at', formatar=data_hora),
+    Campo('updated_at', formatar=data_hora),
+])
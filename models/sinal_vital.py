@@ -0,0 +1,110 @@
+import math
+import re
+from db import db
+from utils import normalize_text
+
+# Valores no formato '120/80' (pressão arterial) geram duas métricas
+_PRESSAO = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*[/xX]\s*(\d+(?:[.,]\d+)?)\s*$')
+
+
+def _numero(valor):
+    """
+    Converte um valor numérico ou texto numérico ('36,5') em float; None se
+    não for número ou não for finito (NaN e infinito não são aceitos pelo MySQL)
+    """
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        numero = float(valor)
+    elif isinstance(valor, str):
+        try:
+            numero = float(valor.strip().replace(',', '.'))
+        except ValueError:
+            return None
+    else:
+        return None
+    return numero if math.isfinite(numero) else None
+
+
+class SinalVital(db.Model):
+    """
+    Leituras de sinais vitais em formato de série temporal: uma linha por
+    (paciente, data/hora, métrica, valor).
+
+    Derivada de Acompanhamento.sinais_vitais_json e mantida pelos eventos de
+    inserção, atualização e exclusão de Acompanhamento, para que tendências e
+    agregações não precisem decodificar o JSON de cada atendimento.
+    """
+    __tablename__ = 'sinal_vital'
+
+    id = db.Column(db.Integer, primary_key=True)
+    acompanhamento_id = db.Column(db.Integer, db.ForeignKey('acompanhamento.id', ondelete='CASCADE'), nullable=False, index=True)
+    paciente_id = db.Column(db.Integer, db.ForeignKey('paciente.id', ondelete='CASCADE'), nullable=False)
+    data_hora = db.Column(db.DateTime, nullable=False)
+    metrica = db.Column(db.String(50), nullable=False)
+    valor = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_sinal_vital_paciente_metrica_data', 'paciente_id', 'metrica', 'data_hora'),
+    )
+
+    @staticmethod
+    def extrair_metricas(sinais_vitais):
+        """
+        Extrai as métricas numéricas de um dicionário de sinais vitais.
+
+        Os nomes são normalizados (ex: 'Frequência Cardíaca' -> 'frequencia_cardiaca').
+        Valores no formato '120/80' geram as métricas <nome>_sistolica e
+        <nome>_diastolica; valores não numéricos são ignorados.
+
+        :return: lista de tuplas (metrica, valor)
+        """
+        if not isinstance(sinais_vitais, dict):
+            return []
+        metricas = []
+        for chave, valor in sinais_vitais.items():
+            nome = normalize_text(chave).replace(' ', '_')[:40]
+            if not nome:
+                continue
+            numero = _numero(valor)
+            if numero is not None:
+                metricas.append((nome, numero))
+                continue
+            pressao = _PRESSAO.match(valor) if isinstance(valor, str) else None
+            if pressao:
+                sistolica, diastolica = _numero(pressao.group(1)), _numero(pressao.group(2))
+                if sistolica is not None and diastolica is not None:
+                    metricas.append((f'{nome}_sistolica', sistolica))
+                    metricas.append((f'{nome}_diastolica', diastolica))
+        return metricas
+
+    @classmethod
+    def linhas_acompanhamento(cls, acompanhamento_id, paciente_id, data_hora, sinais_vitais):
+        """Linhas da série para um acompanhamento"""
+        if data_hora is None:
+            return []
+        return [
+            {'acompanhamento_id': acompanhamento_id, 'paciente_id': paciente_id,
+             'data_hora': data_hora, 'metrica': metrica, 'valor': valor}
+            for metrica, valor in cls.extrair_metricas(sinais_vitais)
+        ]
+
+    @classmethod
+    def reindexar(cls, connection, acompanhamento):
+        """Substitui as leituras de um acompanhamento usando a conexão informada"""
+        tabela = cls.__table__
+        connection.execute(tabela.delete().where(tabela.c.acompanhamento_id == acompanhamento.id))
+        try:
+            sinais_vitais = acompanhamento.sinais_vitais
+        except ValueError:
+            sinais_vitais = None  # JSON inválido não impede a gravação do atendimento
+        linhas = cls.linhas_acompanhamento(
+            acompanhamento.id, acompanhamento.paciente_id, acompanhamento.data_hora, sinais_vitais
+        )
+        if linhas:
+            connection.execute(tabela.insert(), linhas)
+
+    @classmethod
+    def remover(cls, connection, acompanhamento_id):
+        tabela = cls.__table__
+        connection.execute(tabela.delete().where(tabela.c.acompanhamento_id == acompanhamento_id))
@@ -1,6 +1,8 @@
 from db import db
-import json
+import json_provider
 from datetime import datetime
+from sqlalchemy import event
+from utils import normalize_text, only_digits
 
 class User(db.Model):
     __tablename__ = 'user'
@@ -8,9 +10,13 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
+    # Colunas de busca (sem acentos, minúsculas), preenchidas pelos eventos do modelo
+    nome_normalizado = db.Column(db.String(100), nullable=True, index=True)
+    email_normalizado = db.Column(db.String(100), nullable=True, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
     cargo = db.Column(db.String(50))
     cpf = db.Column(db.String(11), unique=True, nullable=False)
+    cpf_digitos = db.Column(db.String(11), nullable=True, index=True)
     cep = db.Column(db.String(10), nullable=False)  # CEP obrigatório
     _endereco = db.Column(db.Text)  # Armazena o restante do endereço como JSON
     setor = db.Column(db.String(50), nullable=False)
@@ -29,27 +35,27 @@ class User(db.Model):
     @property
     def endereco(self):
         if self._endereco:
-            return json.loads(self._endereco)
+            return json_provider.loads(self._endereco)
         return {}
 
     @endereco.setter
     def endereco(self, value):
         if value:
             # Removemos a validação de CEP pois agora está separado
-            self._endereco = json.dumps(value)
+            self._endereco = json_provider.dumps(value)
         else:
             self._endereco = None
 
     @property
     def permissions(self):
         if self._permissions:
-            return json.loads(self._permissions)
+            return json_provider.loads(self._permissions)
         return []
 
     @permissions.setter
     def permissions(self, value):
         if value:
-            self._permissions = json.dumps(value)
+            self._permissions = json_provider.dumps(value)
         else:
             self._permissions = None
 
@@ -77,4 +83,13 @@ class User(db.Model):
         }
 
     def __repr__(self):
-        return f'<User {self.nome}>'
\ No newline at end of file
+        return f'<User {self.nome}>'
+
+
+# Colunas normalizadas de busca
+@event.listens_for(User, 'before_insert')
+@event.listens_for(User, 'before_update')
+def _normalizar_campos_busca(mapper, connection, target):
+    target.nome_normalizado = normalize_text(target.nome)
+    target.email_normalizado = normalize_text(target.email)
+    target.cpf_digitos = only_digits(target.cpf)
@@ -1,13 +1,56 @@
-from flask import Blueprint, request, jsonify, abort
+from flask import Blueprint, Response, request, jsonify, abort
 from db import db
 from models.acompanhamento import Acompanhamento
 from models.pacientes import Paciente
 import json
-from datetime import datetime
-from utils import convert_ddmmyyyy_to_db_format, convert_utc_to_db_format
+import json_provider
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_
+from utils import convert_ddmmyyyy_to_db_format, convert_utc_to_db_format, encode_cursor, decode_cursor, normalize_text
+from models.serializers import acompanhamento_serializer
+from models.sinal_vital import SinalVital
+from services.sinais_vitais import agregar, parse_intervalo
+from config import Config
+from werkzeug.exceptions import BadRequest
 
 acompanhamentos_routes = Blueprint('acompanhamentos', __name__)
 
+CAMPOS_JSON = ('sinais_vitais', 'avaliacao_feridas', 'avaliacao_dispositivos',
+               'intervencoes', 'plano_acao', 'comunicacao')
+
+def _valores_acompanhamento(data):
+    """
+    Converte o JSON recebido nos valores das colunas de Acompanhamento.
+
+    :raises BadRequest: se o formato da data for inválido
+    """
+    # Converter data_hora_atendimento para formato de data
+    data_hora_str = data.get('data_hora_atendimento')
+    if data_hora_str:
+        try:
+            data_hora = datetime.strptime(data_hora_str, '%Y-%m-%dT%H:%M:%S')
+        except ValueError:
+            try:
+                data_hora = datetime.strptime(data_hora_str, '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                raise BadRequest('Formato de data inválido')
+    else:
+        data_hora = datetime.now()
+
+    valores = {
+        'paciente_id': data.get('paciente_id'),
+        'data_hora': data_hora,
+        'tipo_atendimento': data.get('tipo_atendimento'),
+        'motivo_atendimento': data.get('motivo_atendimento'),
+        'descricao': data.get('descricao_motivo'),
+    }
+
+    # Processar dados JSON para estruturas complexas
+    for campo in CAMPOS_JSON:
+        if data.get(campo) is not None:
+            valores[f'{campo}_json'] = json_provider.dumps(data[campo])
+    return valores
+
 @acompanhamentos_routes.route('/acompanhamentos', methods=['POST'])
 def criar_acompanhamento():
     """Criar um novo acompanhamento"""
@@ -19,46 +62,10 @@ def criar_acompanhamento():
         if not paciente:
             return jsonify({'error': 'Paciente não encontrado'}), 404
         
-        # Converter data_hora_atendimento para formato de data
-        data_hora_str = data.get('data_hora_atendimento')
-        if data_hora_str:
-            try:
-                data_hora = datetime.strptime(data_hora_str, '%Y-%m-%dT%H:%M:%S')
-            except ValueError:
-                try:
-                    data_hora = datetime.strptime(data_hora_str, '%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    return jsonify({'error': 'Formato de data inválido'}), 400
-        else:
-            data_hora = datetime.now()
-            
-        # Criar o acompanhamento básico
-        acompanhamento = Acompanhamento(
-            paciente_id=data.get('paciente_id'),
-            data_hora=data_hora,
-            tipo_atendimento=data.get('tipo_atendimento'),
-            motivo_atendimento=data.get('motivo_atendimento'),
-            descricao=data.get('descricao_motivo')
-        )
-        
-        # Processar dados JSON para estruturas complexas
-        if 'sinais_vitais' in data:
-            acompanhamento.sinais_vitais = data.get('sinais_vitais')
-            
-        if 'avaliacao_feridas' in data:
-            acompanhamento.avaliacao_feridas = data.get('avaliacao_feridas')
-            
-        if 'avaliacao_dispositivos' in data:
-            acompanhamento.avaliacao_dispositivos = data.get('avaliacao_dispositivos')
-            
-        if 'intervencoes' in data:
-            acompanhamento.intervencoes = data.get('intervencoes')
-            
-        if 'plano_acao' in data:
-            acompanhamento.plano_acao = data.get('plano_acao')
-            
-        if 'comunicacao' in data:
-            acompanhamento.comunicacao = data.get('comunicacao')
+        try:
+            acompanhamento = Acompanhamento(**_valores_acompanhamento(data))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
         
         db.session.add(acompanhamento)
         db.session.commit()
@@ -69,19 +76,273 @@ def criar_acompanhamento():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@acompanhamentos_routes.route('/acompanhamentos/lote', methods=['POST'])
+def criar_acompanhamentos_em_lote():
+    """
+    Registrar vários acompanhamentos de uma vez (sincronização offline).
+
+    Corpo: {"acompanhamentos": [{...mesmo formato de POST /acompanhamentos...}],
+    "parcial": false}. Todos os itens são validados e os pacientes referenciados
+    são verificados em uma única consulta. Por padrão o lote é tudo ou nada: se
+    algum item for inválido nada é gravado (400). Com "parcial": true os itens
+    válidos são gravados e os inválidos informados no resultado.
+
+    Resposta: {"resultados": [{"indice", "status": "criado", "id"} ou
+    {"indice", "status": "erro", "error"}], "criados": n, "erros": n}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        itens = data.get('acompanhamentos')
+        parcial = bool(data.get('parcial', False))
+        
+        if not isinstance(itens, list) or not itens:
+            return jsonify({'error': 'Informe a lista de acompanhamentos'}), 400
+        if len(itens) > Config.ACOMPANHAMENTOS_LOTE_MAX:
+            return jsonify({'error': f'Máximo de {Config.ACOMPANHAMENTOS_LOTE_MAX} acompanhamentos por lote'}), 400
+        
+        # Pacientes referenciados: uma única consulta IN
+        ids_pacientes = {_id_paciente(item.get('paciente_id')) for item in itens if isinstance(item, dict)}
+        ids_pacientes.discard(None)
+        existentes = set(db.session.scalars(
+            db.select(Paciente.id).where(Paciente.id.in_(ids_pacientes))
+        )) if ids_pacientes else set()
+        
+        resultados = []
+        validos = []  # (índice no lote, valores das colunas)
+        for indice, item in enumerate(itens):
+            erro = None
+            if not isinstance(item, dict):
+                erro = 'Item deve ser um objeto'
+            elif _id_paciente(item.get('paciente_id')) not in existentes:
+                erro = 'Paciente não encontrado'
+            elif not item.get('tipo_atendimento') or not item.get('motivo_atendimento'):
+                erro = 'Campos tipo_atendimento e motivo_atendimento são obrigatórios'
+            else:
+                try:
+                    valores = _valores_acompanhamento(item)
+                    valores['paciente_id'] = _id_paciente(item['paciente_id'])
+                    validos.append((indice, valores))
+                except BadRequest as e:
+                    erro = e.description
+            resultados.append({'indice': indice, 'status': 'erro', 'error': erro} if erro else None)
+        
+        erros = len(itens) - len(validos)
+        if erros and not parcial:
+            return jsonify({
+                'resultados': [r for r in resultados if r],
+                'criados': 0,
+                'erros': erros
+            }), 400
+        
+        ids = _inserir_acompanhamentos([valores for _, valores in validos])
+        db.session.commit()
+        
+        for (indice, _), novo_id in zip(validos, ids):
+            resultados[indice] = {'indice': indice, 'status': 'criado', 'id': novo_id}
+        
+        return jsonify({
+            'resultados': resultados,
+            'criados': len(validos),
+            'erros': erros
+        }), 201 if validos else 400
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def _inserir_acompanhamentos(linhas):
+    """
+    Insere os acompanhamentos na transação atual e devolve os ids, na ordem.
+
+    Os objetos são gravados pelo ORM em um único flush, em todos os bancos: o
+    SQLAlchemy agrupa os INSERTs em lote (INSERT ... RETURNING em várias
+    linhas) quando o driver permite, e os eventos de Acompanhamento mantêm a
+    série de sinais vitais como em POST /acompanhamentos.
+    """
+    objetos = [Acompanhamento(**valores) for valores in linhas]
+    db.session.add_all(objetos)
+    db.session.flush()
+    return [objeto.id for objeto in objetos]
+
+def _id_paciente(valor):
+    """paciente_id do item como inteiro (aceita texto numérico, como o POST unitário); None se inválido"""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, str) and valor.strip().isdigit():
+        return int(valor)
+    return None
+
+TIMELINE_LIMITE_PADRAO = 50
+TIMELINE_LIMITE_MAXIMO = 200
+CAMPOS_RESUMO = 'id,data_hora,tipo_atendimento,motivo_atendimento'
+
+def _parse_data_hora(valor, fim=False):
+    """
+    Converte o parâmetro from/to (YYYY-MM-DD ou YYYY-MM-DDTHH:MM[:SS]) em datetime.
+    Uma data sem hora no parâmetro 'to' inclui o dia inteiro.
+
+    :return: (datetime, inclusivo)
+    :raises BadRequest: se o formato for inválido
+    """
+    try:
+        data_hora = datetime.fromisoformat(valor)
+    except ValueError:
+        raise BadRequest(f"Data inválida: {valor}. Use YYYY-MM-DD ou YYYY-MM-DDTHH:MM:SS")
+    if data_hora.tzinfo is not None:
+        # O banco guarda data_hora em UTC, sem fuso
+        data_hora = data_hora.astimezone(timezone.utc).replace(tzinfo=None)
+    if fim and len(valor) == 10:
+        return data_hora + timedelta(days=1), False
+    return data_hora, True
+
 @acompanhamentos_routes.route('/pacientes/<int:paciente_id>/acompanhamentos', methods=['GET'])
 def obter_acompanhamentos_por_paciente(paciente_id):
-    """Obter todos os acompanhamentos de um paciente"""
+    """
+    Obter os acompanhamentos de um paciente.
+
+    Sem parâmetros de paginação devolve a lista completa. Com from, to, limit
+    ou cursor devolve a linha do tempo paginada, do mais recente para o mais
+    antigo: {'items': [...], 'next_cursor': ..., 'limit': n}. O next_cursor
+    deve ser enviado em ?cursor= para obter a página seguinte.
+
+    Aceita ?fields=id,data_hora,... para omitir campos (ex: os sub-documentos
+    JSON nas listagens), ?resumo=true para retornar só os campos da linha do
+    tempo e ?bruto=true para copiar os campos JSON armazenados direto para a
+    resposta, sem decodificar e codificar de novo.
+    """
     try:
+        args = request.args
+        resumo = args.get('resumo', '').lower() in ('1', 'true')
+        bruto = args.get('bruto', '').lower() in ('1', 'true')
+        try:
+            campos = acompanhamento_serializer.campos_solicitados(
+                args.get('fields') or (CAMPOS_RESUMO if resumo else None))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        
         # Verificar se o paciente existe
         paciente = Paciente.query.get(paciente_id)
         if not paciente:
             return jsonify({'error': 'Paciente não encontrado'}), 404
             
-        acompanhamentos = Acompanhamento.query.filter_by(paciente_id=paciente_id).all()
-        result = [a.to_dict() for a in acompanhamentos]
+        consulta = acompanhamento_serializer.select(campos).where(Acompanhamento.paciente_id == paciente_id)
+        
+        if not any(p in args for p in ('from', 'to', 'limit', 'cursor')):
+            rows = db.session.execute(consulta).all()
+            if bruto:
+                return Response(acompanhamento_serializer.serializar_json(rows, campos), mimetype='application/json'), 200
+            result = acompanhamento_serializer.serializar(rows, campos)
+            return jsonify(result), 200
+        
+        # Linha do tempo paginada (índice em paciente_id, data_hora)
+        try:
+            limite = int(args.get('limit', TIMELINE_LIMITE_PADRAO))
+        except ValueError:
+            return jsonify({'error': 'Parâmetro limit deve ser numérico'}), 400
+        if not 1 <= limite <= TIMELINE_LIMITE_MAXIMO:
+            return jsonify({'error': f'Parâmetro limit deve estar entre 1 e {TIMELINE_LIMITE_MAXIMO}'}), 400
+        
+        try:
+            if args.get('from'):
+                inicio, _ = _parse_data_hora(args['from'])
+                consulta = consulta.where(Acompanhamento.data_hora >= inicio)
+            if args.get('to'):
+                fim, inclusivo = _parse_data_hora(args['to'], fim=True)
+                consulta = consulta.where(Acompanhamento.data_hora <= fim if inclusivo else Acompanhamento.data_hora < fim)
+            if args.get('cursor'):
+                ultima_data, ultimo_id = decode_cursor(args['cursor'], 2)
+                try:
+                    ultima_data = datetime.fromisoformat(ultima_data)
+                except (TypeError, ValueError):
+                    raise BadRequest("Cursor inválido")
+                if not isinstance(ultimo_id, int):
+                    raise BadRequest("Cursor inválido")
+                consulta = consulta.where(or_(
+                    Acompanhamento.data_hora < ultima_data,
+                    and_(Acompanhamento.data_hora == ultima_data, Acompanhamento.id < ultimo_id),
+                ))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        
+        # data_hora e id vão no fim da linha (fora dos campos) para montar o cursor
+        consulta = (
+            consulta.add_columns(Acompanhamento.data_hora, Acompanhamento.id)
+            .order_by(Acompanhamento.data_hora.desc(), Acompanhamento.id.desc())
+            .limit(limite + 1)
+        )
+        rows = db.session.execute(consulta).all()
+        proximo = None
+        if len(rows) > limite:
+            rows = rows[:limite]
+            proximo = encode_cursor([rows[-1][-2].isoformat(), rows[-1][-1]])
+        
+        if bruto:
+            corpo = (b'{"items":' + acompanhamento_serializer.serializar_json(rows, campos)
+                     + b',"next_cursor":' + json_provider.dumps_bytes(proximo)
+                     + b',"limit":' + str(limite).encode() + b'}')
+            return Response(corpo, mimetype='application/json'), 200
+        
+        return jsonify({
+            'items': acompanhamento_serializer.serializar(rows, campos),
+            'next_cursor': proximo,
+            'limit': limite
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@acompanhamentos_routes.route('/pacientes/<int:paciente_id>/sinais-vitais/estatisticas', methods=['GET'])
+def estatisticas_sinais_vitais(paciente_id):
+    """
+    Estatísticas dos sinais vitais de um paciente.
+
+    Lê a série de sinais vitais (SinalVital) e devolve, por métrica, quantidade,
+    mínimo, máximo, média e percentis. Parâmetros opcionais:
+    metrica=temperatura,saturacao; from/to (mesmo formato da linha do tempo);
+    intervalo=15m|1h|1d|7d para incluir a série reamostrada em janelas UTC;
+    percentis=50,90,95.
+    """
+    try:
+        args = request.args
+        try:
+            intervalo = parse_intervalo(args['intervalo']) if args.get('intervalo') else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        try:
+            percentis = [float(p) for p in args.get('percentis', '50,90,95').split(',') if p.strip()]
+        except ValueError:
+            return jsonify({'error': 'Percentis devem ser números'}), 400
+        if len(percentis) > 10 or any(not 0 <= p <= 100 for p in percentis):
+            return jsonify({'error': 'Informe até 10 percentis entre 0 e 100'}), 400
+        
+        if not Paciente.query.get(paciente_id):
+            return jsonify({'error': 'Paciente não encontrado'}), 404
+        
+        consulta = (
+            db.select(SinalVital.metrica, SinalVital.data_hora, SinalVital.valor)
+            .where(SinalVital.paciente_id == paciente_id)
+            .order_by(SinalVital.metrica, SinalVital.data_hora)
+        )
+        if args.get('metrica'):
+            nomes = [normalize_text(m).replace(' ', '_') for m in args['metrica'].split(',') if m.strip()]
+            consulta = consulta.where(SinalVital.metrica.in_(nomes))
+        try:
+            if args.get('from'):
+                inicio, _ = _parse_data_hora(args['from'])
+                consulta = consulta.where(SinalVital.data_hora >= inicio)
+            if args.get('to'):
+                fim, inclusivo = _parse_data_hora(args['to'], fim=True)
+                consulta = consulta.where(SinalVital.data_hora <= fim if inclusivo else SinalVital.data_hora < fim)
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
         
-        return jsonify(result), 200
+        rows = db.session.execute(consulta).all()
+        return jsonify({
+            'paciente_id': paciente_id,
+            'metricas': agregar(rows, intervalo, percentis)
+        }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -4,14 +4,24 @@ from models.user import User
 from db import db
 import datetime
 import re
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
 import jwt
+import requests
+from utils import validate_cpf
+from services.cep_service import buscar_cep, CepInvalidoError
 from datetime import datetime, timedelta
 from config import Config  # Certifique-se de que o Config está importado
+from services.senhas import pool_senhas, SobrecargaSenhaError
+from services.rehash_senhas import fila_rehash
 
 auth_bp = Blueprint('auth', __name__)
-ph = PasswordHasher()  # Inicializa o objeto PasswordHasher da biblioteca argon2-cffi
+
+# Segundos sugeridos ao cliente para nova tentativa quando o pool de senhas está cheio
+RETRY_AFTER_SOBRECARGA = 2
+
+def _resposta_sobrecarga():
+    resposta = jsonify({'message': 'Servidor ocupado, tente novamente em instantes'})
+    resposta.headers['Retry-After'] = str(RETRY_AFTER_SOBRECARGA)
+    return resposta, 503
 
 @auth_bp.route('/api/register', methods=['POST'])
 def register():
@@ -35,15 +45,19 @@ def register():
         if User.query.filter((User.email == data['email']) | (User.cpf == data['cpf'])).first():
             return jsonify({'message': 'Email ou CPF já cadastrado'}), 409
 
-        # Hash da senha
-        hashed_password = ph.hash(data['password'])
+        # Hash da senha (pool dedicado do Argon2)
+        try:
+            hashed_password = pool_senhas.gerar_hash(data['password'])
+        except SobrecargaSenhaError:
+            return _resposta_sobrecarga()
 
-        # Consulta o CEP na API ViaCEP
-        response = requests.get(f'https://viacep.com.br/ws/{data["cep"]}/json/')
-        response.raise_for_status()
-        endereco_data = response.json()
+        # Consulta o CEP (cache local ou API ViaCEP)
+        try:
+            endereco_data = buscar_cep(data['cep'])
+        except CepInvalidoError as e:
+            return jsonify({'message': str(e)}), 400
 
-        if 'erro' in endereco_data:
+        if endereco_data is None:
             return jsonify({'message': 'CEP não encontrado'}), 404
 
         # Criar novo usuário
@@ -101,6 +115,8 @@ def login():
               example: "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
       401:
         description: Credenciais inválidas
+      503:
+        description: Muitos logins simultâneos; tente novamente após o tempo indicado em Retry-After
     """
     try:
         data = request.get_json()
@@ -110,16 +126,16 @@ def login():
         if not user:
             return jsonify({'message': 'Email ou senha inválidos'}), 401
 
-        # Verificar a senha usando Argon2
+        # Verificar a senha usando Argon2, no pool dedicado
         try:
-            ph.verify(user.password_hash, data.get('password'))
-        except VerifyMismatchError:
-            return jsonify({'message': 'Email ou senha inválidos'}), 401
-
-        # Rehash da senha, se necessário
-        if ph.check_needs_rehash(user.password_hash):
-            user.password_hash = ph.hash(data.get('password'))
-            db.session.commit()
+            if not pool_senhas.verificar(user.password_hash, data.get('password')):
+                return jsonify({'message': 'Email ou senha inválidos'}), 401
+        except SobrecargaSenhaError:
+            return _resposta_sobrecarga()
+
+        # Rehash da senha, se necessário, em segundo plano (não atrasa o login)
+        if pool_senhas.precisa_rehash(user.password_hash):
+            fila_rehash.agendar(app._get_current_object(), user.id, user.password_hash, data.get('password'))
 
         # Gerar token JWT
         expiration = datetime.utcnow() + timedelta(hours=24)
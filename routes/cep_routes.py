@@ -1,6 +1,12 @@
 from flask import Blueprint, jsonify, request
 import requests
 from flasgger import swag_from
+from config import Config
+from services.cep_service import (
+    buscar_cep, buscar_ceps_em_lote, pesquisar_logradouro,
+    cep_cache, cep_offline, cep_singleflight, logradouro_index, CepInvalidoError
+)
+from services.http_client import viacep_client
 
 cep_routes = Blueprint('cep_routes', __name__)
 
@@ -80,28 +86,89 @@ def consultar_cep(cep):
               example: "Erro ao consultar o serviço de CEP: Connection error"
     """
     try:
-        # Formatar o CEP removendo caracteres não numéricos
-        cep_limpo = ''.join(filter(str.isdigit, cep))
-        
-        # Verificar se o CEP tem 8 dígitos
-        if len(cep_limpo) != 8:
-            return jsonify({'error': 'CEP inválido. Deve conter 8 dígitos.'}), 400
-            
-        # Fazer a requisição para a API ViaCEP
-        response = requests.get(f'https://viacep.com.br/ws/{cep_limpo}/json/')
-        response.raise_for_status()  # Levanta uma exceção para códigos de erro HTTP
-        
-        # Verificar se a API retornou um erro
-        data = response.json()
-        if 'erro' in data and data['erro']:
+        # Consultar o CEP (cache local primeiro, depois a API ViaCEP)
+        data = buscar_cep(cep)
+        if data is None:
             return jsonify({'error': 'CEP não encontrado'}), 404
             
         # Retornar o JSON exatamente como recebido da API ViaCEP
         return jsonify(data), 200
         
+    except CepInvalidoError as e:
+        return jsonify({'error': str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({'error': f'Erro ao consultar o serviço de CEP: {str(e)}'}), 500
 
+@cep_routes.route('/cep/lote', methods=['POST'])
+def consultar_ceps_em_lote():
+    """
+    Consultar vários CEPs em uma única requisição
+    ---
+    tags:
+      - Endereços
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            ceps:
+              type: array
+              items:
+                type: string
+              example: ["01001000", "01310-100"]
+              description: "Lista de CEPs (limite definido por CEP_LOTE_MAX)"
+          required:
+            - ceps
+    responses:
+      200:
+        description: Endereço ou erro de cada CEP informado
+        schema:
+          type: object
+          properties:
+            resultados:
+              type: object
+              example:
+                "01001000":
+                  cep: "01001-000"
+                  logradouro: "Praça da Sé"
+                  localidade: "São Paulo"
+                  uf: "SP"
+                "99999999":
+                  error: "CEP não encontrado"
+            total:
+              type: integer
+              example: 2
+            encontrados:
+              type: integer
+              example: 1
+      400:
+        description: Lista de CEPs ausente ou acima do limite
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Informe no máximo 500 CEPs por requisição."
+    """
+    data = request.get_json(silent=True) or {}
+    ceps = data.get('ceps')
+
+    if not isinstance(ceps, list) or not ceps:
+        return jsonify({'error': 'O campo ceps deve ser uma lista não vazia.'}), 400
+    if len(ceps) > Config.CEP_LOTE_MAX:
+        return jsonify({'error': f'Informe no máximo {Config.CEP_LOTE_MAX} CEPs por requisição.'}), 400
+
+    resultados = buscar_ceps_em_lote(ceps)
+    encontrados = sum(1 for endereco in resultados.values() if 'error' not in endereco)
+
+    return jsonify({
+        'resultados': resultados,
+        'total': len(resultados),
+        'encontrados': encontrados
+    }), 200
+
 @cep_routes.route('/endereco', methods=['GET'])
 def consultar_endereco_por_logradouro():
     """
@@ -126,8 +193,14 @@ def consultar_endereco_por_logradouro():
         in: query
         type: string
         required: true
-        description: Nome do logradouro (min. 3 caracteres)
+        description: Nome ou início do logradouro, sem distinção de acentos e maiúsculas (termos com menos de 3 caracteres são pesquisados apenas no índice local)
         example: "Avenida Paulista"
+      - name: limite
+        in: query
+        type: integer
+        required: false
+        default: 50
+        description: Quantidade máxima de endereços retornados
     responses:
       200:
         description: Lista de endereços correspondentes à pesquisa
@@ -173,7 +246,7 @@ def consultar_endereco_por_logradouro():
           properties:
             error:
               type: string
-              example: "Os parâmetros uf, cidade e logradouro são obrigatórios. O logradouro deve ter pelo menos 3 caracteres."
+              example: "Os parâmetros uf, cidade e logradouro são obrigatórios."
       404:
         description: Endereço não encontrado
         schema:
@@ -198,20 +271,106 @@ def consultar_endereco_por_logradouro():
         logradouro = request.args.get('logradouro')
         
         # Validar parâmetros
-        if not uf or not cidade or not logradouro or len(logradouro) < 3:
-            return jsonify({'error': 'Os parâmetros uf, cidade e logradouro são obrigatórios. O logradouro deve ter pelo menos 3 caracteres.'}), 400
+        if not uf or not cidade or not logradouro or not logradouro.strip():
+            return jsonify({'error': 'Os parâmetros uf, cidade e logradouro são obrigatórios.'}), 400
         
-        # Fazer requisição para a API ViaCEP usando o endpoint de pesquisa por endereço
-        response = requests.get(f'https://viacep.com.br/ws/{uf}/{cidade}/{logradouro}/json/')
-        response.raise_for_status()
+        try:
+            limite = min(max(int(request.args.get('limite', 50)), 1), 50)
+        except ValueError:
+            return jsonify({'error': 'O parâmetro limite deve ser numérico'}), 400
         
-        # Verificar se a resposta é válida
-        data = response.json()
-        if not data or (isinstance(data, dict) and 'erro' in data):
+        # Pesquisar no índice local e, se necessário, na API ViaCEP
+        data = pesquisar_logradouro(uf, cidade, logradouro, limite=limite)
+        if not data:
             return jsonify({'error': 'Nenhum endereço encontrado com os parâmetros fornecidos'}), 404
         
         # Retornar a lista de endereços encontrados
         return jsonify(data), 200
         
     except requests.exceptions.RequestException as e:
-        return jsonify({'error': f'Erro ao consultar o serviço de CEP: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Erro ao consultar o serviço de CEP: {str(e)}'}), 500
+
+
+@cep_routes.route('/cep/cache/estatisticas', methods=['GET'])
+def estatisticas_cache_cep():
+    """
+    Estatísticas do cache local de CEP
+    ---
+    tags:
+      - Endereços
+    responses:
+      200:
+        description: Contadores do cache de CEP, do circuito da ViaCEP e das consultas agrupadas
+        schema:
+          type: object
+          properties:
+            size:
+              type: integer
+              example: 1200
+            max_size:
+              type: integer
+              example: 5000
+            hits:
+              type: integer
+              example: 8400
+            misses:
+              type: integer
+              example: 1300
+            evictions:
+              type: integer
+              example: 0
+            hit_ratio:
+              type: number
+              example: 0.866
+            circuito_viacep:
+              type: object
+              properties:
+                estado:
+                  type: string
+                  example: "fechado"
+            consultas_agrupadas:
+              type: object
+              properties:
+                execucoes:
+                  type: integer
+                  example: 1300
+                deduplicadas:
+                  type: integer
+                  example: 240
+    """
+    dados = cep_cache.stats()
+    dados['circuito_viacep'] = viacep_client.breaker.stats()
+    dados['consultas_agrupadas'] = cep_singleflight.stats()
+    dados['indice_logradouros'] = logradouro_index.stats()
+    return jsonify(dados), 200
+
+@cep_routes.route('/cep/base-offline', methods=['GET'])
+def status_base_offline():
+    """
+    Status da base offline de CEPs
+    ---
+    tags:
+      - Endereços
+    responses:
+      200:
+        description: Versão e tamanho do snapshot de CEPs carregado
+        schema:
+          type: object
+          properties:
+            disponivel:
+              type: boolean
+              example: true
+            versao:
+              type: string
+              example: "2025-06"
+            criado_em:
+              type: string
+              example: "2025-06-01 03:00:00"
+            total:
+              type: integer
+              example: 1100000
+    """
+    cep_offline.disponivel()
+    dados = cep_offline.stats()
+    dados.pop('caminho', None)
+    return jsonify(dados), 200
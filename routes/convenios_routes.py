@@ -3,18 +3,39 @@ from db import db
 from models.convenio import Convenio
 from models.plano import Plano
 from flasgger import swag_from
+from werkzeug.exceptions import BadRequest, NotFound, Conflict
+from models.serializers import convenio_serializer, plano_serializer
+from services.catalogo_cache import catalogo
+from services.exclusoes import excluir_convenio as excluir_convenio_por_id, excluir_plano as excluir_plano_por_id
 
 convenios_routes = Blueprint('convenios_routes', __name__)
 
+def _incluir_planos():
+    """Parâmetro incluirPlanos (padrão: true)"""
+    return request.args.get('incluirPlanos', 'true').lower() not in ('0', 'false')
+
 # CONVÊNIOS
 
 @convenios_routes.route('/convenios/listar', methods=['GET'])
+@catalogo('convenios')
 def listar_convenios():
     """
     Listar todos os convênios
     ---
     tags:
       - Convênios
+    parameters:
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Campos a retornar, separados por vírgula (ex: id,nome,planos). Padrão - todos
+      - name: incluirPlanos
+        in: query
+        type: boolean
+        required: false
+        default: true
+        description: Se false, os planos de cada convênio não são carregados nem retornados
     responses:
       200:
         description: Lista de convênios
@@ -47,13 +68,39 @@ def listar_convenios():
               example: "Erro ao listar convênios"
     """
     try:
-        convenios = Convenio.query.all()
-        resultado = [convenio.to_dict() for convenio in convenios]
+        try:
+            campos = convenio_serializer.campos_solicitados(request.args.get('fields'))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        
+        if not _incluir_planos():
+            campos = tuple(c for c in campos if c != 'planos')
+        incluir_planos = 'planos' in campos
+        consulta = campos if not incluir_planos or 'id' in campos else ('id',) + campos
+        rows = db.session.execute(convenio_serializer.select(consulta)).all()
+        resultado = convenio_serializer.serializar(rows, consulta)
+        
+        if incluir_planos:
+            # Planos dos convênios listados em uma única consulta (equivalente
+            # ao selectinload), em vez de uma por convênio
+            planos_por_convenio = {}
+            ids = [convenio['id'] for convenio in resultado]
+            rows_planos = db.session.execute(
+                plano_serializer.select().where(Plano.convenio_id.in_(ids)).order_by(Plano.id)
+            ).all() if ids else []
+            for plano in plano_serializer.serializar(rows_planos):
+                planos_por_convenio.setdefault(plano['convenio_id'], []).append(plano)
+            for convenio in resultado:
+                convenio['planos'] = planos_por_convenio.get(convenio['id'], [])
+                if 'id' not in campos:
+                    del convenio['id']
+        
         return jsonify(resultado), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @convenios_routes.route('/convenios/<int:id>', methods=['GET'])
+@catalogo('convenios')
 def obter_convenio(id):
     """
     Obter um convênio pelo ID
@@ -66,6 +113,12 @@ def obter_convenio(id):
         type: integer
         required: true
         description: ID do convênio
+      - name: incluirPlanos
+        in: query
+        type: boolean
+        required: false
+        default: true
+        description: Se false, os planos do convênio não são carregados nem retornados
     responses:
       200:
         description: Detalhes do convênio
@@ -104,11 +157,12 @@ def obter_convenio(id):
               example: "Erro ao buscar convênio"
     """
     try:
-        convenio = Convenio.query.get(id)
+        incluir_planos = _incluir_planos()
+        convenio = Convenio.consulta(incluir_planos).filter_by(id=id).first()
         if not convenio:
             return jsonify({'error': 'Convênio não encontrado'}), 404
             
-        return jsonify(convenio.to_dict()), 200
+        return jsonify(convenio.to_dict(incluir_planos)), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -184,6 +238,7 @@ def criar_convenio():
         return jsonify({'error': str(e)}), 500
 
 @convenios_routes.route('/planos/convenios/<int:id>', methods=['GET'])
+@catalogo('convenios')
 def obter_planos_convenio(id):
     """
     Obter planos de um convênio específico
@@ -358,12 +413,19 @@ def criar_plano(id):
 # PLANOS
 
 @convenios_routes.route('/planos', methods=['GET'])
+@catalogo('convenios')
 def listar_planos():
     """
     Listar todos os planos
     ---
     tags:
       - Convênios
+    parameters:
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Campos a retornar, separados por vírgula (ex: id,nome). Padrão - todos
     responses:
       200:
         description: Lista de planos
@@ -402,13 +464,17 @@ def listar_planos():
               example: "Erro ao listar planos"
     """
     try:
-        planos = Plano.query.all()
-        resultado = [plano.to_dict() for plano in planos]
-        return jsonify(resultado), 200
+        try:
+            campos = plano_serializer.campos_solicitados(request.args.get('fields'))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        rows = db.session.execute(plano_serializer.select(campos)).all()
+        return jsonify(plano_serializer.serializar(rows, campos)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @convenios_routes.route('/planos/<int:id>', methods=['GET'])
+@catalogo('convenios')
 def obter_plano(id):
     """
     Obter um plano pelo ID
@@ -805,16 +871,11 @@ def excluir_convenio(id):
               example: "Erro ao excluir convênio"
     """
     try:
-        convenio = Convenio.query.get(id)
-        if not convenio:
-            return jsonify({'error': 'Convênio não encontrado'}), 404
-            
-        # Verificar se existem planos associados ao convênio
-        planos = Plano.query.filter_by(convenio_id=id).first()
-        if planos:
-            return jsonify({'error': 'Não é possível excluir o convênio, pois existem planos associados'}), 409
-            
-        db.session.delete(convenio)
+        try:
+            excluir_convenio_por_id(id)
+        except (NotFound, Conflict) as e:
+            db.session.rollback()
+            return jsonify({'error': e.description}), e.code
         db.session.commit()
         
         return jsonify({'message': 'Convênio excluído com sucesso'}), 200
@@ -871,15 +932,11 @@ def excluir_plano(id):
               example: "Erro ao excluir plano"
     """
     try:
-        plano = Plano.query.get(id)
-        if not plano:
-            return jsonify({'error': 'Plano não encontrado'}), 404
-            
-        # Verificar se existem pacientes usando este plano
-        # Esta verificação depende da estrutura do seu modelo de paciente
-        # Exemplo: pacientes = Paciente.query.filter_by(plano_id=id).first()
-        
-        db.session.delete(plano)
+        try:
+            excluir_plano_por_id(id)
+        except NotFound as e:
+            db.session.rollback()
+            return jsonify({'error': e.description}), 404
         db.session.commit()
         
         return jsonify({'message': 'Plano excluído com sucesso'}), 200
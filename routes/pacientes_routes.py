@@ -1,13 +1,104 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from db import db
 from models.pacientes import Paciente
+from models.paciente_ngram import PacienteNgram
+from models.paciente_contagem import PacienteContagem
+from models.serializers import paciente_serializer
 from models.endereco import Endereco
+import csv
+import io
 import json
+import json_provider
+from datetime import datetime
+from sqlalchemy import and_, or_
 from werkzeug.exceptions import NotFound, BadRequest
 from flasgger import swag_from
+from utils import encode_cursor, decode_cursor
+from config import Config
 
 pacientes_routes = Blueprint('pacientes', __name__)
 
+CORRESPONDENCIAS = ('contem', 'prefixo')
+AGRUPAMENTOS_CONTAGEM = ('convenio', 'plano')
+
+def filtrar_por_trecho(query, campo, valor, correspondencia='contem'):
+    """
+    Filtra pacientes cujo nome ou CPF contém (ou começa com) o valor informado.
+
+    A comparação é feita nas colunas normalizadas (nome sem acentos e em
+    minúsculas, CPF só com dígitos), de modo que 'joao' encontra 'João' em
+    qualquer banco. Buscas por prefixo usam o índice da coluna; buscas por
+    trecho obtêm os ids candidatos do índice de n-gramas (PacienteNgram) e
+    mantêm o filtro LIKE para descartar falsos positivos. Um valor que fica
+    vazio após a normalização (ex: CPF 'abc') não encontra nenhum paciente.
+    """
+    normalizado = PacienteNgram.normalizar(campo, valor)
+    if not normalizado:
+        return query.filter(db.false())
+    coluna = Paciente.cpf_digitos if campo == 'cpf' else Paciente.nome_normalizado
+
+    if correspondencia == 'prefixo':
+        return query.filter(coluna.startswith(normalizado, autoescape=True))
+
+    query = query.filter(coluna.contains(normalizado, autoescape=True))
+    candidatos = PacienteNgram.candidatos(campo, valor)
+    if candidatos is not None:
+        query = query.filter(Paciente.id.in_(candidatos))
+    return query
+
+def filtrar_busca_avancada(args):
+    """
+    Monta a consulta de pacientes com os filtros da busca avançada.
+
+    :param args: parâmetros da requisição (nome, cpf, id, dataNascimento,
+                 convenio, status e correspondencia)
+    :return: consulta filtrada, sem ordenação nem paginação
+    :raises BadRequest: se algum parâmetro for inválido
+    """
+    nome = args.get('nome', '')
+    cpf = args.get('cpf', '')
+    id_paciente = args.get('id', '')
+    data_nascimento = args.get('dataNascimento', '')
+    convenio_id = args.get('convenio', '')
+    status = args.get('status', '')
+    correspondencia = args.get('correspondencia', 'contem')
+
+    if correspondencia not in CORRESPONDENCIAS:
+        raise BadRequest('Parâmetro correspondencia deve ser contem ou prefixo')
+
+    query = Paciente.query
+
+    # Aplicar filtros somente se os parâmetros forem fornecidos
+    if nome:
+        query = filtrar_por_trecho(query, 'nome', nome, correspondencia)
+
+    if cpf:
+        query = filtrar_por_trecho(query, 'cpf', cpf, correspondencia)
+
+    if id_paciente:
+        try:
+            query = query.filter(Paciente.id == int(id_paciente))
+        except ValueError:
+            raise BadRequest('ID do paciente deve ser um número')
+
+    if data_nascimento:
+        try:
+            data_obj = datetime.strptime(data_nascimento, '%Y-%m-%d')
+            query = query.filter(Paciente.data_nascimento == data_obj.date())
+        except ValueError:
+            raise BadRequest('Data de nascimento deve estar no formato YYYY-MM-DD')
+
+    if convenio_id:
+        try:
+            query = query.filter(Paciente.convenio_id == int(convenio_id))
+        except ValueError:
+            raise BadRequest('ID do convênio deve ser um número')
+
+    if status:
+        query = query.filter(Paciente.status == status)
+
+    return query
+
 @pacientes_routes.route('/pacientes/criar', methods=['POST'])
 def criar_paciente():
     """
@@ -286,11 +377,11 @@ def buscar_pacientes():
             return jsonify({'error': 'Parâmetros tipo e valor são obrigatórios'}), 400
             
         if tipo == 'cpf':
-            pacientes = Paciente.query.filter(Paciente.cpf.like(f'%{valor}%')).all()
+            pacientes = filtrar_por_trecho(Paciente.query, 'cpf', valor).all()
         elif tipo == 'id':
             pacientes = Paciente.query.filter(Paciente.id == int(valor)).all() if valor.isdigit() else []
         elif tipo == 'nome':
-            pacientes = Paciente.query.filter(Paciente.nome_completo.ilike(f'%{valor}%')).all()
+            pacientes = filtrar_por_trecho(Paciente.query, 'nome', valor).all()
         else:
             return jsonify({'error': 'Tipo de busca inválido'}), 400
             
@@ -676,6 +767,12 @@ def listar_todos_pacientes():
     ---
     tags:
       - Pacientes
+    parameters:
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Campos a retornar, separados por vírgula (ex: id,nome). Padrão - todos
     responses:
       200:
         description: Lista de todos os pacientes
@@ -715,12 +812,114 @@ def listar_todos_pacientes():
               example: "Erro ao listar pacientes: mensagem de erro"
     """
     try:
-        pacientes = Paciente.query.all()
-        resultado = [paciente.to_dict() for paciente in pacientes]
-        return jsonify(resultado), 200
+        try:
+            campos = paciente_serializer.campos_solicitados(request.args.get('fields'))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        rows = db.session.execute(paciente_serializer.select(campos)).all()
+        return jsonify(paciente_serializer.serializar(rows, campos)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+FORMATOS_EXPORTACAO = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+def gerar_exportacao(query, formato, tamanho_lote):
+    """
+    Gera o conteúdo da exportação em blocos, um por lote de pacientes.
+
+    A consulta é percorrida com yield_per, que busca as linhas do banco aos
+    poucos (cursor no servidor quando suportado), de modo que a memória usada
+    não depende da quantidade de pacientes.
+    """
+    colunas = None
+    resultado = db.session.scalars(
+        query.order_by(Paciente.id).statement,
+        execution_options={'yield_per': tamanho_lote}
+    )
+    for lote in resultado.partitions():
+        buffer = io.StringIO()
+        if formato == 'csv':
+            writer = csv.writer(buffer)
+            for paciente in lote:
+                dados = paciente.to_dict()
+                if colunas is None:
+                    colunas = list(dados)
+                    writer.writerow(colunas)
+                writer.writerow([dados[coluna] for coluna in colunas])
+        else:
+            for paciente in lote:
+                buffer.write(json_provider.dumps(paciente.to_dict()))
+                buffer.write('\n')
+        yield buffer.getvalue()
+
+@pacientes_routes.route('/pacientes/exportar', methods=['GET'])
+def exportar_pacientes():
+    """
+    Exportar pacientes em NDJSON ou CSV
+    ---
+    tags:
+      - Pacientes
+    description: >
+      Exporta os pacientes em streaming, lendo a tabela em lotes. Aceita os
+      mesmos filtros da busca avançada (nome, cpf, id, dataNascimento,
+      convenio, status e correspondencia).
+    produces:
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - name: formato
+        in: query
+        type: string
+        required: false
+        default: ndjson
+        enum: [ndjson, csv]
+        description: Formato do arquivo (um paciente por linha)
+      - name: nome
+        in: query
+        type: string
+        required: false
+        description: Nome completo ou parcial do paciente
+      - name: cpf
+        in: query
+        type: string
+        required: false
+        description: CPF completo ou parcial do paciente
+      - name: status
+        in: query
+        type: string
+        required: false
+        description: Status do paciente
+    responses:
+      200:
+        description: Arquivo com os pacientes, ordenados por id
+      400:
+        description: Parâmetros inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Formato deve ser ndjson ou csv"
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS_EXPORTACAO:
+        return jsonify({'error': 'Formato deve ser ndjson ou csv'}), 400
+
+    try:
+        query = filtrar_busca_avancada(request.args)
+    except BadRequest as e:
+        return jsonify({'error': e.description}), 400
+
+    conteudo = gerar_exportacao(query, formato, Config.PACIENTES_EXPORT_CHUNK_SIZE)
+    return Response(
+        stream_with_context(conteudo),
+        mimetype=FORMATOS_EXPORTACAO[formato],
+        headers={'Content-Disposition': f'attachment; filename=pacientes.{formato}'}
+    )
+
 # Adicione este novo endpoint de busca avançada
 
 @pacientes_routes.route('/pacientes/busca-avancada', methods=['GET'])
@@ -761,18 +960,39 @@ def busca_avancada_pacientes():
         type: string
         required: false
         description: Status do paciente
+      - name: correspondencia
+        in: query
+        type: string
+        required: false
+        default: contem
+        enum: [contem, prefixo]
+        description: Forma de comparação do nome e do CPF (sem diferenciar acentos e maiúsculas)
       - name: page
         in: query
         type: integer
         required: false
         default: 1
-        description: Página de resultados
+        description: Página de resultados (paginação por deslocamento)
       - name: limit
         in: query
         type: integer
         required: false
         default: 10
         description: Quantidade de resultados por página
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: >
+          Ativa a paginação por cursor, ordenada por nome e id. Envie vazio para
+          a primeira página e o next_cursor da resposta anterior para as
+          seguintes. Nesse modo a resposta traz items, next_cursor e limit.
+      - name: incluirTotal
+        in: query
+        type: boolean
+        required: false
+        default: false
+        description: Na paginação por cursor, inclui o total de resultados (exige contagem completa)
     responses:
       200:
         description: Lista de pacientes que correspondem aos critérios de busca
@@ -811,6 +1031,9 @@ def busca_avancada_pacientes():
             total_pages:
               type: integer
               example: 5
+            next_cursor:
+              type: string
+              example: "WyJKb8OjbyBkYSBTaWx2YSIsMTJd"
       400:
         description: Parâmetros inválidos
         schema:
@@ -829,13 +1052,10 @@ def busca_avancada_pacientes():
               example: "Erro ao buscar pacientes: mensagem de erro"
     """
     try:
-        # Extrair todos os parâmetros da query
-        nome = request.args.get('nome', '')
-        cpf = request.args.get('cpf', '')
-        id_paciente = request.args.get('id', '')
-        data_nascimento = request.args.get('dataNascimento', '')
-        convenio_id = request.args.get('convenio', '')
-        status = request.args.get('status', '')
+        try:
+            query = filtrar_busca_avancada(request.args)
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
         
         # Parâmetros de paginação
         try:
@@ -844,39 +1064,43 @@ def busca_avancada_pacientes():
         except ValueError:
             return jsonify({'error': 'Parâmetros de paginação devem ser numéricos'}), 400
         
-        # Iniciar a consulta
-        query = Paciente.query
-        
-        # Aplicar filtros somente se os parâmetros forem fornecidos
-        if nome:
-            query = query.filter(Paciente.nome_completo.ilike(f'%{nome}%'))
-        
-        if cpf:
-            query = query.filter(Paciente.cpf.like(f'%{cpf}%'))
-        
-        if id_paciente:
-            try:
-                query = query.filter(Paciente.id == int(id_paciente))
-            except ValueError:
-                return jsonify({'error': 'ID do paciente deve ser um número'}), 400
-        
-        if data_nascimento:
-            # Verificar formato da data
-            try:
-                from datetime import datetime
-                data_obj = datetime.strptime(data_nascimento, '%Y-%m-%d')
-                query = query.filter(Paciente.data_nascimento == data_obj.date())
-            except ValueError:
-                return jsonify({'error': 'Data de nascimento deve estar no formato YYYY-MM-DD'}), 400
-        
-        if convenio_id:
-            try:
-                query = query.filter(Paciente.convenio_id == int(convenio_id))
-            except ValueError:
-                return jsonify({'error': 'ID do convênio deve ser um número'}), 400
+        # Ordenação estável, necessária para paginar sem repetir ou pular itens
+        query = query.order_by(Paciente.nome_completo, Paciente.id)
         
-        if status:
-            query = query.filter(Paciente.status == status)
+        # Paginação por cursor: busca direto a partir do último item da página anterior
+        if 'cursor' in request.args:
+            if limit < 1:
+                return jsonify({'error': 'Parâmetro limit deve ser maior que zero'}), 400
+            
+            filtrada = query
+            cursor = request.args.get('cursor')
+            if cursor:
+                try:
+                    ultimo_nome, ultimo_id = decode_cursor(cursor, 2)
+                except BadRequest as e:
+                    return jsonify({'error': e.description}), 400
+                if not isinstance(ultimo_nome, str) or not isinstance(ultimo_id, int):
+                    return jsonify({'error': 'Cursor inválido'}), 400
+                query = query.filter(or_(
+                    Paciente.nome_completo > ultimo_nome,
+                    and_(Paciente.nome_completo == ultimo_nome, Paciente.id > ultimo_id),
+                ))
+            
+            # Um item a mais indica se existe próxima página, sem precisar de COUNT
+            pacientes = query.limit(limit + 1).all()
+            proximo = None
+            if len(pacientes) > limit:
+                pacientes = pacientes[:limit]
+                proximo = encode_cursor([pacientes[-1].nome_completo, pacientes[-1].id])
+            
+            response = {
+                'items': [p.to_dict() for p in pacientes],
+                'next_cursor': proximo,
+                'limit': limit
+            }
+            if request.args.get('incluirTotal', '').lower() in ('1', 'true'):
+                response['total'] = filtrada.order_by(None).count()
+            return jsonify(response), 200
         
         # Contar o total de resultados para a paginação
         total = query.count()
@@ -897,9 +1121,6 @@ def busca_avancada_pacientes():
         # Converter para dicionário
         resultado = [p.to_dict() for p in pacientes]
         
-        # Debug: imprimir o que está sendo retornado
-        print(f"Retornando {len(resultado)} pacientes")
-        
         # Garantir que a estrutura da resposta é consistente
         response = {
             'items': resultado,
@@ -908,8 +1129,6 @@ def busca_avancada_pacientes():
             'total_pages': total_pages
         }
         
-        print("Resposta da API:", response)
-        
         return jsonify(response), 200
         
     except Exception as e:
@@ -934,4 +1153,114 @@ def listar_status_options():
         status_list = [status[0] for status in status_options if status[0]]
         return jsonify(status_list), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+def contar_pacientes(agrupar='plano', status=None):
+    """
+    Quantidade de pacientes por convênio (ou por convênio e plano) e status.
+
+    Lê os contadores de PacienteContagem quando Config.PACIENTES_CONTADORES
+    está habilitado (uma linha por combinação); caso contrário, faz um COUNT
+    agrupado sobre o índice (convenio_id, plano_id, status) de paciente.
+
+    :return: (fonte, linhas) com linhas (convenio_id, [plano_id,] status, quantidade)
+    """
+    if Config.PACIENTES_CONTADORES:
+        fonte, model, quantidade = 'contadores', PacienteContagem, db.func.sum(PacienteContagem.quantidade)
+    else:
+        fonte, model, quantidade = 'consulta', Paciente, db.func.count(Paciente.id)
+
+    grupo = [model.convenio_id] + ([model.plano_id] if agrupar == 'plano' else []) + [model.status]
+    query = db.session.query(*grupo, quantidade).group_by(*grupo)
+    if status:
+        query = query.filter(model.status.in_(status))
+    return fonte, query.all()
+
+@pacientes_routes.route('/pacientes/contagem', methods=['GET'])
+def contagem_pacientes():
+    """
+    Contagem de pacientes por convênio ou plano
+    ---
+    tags:
+      - Pacientes
+    description: >
+      Quantidade de pacientes por convênio (agrupar=convenio) ou por convênio e
+      plano (agrupar=plano), com o detalhamento por status. Pacientes sem
+      convênio ou plano aparecem com convenio_id/plano_id nulos.
+    parameters:
+      - name: agrupar
+        in: query
+        type: string
+        enum: [convenio, plano]
+        required: false
+        default: plano
+      - name: status
+        in: query
+        type: string
+        required: false
+        description: Status a considerar, separados por vírgula (ex - ativo). Padrão - todos
+    responses:
+      200:
+        description: Contagens agrupadas
+        schema:
+          type: object
+          properties:
+            agrupar:
+              type: string
+              example: "plano"
+            fonte:
+              type: string
+              enum: [contadores, consulta]
+            total:
+              type: integer
+              example: 42
+            itens:
+              type: array
+              items:
+                type: object
+                properties:
+                  convenio_id:
+                    type: integer
+                    example: 1
+                  plano_id:
+                    type: integer
+                    example: 3
+                  quantidade:
+                    type: integer
+                    example: 12
+                  por_status:
+                    type: object
+                    example: {"ativo": 10, "em-avaliacao": 2}
+      400:
+        description: Parâmetro inválido
+    """
+    try:
+        agrupar = request.args.get('agrupar', 'plano')
+        if agrupar not in AGRUPAMENTOS_CONTAGEM:
+            return jsonify({'error': f"Agrupamento inválido: {agrupar}. Use {' ou '.join(AGRUPAMENTOS_CONTAGEM)}"}), 400
+        status = [s.strip() for s in request.args.get('status', '').split(',') if s.strip()]
+
+        fonte, linhas = contar_pacientes(agrupar, status)
+
+        itens = {}
+        for *chave, status_paciente, quantidade in linhas:
+            quantidade = int(quantidade or 0)
+            if not quantidade:
+                continue
+            # Nos contadores, convênio/plano ausente é gravado como 0
+            chave = tuple(valor or None for valor in chave)
+            item = itens.get(chave)
+            if item is None:
+                item = itens[chave] = dict(zip(('convenio_id', 'plano_id'), chave), quantidade=0, por_status={})
+            item['quantidade'] += quantidade
+            item['por_status'][status_paciente] = quantidade
+
+        ordenados = [itens[chave] for chave in sorted(itens, key=lambda c: tuple((v is None, v or 0) for v in c))]
+        return jsonify({
+            'agrupar': agrupar,
+            'fonte': fonte,
+            'total': sum(item['quantidade'] for item in ordenados),
+            'itens': ordenados
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'Erro ao contar pacientes: {str(e)}'}), 500
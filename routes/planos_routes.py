@@ -3,10 +3,13 @@ from models.plano import Plano
 from db import db
 from flasgger import swag_from
 from werkzeug.exceptions import NotFound, BadRequest
+from services.catalogo_cache import catalogo
+from services.exclusoes import excluir_plano as excluir_plano_por_id
 
 planos_routes = Blueprint('planos_routes', __name__)
 
 @planos_routes.route('/planos', methods=['GET'])
+@catalogo('convenios')
 def listar_planos():
     """
     Listar todos os planos de convênios
@@ -58,6 +61,7 @@ def listar_planos():
         return jsonify({'error': f'Erro ao listar planos: {str(e)}'}), 500
 
 @planos_routes.route('/planos/<int:plano_id>', methods=['GET'])
+@catalogo('convenios')
 def obter_plano(plano_id):
     """
     Obter um plano específico pelo ID
@@ -124,6 +128,7 @@ def obter_plano(plano_id):
         return jsonify({'error': f'Erro ao buscar plano: {str(e)}'}), 500
 
 @planos_routes.route('/planos/convenio/<int:convenio_id>', methods=['GET'])
+@catalogo('convenios')
 def listar_planos_por_convenio(convenio_id):
     """
     Listar planos por convênio
@@ -400,11 +405,11 @@ def excluir_plano(plano_id):
               example: "Erro ao excluir plano: mensagem de erro"
     """
     try:
-        plano = Plano.query.get(plano_id)
-        if not plano:
-            return jsonify({'error': 'Plano não encontrado'}), 404
-            
-        db.session.delete(plano)
+        try:
+            excluir_plano_por_id(plano_id)
+        except NotFound as e:
+            db.session.rollback()
+            return jsonify({'error': e.description}), 404
         db.session.commit()
         
         return jsonify({'message': 'Plano excluído com sucesso'}), 200
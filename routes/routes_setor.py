@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from models.setores_funcoes import Setor, Funcao
 from db import db
 from flasgger import swag_from
+from services.catalogo_cache import catalogo
 
 # Fixed url_prefix from ' ' to '' (empty string)
 bp = Blueprint('api', __name__, url_prefix='')
@@ -11,6 +12,7 @@ bp = Blueprint('api', __name__, url_prefix='')
 # -------------------------------
 
 @bp.route('/setores', methods=['GET'])
+@catalogo('setores')
 def get_setores():
     """
     Retorna todos os setores disponíveis
@@ -191,6 +193,7 @@ def delete_setor(setor_id):
 # -------------------------------
 
 @bp.route('/funcoes', methods=['GET'])
+@catalogo('setores')
 def get_funcoes():
     """
     Retorna todas as funções disponíveis
@@ -230,6 +233,7 @@ def get_funcoes():
     ])
 
 @bp.route('/funcoes/<int:setor_id>', methods=['GET'])
+@catalogo('setores')
 def get_funcoes_por_setor(setor_id):
     """
     Retorna as funções de um setor específico
@@ -460,6 +464,7 @@ def delete_funcao(funcao_id):
 setores_funcoes_bp = Blueprint('setores_funcoes', __name__)
 
 @setores_funcoes_bp.route('/setores/dicionario', methods=['GET'])
+@catalogo('setores')
 def get_setores_dicionario():
     """
     Retorna um dicionário de todos os setores
@@ -490,6 +495,7 @@ def get_setores_dicionario():
     return jsonify(setores_dict)
 
 @setores_funcoes_bp.route('/funcoes/dicionario', methods=['GET'])
+@catalogo('setores')
 def get_funcoes_dicionario():
     """
     Retorna um dicionário de todas as funções
@@ -526,6 +532,7 @@ def get_funcoes_dicionario():
     return jsonify(funcoes_dict)
 
 @setores_funcoes_bp.route('/setores/dicionario/<int:setor_id>', methods=['GET'])
+@catalogo('setores')
 def get_setor_by_id(setor_id):
     """
     Retorna um setor específico no formato de dicionário
@@ -566,6 +573,7 @@ def get_setor_by_id(setor_id):
     })
 
 @setores_funcoes_bp.route('/funcoes/dicionario/<int:funcao_id>', methods=['GET'])
+@catalogo('setores')
 def get_funcao_by_id(funcao_id):
     """
     Retorna uma função específica no formato de dicionário
@@ -614,6 +622,7 @@ def get_funcao_by_id(funcao_id):
     })
 
 @setores_funcoes_bp.route('/setores/<int:setor_id>/funcoes/dicionario', methods=['GET'])
+@catalogo('setores')
 def get_funcoes_by_setor_dicionario(setor_id):
     """
     Retorna todas as funções de um setor específico no formato de dicionário
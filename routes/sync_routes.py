@@ -0,0 +1,361 @@
+import heapq
+from datetime import datetime, timedelta, timezone
+
+from flask import Blueprint, request, jsonify
+from sqlalchemy import and_, or_
+from werkzeug.exceptions import BadRequest
+
+from db import db
+from config import Config
+from models.registro_excluido import RegistroExcluido, ENTIDADES_SYNC, ENTIDADES_REGISTRADAS
+from models.serializers import (
+    paciente_serializer, convenio_serializer, plano_serializer, acompanhamento_serializer
+)
+from utils import encode_cursor, decode_cursor
+
+sync_routes = Blueprint('sync_routes', __name__)
+
+SYNC_LIMITE_PADRAO = 500
+SYNC_LIMITE_MAXIMO = 1000
+
+SERIALIZADORES = {
+    'pacientes': paciente_serializer,
+    'convenios': convenio_serializer,
+    'planos': plano_serializer,
+    'acompanhamentos': acompanhamento_serializer,
+}
+
+# Posição de cada fonte no desempate de registros com o mesmo updated_at
+ORDEM = {nome: i for i, nome in enumerate(list(ENTIDADES_SYNC) + ['excluidos'])}
+
+
+def _filtro_posicao(coluna_data, coluna_id, ordem, posicao):
+    """
+    Registros posteriores à posição (data, ordem da fonte, id) do cursor.
+
+    Todas as fontes são percorridas em uma única ordem total, o que permite
+    retomar o feed exatamente de onde a página anterior parou.
+    """
+    if posicao is None:
+        return None
+    data, ordem_cursor, id_cursor = posicao
+    if ordem > ordem_cursor:
+        return coluna_data >= data
+    if ordem < ordem_cursor:
+        return coluna_data > data
+    return or_(coluna_data > data, and_(coluna_data == data, coluna_id > id_cursor))
+
+
+def _ler_data(valor, parametro):
+    """Data/hora ISO 8601 (UTC) de um parâmetro de consulta; None se ausente"""
+    if not valor:
+        return None
+    try:
+        data = datetime.fromisoformat(valor)
+    except ValueError:
+        raise BadRequest(f"Parâmetro {parametro} deve ser uma data/hora ISO 8601")
+    if data.tzinfo is not None:
+        data = data.astimezone(timezone.utc).replace(tzinfo=None)
+    return data
+
+
+def _ler_posicao(since):
+    """
+    Interpreta o parâmetro since: cursor devolvido pelo feed (next_since) ou
+    data/hora ISO 8601 (UTC) para a primeira sincronização.
+    """
+    if not since:
+        return None
+    try:
+        return _ler_data(since, 'since'), -1, 0
+    except BadRequest:
+        pass
+    data, ordem, ultimo_id = decode_cursor(since, 3)
+    try:
+        data = datetime.fromisoformat(data)
+    except (TypeError, ValueError):
+        raise BadRequest("Cursor inválido")
+    if not isinstance(ordem, int) or not isinstance(ultimo_id, int):
+        raise BadRequest("Cursor inválido")
+    return data, ordem, ultimo_id
+
+
+def _alteracoes(nome, posicao, limite, ate):
+    """Registros criados ou alterados de uma entidade, na ordem do feed"""
+    model = ENTIDADES_SYNC[nome]
+    serializer = SERIALIZADORES[nome]
+    campos = tuple(n for n in serializer.nomes if n not in serializer.extras)
+
+    consulta = (
+        serializer.select(campos)
+        .add_columns(model.updated_at, model.id)
+        .where(model.updated_at <= ate)
+        .order_by(model.updated_at, model.id)
+        .limit(limite)
+    )
+    filtro = _filtro_posicao(model.updated_at, model.id, ORDEM[nome], posicao)
+    if filtro is not None:
+        consulta = consulta.where(filtro)
+
+    rows = db.session.execute(consulta).all()
+    dados = serializer.serializar(rows, campos)
+    for row, registro in zip(rows, dados):
+        yield (row[-2], ORDEM[nome], row[-1]), {
+            'entidade': nome, 'operacao': 'upsert', 'id': row[-1], 'dados': registro
+        }
+
+
+def _exclusoes(entidades, posicao, limite, ate):
+    """Marcas de exclusão das entidades, na ordem do feed"""
+    consulta = (
+        db.select(RegistroExcluido.id, RegistroExcluido.entidade,
+                  RegistroExcluido.registro_id, RegistroExcluido.excluido_em)
+        .where(RegistroExcluido.entidade.in_(entidades), RegistroExcluido.excluido_em <= ate)
+        .order_by(RegistroExcluido.excluido_em, RegistroExcluido.id)
+        .limit(limite)
+    )
+    filtro = _filtro_posicao(RegistroExcluido.excluido_em, RegistroExcluido.id, ORDEM['excluidos'], posicao)
+    if filtro is not None:
+        consulta = consulta.where(filtro)
+
+    for marca_id, entidade, registro_id, excluido_em in db.session.execute(consulta):
+        yield (excluido_em, ORDEM['excluidos'], marca_id), {
+            'entidade': entidade, 'operacao': 'delete', 'id': registro_id,
+            'excluido_em': excluido_em.isoformat(' ', 'seconds')
+        }
+
+
+@sync_routes.route('/sync', methods=['GET'])
+def sincronizar():
+    """
+    Feed de sincronização incremental
+    ---
+    tags:
+      - Sincronização
+    description: >
+      Devolve os registros de pacientes, convênios, planos e acompanhamentos
+      criados, alterados ou excluídos desde a última sincronização, em ordem de
+      updated_at. Envie o next_since da resposta em ?since= para continuar;
+      quando tem_mais for false o cliente está em dia e deve guardar o
+      next_since para a próxima sincronização. Registros alterados nos últimos
+      segundos (SYNC_MARGEM_SEGUNDOS) só aparecem na chamada seguinte, para
+      que transações ainda não confirmadas não sejam puladas.
+    parameters:
+      - name: since
+        in: query
+        type: string
+        required: false
+        description: next_since da resposta anterior ou data/hora ISO 8601 (UTC). Vazio para sincronização completa
+      - name: entidades
+        in: query
+        type: string
+        required: false
+        description: Entidades separadas por vírgula (pacientes, convenios, planos, acompanhamentos). Padrão - todas
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 500
+        description: Quantidade máxima de alterações na resposta (até 1000)
+    responses:
+      200:
+        description: Alterações em ordem de updated_at
+        schema:
+          type: object
+          properties:
+            alteracoes:
+              type: array
+              items:
+                type: object
+                properties:
+                  entidade:
+                    type: string
+                    example: "pacientes"
+                  operacao:
+                    type: string
+                    enum: [upsert, delete]
+                  id:
+                    type: integer
+                    example: 42
+                  dados:
+                    type: object
+            next_since:
+              type: string
+              example: "WyIyMDI1LTA0LTEwIDA5OjAwOjAwIiwwLDQyXQ"
+            tem_mais:
+              type: boolean
+      400:
+        description: Parâmetros inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Cursor inválido"
+      410:
+        description: Marca d'água anterior à retenção das exclusões; é necessária uma sincronização completa
+    """
+    try:
+        since = request.args.get('since', '')
+        try:
+            posicao = _ler_posicao(since)
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+
+        entidades = [e.strip() for e in request.args.get('entidades', '').split(',') if e.strip()] \
+            or list(ENTIDADES_SYNC)
+        invalidas = [e for e in entidades if e not in ENTIDADES_SYNC]
+        if invalidas:
+            return jsonify({'error': f"Entidades inválidas: {', '.join(invalidas)}"}), 400
+
+        try:
+            limite = int(request.args.get('limit', SYNC_LIMITE_PADRAO))
+        except ValueError:
+            return jsonify({'error': 'Parâmetro limit deve ser numérico'}), 400
+        if not 1 <= limite <= SYNC_LIMITE_MAXIMO:
+            return jsonify({'error': f'Parâmetro limit deve estar entre 1 e {SYNC_LIMITE_MAXIMO}'}), 400
+
+        # Marcas de exclusão anteriores à retenção já podem ter sido compactadas
+        if posicao and posicao[0] < RegistroExcluido.limite_retencao(Config.REGISTRO_EXCLUIDO_RETENCAO_DIAS):
+            return jsonify({'error': 'Marca d\'água expirada; faça uma sincronização completa (since vazio)'}), 410
+
+        ate = datetime.utcnow() - timedelta(seconds=Config.SYNC_MARGEM_SEGUNDOS)
+
+        # Cada fonte devolve no máximo limite + 1 itens já ordenados; a
+        # intercalação mantém a ordem total do feed
+        fontes = [_alteracoes(nome, posicao, limite + 1, ate) for nome in entidades]
+        fontes.append(_exclusoes(entidades, posicao, limite + 1, ate))
+        itens = []
+        for chave, item in heapq.merge(*fontes, key=lambda par: par[0]):
+            itens.append((chave, item))
+            if len(itens) > limite:
+                break
+
+        tem_mais = len(itens) > limite
+        itens = itens[:limite]
+        if itens:
+            data, ordem, ultimo_id = itens[-1][0]
+            next_since = encode_cursor([data.isoformat(), ordem, ultimo_id])
+        else:
+            next_since = since or None
+
+        return jsonify({
+            'alteracoes': [item for _, item in itens],
+            'next_since': next_since,
+            'tem_mais': tem_mais
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao sincronizar: {str(e)}'}), 500
+
+
+@sync_routes.route('/sync/exclusoes', methods=['GET'])
+def listar_exclusoes():
+    """
+    Lista as exclusões registradas em um intervalo de tempo
+    ---
+    tags:
+      - Sincronização
+    description: >
+      Registro de exclusões para invalidação de caches e replicação. Inclui
+      usuários inativados. As marcas são mantidas por
+      REGISTRO_EXCLUIDO_RETENCAO_DIAS dias.
+    parameters:
+      - name: entidades
+        in: query
+        type: string
+        required: false
+        description: Entidades separadas por vírgula (pacientes, convenios, planos, acompanhamentos, usuarios). Padrão - todas
+      - name: from
+        in: query
+        type: string
+        required: false
+        description: Início do intervalo (inclusivo), data/hora ISO 8601 (UTC)
+      - name: to
+        in: query
+        type: string
+        required: false
+        description: Fim do intervalo (exclusivo), data/hora ISO 8601 (UTC)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 500
+        description: Quantidade máxima de marcas na resposta (até 1000)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Cursor opaco retornado em next_cursor
+    responses:
+      200:
+        description: Marcas de exclusão em ordem de exclusão
+        schema:
+          type: object
+          properties:
+            items:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  entidade:
+                    type: string
+                    example: "pacientes"
+                  registro_id:
+                    type: integer
+                    example: 42
+                  excluido_em:
+                    type: string
+                    example: "2025-04-10 09:00:00"
+            next_cursor:
+              type: string
+            limit:
+              type: integer
+      400:
+        description: Parâmetros inválidos
+    """
+    try:
+        entidades = [e.strip() for e in request.args.get('entidades', '').split(',') if e.strip()]
+        invalidas = [e for e in entidades if e not in ENTIDADES_REGISTRADAS]
+        if invalidas:
+            return jsonify({'error': f"Entidades inválidas: {', '.join(invalidas)}"}), 400
+
+        try:
+            de = _ler_data(request.args.get('from'), 'from')
+            ate = _ler_data(request.args.get('to'), 'to')
+            limite = int(request.args.get('limit', SYNC_LIMITE_PADRAO))
+            cursor = request.args.get('cursor')
+            ultimo = decode_cursor(cursor, 2) if cursor else None
+        except ValueError:
+            return jsonify({'error': 'Parâmetro limit deve ser numérico'}), 400
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        if not 1 <= limite <= SYNC_LIMITE_MAXIMO:
+            return jsonify({'error': f'Parâmetro limit deve estar entre 1 e {SYNC_LIMITE_MAXIMO}'}), 400
+
+        consulta = RegistroExcluido.consultar(de, ate, entidades)
+        if ultimo:
+            try:
+                data, ultimo_id = datetime.fromisoformat(ultimo[0]), int(ultimo[1])
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Cursor inválido'}), 400
+            consulta = consulta.filter(
+                _filtro_posicao(RegistroExcluido.excluido_em, RegistroExcluido.id, 0, (data, 0, ultimo_id))
+            )
+
+        marcas = consulta.limit(limite + 1).all()
+        next_cursor = None
+        if len(marcas) > limite:
+            marcas = marcas[:limite]
+            next_cursor = encode_cursor([marcas[-1].excluido_em.isoformat(), marcas[-1].id])
+
+        return jsonify({
+            'items': [m.to_dict() for m in marcas],
+            'next_cursor': next_cursor,
+            'limit': limite
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao listar exclusões: {str(e)}'}), 500
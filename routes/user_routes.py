@@ -1,11 +1,14 @@
 from flask import Flask, Blueprint, request, jsonify
 from models.user import User
+from models.registro_excluido import RegistroExcluido
 from db import db
 from flasgger import Swagger, swag_from
 import re
 import bleach
 from werkzeug.exceptions import BadRequest, Conflict, NotFound
-from utils import validate_cpf, sanitize_input
+from utils import validate_cpf, sanitize_input, normalize_text, only_digits
+from services.cep_service import buscar_cep, CepInvalidoError
+from models.serializers import user_serializer
 import requests
 from datetime import datetime
 
@@ -152,11 +155,12 @@ def create_user():
         if not cep:
             return jsonify({'error': 'CEP é obrigatório'}), 400
 
-        response = requests.get(f'https://viacep.com.br/ws/{cep}/json/')
-        response.raise_for_status()
-        endereco_via_cep = response.json()
+        try:
+            endereco_via_cep = buscar_cep(cep)
+        except CepInvalidoError as e:
+            return jsonify({'error': str(e)}), 400
 
-        if 'erro' in endereco_via_cep:
+        if endereco_via_cep is None:
             return jsonify({'error': 'CEP não encontrado'}), 404
 
         # Mesclar o endereço da API ViaCEP com os dados enviados pelo formulário
@@ -234,6 +238,15 @@ def create_user():
 @user_routes.route('/usuarios/lista', methods=['GET'])
 @swag_from({
     'tags': ['Usuários'],
+    'parameters': [
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Campos a retornar, separados por vírgula (ex: id,nome,email). Padrão: todos'
+        }
+    ],
     'responses': {
         '200': {
             'description': 'Lista de usuários',
@@ -268,8 +281,12 @@ def get_all_users():
     Lista todos os usuários cadastrados.
     """
     try:
-        usuarios = User.query.all()
-        return jsonify([user.to_dict() for user in usuarios]), 200
+        try:
+            campos = user_serializer.campos_solicitados(request.args.get('fields'))
+        except BadRequest as e:
+            return jsonify({'error': e.description}), 400
+        rows = db.session.execute(user_serializer.select(campos)).all()
+        return jsonify(user_serializer.serializar(rows, campos)), 200
     except Exception as e:
         return jsonify({'error': f'Erro ao listar usuários: {str(e)}'}), 500
 
@@ -431,11 +448,9 @@ def update_user(id):
         new_cep = data.get('cep')
         if new_cep and new_cep != user.cep:
             try:
-                response = requests.get(f'https://viacep.com.br/ws/{new_cep}/json/')
-                response.raise_for_status()
-                endereco_via_cep = response.json()
+                endereco_via_cep = buscar_cep(new_cep)
 
-                if 'erro' in endereco_via_cep:
+                if endereco_via_cep is None:
                     return jsonify({'error': 'CEP não encontrado'}), 404
                 
                 # Mesclar o endereço da API ViaCEP com os dados enviados pelo formulário
@@ -462,6 +477,8 @@ def update_user(id):
 
                 user.cep = new_cep
                 user.endereco = endereco_final
+            except CepInvalidoError as e:
+                return jsonify({'error': str(e)}), 400
             except requests.exceptions.RequestException as e:
                 return jsonify({'error': f'Erro ao consultar o serviço de CEP: {str(e)}'}), 500
 
@@ -538,8 +555,10 @@ def delete_user(id):
         if not user:
             raise NotFound('Usuário não encontrado')
 
-        # Marca o usuário como inativo
-        user.status = 'Inativo'
+        # Marca o usuário como inativo e registra a exclusão na mesma transação
+        if user.status != 'Inativo':
+            user.status = 'Inativo'
+            db.session.add(RegistroExcluido(entidade='usuarios', registro_id=user.id))
         db.session.commit()
         return jsonify({'message': 'Usuário excluído com sucesso'}), 200
     except Exception as e:
@@ -665,6 +684,15 @@ def visualizar_usuario(id):
             'required': False,
             'description': 'Status do usuário'
         },
+        {
+            'name': 'correspondencia',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'default': 'contem',
+            'enum': ['contem', 'prefixo'],
+            'description': 'Forma de comparação do nome, email e CPF (sem diferenciar acentos e maiúsculas)'
+        },
         {
             'name': 'page',
             'in': 'query',
@@ -742,6 +770,10 @@ def busca_avancada_usuarios():
         setor = request.args.get('setor', '')
         funcao = request.args.get('funcao', '')
         status = request.args.get('status', '')
+        correspondencia = request.args.get('correspondencia', 'contem')
+        
+        if correspondencia not in ('contem', 'prefixo'):
+            return jsonify({'error': 'Parâmetro correspondencia deve ser contem ou prefixo'}), 400
         
         # Parâmetros de paginação
         try:
@@ -754,14 +786,23 @@ def busca_avancada_usuarios():
         query = User.query
         
         # Aplicar filtros somente se os parâmetros forem fornecidos
+        # Nome, email e CPF são comparados nas colunas normalizadas (indexadas);
+        # um valor vazio após a normalização (ex: CPF 'abc') não encontra ninguém
+        def filtrar(coluna, valor):
+            if not valor:
+                return query.filter(db.false())
+            if correspondencia == 'prefixo':
+                return query.filter(coluna.startswith(valor, autoescape=True))
+            return query.filter(coluna.contains(valor, autoescape=True))
+        
         if nome:
-            query = query.filter(User.nome.ilike(f'%{nome}%'))
+            query = filtrar(User.nome_normalizado, normalize_text(nome))
         
         if email:
-            query = query.filter(User.email.ilike(f'%{email}%'))
+            query = filtrar(User.email_normalizado, normalize_text(email))
         
         if cpf:
-            query = query.filter(User.cpf.like(f'%{cpf}%'))
+            query = filtrar(User.cpf_digitos, only_digits(cpf))
         
         if id_usuario:
             try:
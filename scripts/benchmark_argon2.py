@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.senhas import PoolSenhas, criar_hasher
+from config import Config
+
+# Conjuntos de parâmetros (time_cost, memory_cost em KiB, parallelism)
+CONJUNTOS_PADRAO = [
+    (2, 19456, 1),   # mínimo recomendado pelo OWASP
+    (3, 65536, 4),   # padrão do argon2-cffi
+    (4, 131072, 4),
+]
+
+def medir(time_cost, memory_cost, parallelism, workers, logins):
+    """Logins (verificações) por segundo com o pool de senhas usando `workers` threads"""
+    hasher = criar_hasher(time_cost, memory_cost, parallelism)
+    hash_senha = hasher.hash('CuidarPlus@2025')
+    pool = PoolSenhas(hasher, workers=workers, fila_max=logins)
+
+    with ThreadPoolExecutor(max_workers=workers) as clientes:
+        inicio = time.perf_counter()
+        resultados = list(clientes.map(lambda _: pool.verificar(hash_senha, 'CuidarPlus@2025'), range(logins)))
+        duracao = time.perf_counter() - inicio
+    assert all(resultados)
+    return logins / duracao, duracao / logins
+
+def ler_conjunto(texto):
+    time_cost, memory_cost, parallelism = (int(v) for v in texto.split(','))
+    return time_cost, memory_cost, parallelism
+
+def main():
+    parser = argparse.ArgumentParser(description='Mede logins/s por núcleo para conjuntos de parâmetros do Argon2')
+    parser.add_argument('--conjunto', type=ler_conjunto, action='append',
+                        help='time_cost,memory_cost,parallelism (pode repetir). Padrão: conjuntos de referência e o configurado')
+    parser.add_argument('--workers', type=int, default=Config.ARGON2_WORKERS, help='Threads do pool de senhas')
+    parser.add_argument('--logins', type=int, default=50, help='Verificações por conjunto')
+    args = parser.parse_args()
+
+    configurado = (Config.ARGON2_TIME_COST, Config.ARGON2_MEMORY_COST, Config.ARGON2_PARALLELISM)
+    conjuntos = args.conjunto or list(dict.fromkeys(CONJUNTOS_PADRAO + [configurado]))
+    nucleos = os.cpu_count() or 1
+    print(f"{nucleos} núcleo(s), pool com {args.workers} worker(s)")
+    print(f"{'t':>3} {'m (KiB)':>9} {'p':>3} {'logins/s':>10} {'logins/s/núcleo':>16} {'ms/login':>9}")
+    for time_cost, memory_cost, parallelism in conjuntos:
+        por_segundo, segundos = medir(time_cost, memory_cost, parallelism, args.workers, args.logins)
+        marca = '  <- configurado' if (time_cost, memory_cost, parallelism) == configurado else ''
+        print(f"{time_cost:>3} {memory_cost:>9} {parallelism:>3} {por_segundo:>10.1f} "
+              f"{por_segundo / min(nucleos, args.workers):>16.1f} {segundos * 1000:>9.1f}{marca}")
+
+if __name__ == '__main__':
+    main()
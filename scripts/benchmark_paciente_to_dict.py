@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import timeit
+from datetime import date, datetime
+
+from models.pacientes import Paciente
+from models.endereco import Endereco
+
+def criar_pacientes(quantidade):
+    """Pacientes em memória (sem banco) com endereço preenchido"""
+    endereco = Endereco(cep='01001-000', logradouro='Praça da Sé', bairro='Sé',
+                        localidade='São Paulo', uf='SP', numero='100')
+    pacientes = []
+    for i in range(quantidade):
+        paciente = Paciente(
+            id=i + 1, nome_completo=f'Paciente {i}', cpf=f'{i:011d}',
+            data_nascimento=date(1980, 1, 1), acomodacao='Apartamento',
+            telefone='(11) 98765-4321', cid_primario='G40', status='em-avaliacao',
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+        )
+        paciente.endereco_json = endereco.to_json()
+        pacientes.append(paciente)
+    return pacientes
+
+def to_dict_anterior(paciente):
+    """Reproduz a serialização anterior: decodifica o endereço duas vezes e descarta o resultado"""
+    Endereco.from_json(paciente.endereco_json).to_dict() if Endereco.from_json(paciente.endereco_json) else {}
+    return paciente.to_dict()
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara o custo por linha de Paciente.to_dict')
+    parser.add_argument('--linhas', type=int, default=10000, help='Quantidade de pacientes serializados')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições de cada medição (usa a menor)')
+    args = parser.parse_args()
+
+    pacientes = criar_pacientes(args.linhas)
+    medicoes = {
+        'anterior': lambda: [to_dict_anterior(p) for p in pacientes],
+        'atual': lambda: [p.to_dict() for p in pacientes],
+        'atual (endereço expandido)': lambda: [p.to_dict(expandir_endereco=True) for p in pacientes],
+    }
+    for nome, funcao in medicoes.items():
+        melhor = min(timeit.repeat(funcao, number=1, repeat=args.repeticoes))
+        print(f"{nome:<28} {melhor * 1e6 / args.linhas:8.2f} µs/linha")
+
+if __name__ == '__main__':
+    main()
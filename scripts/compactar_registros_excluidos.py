@@ -0,0 +1,25 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from config import Config
+from db import db
+from models.registro_excluido import RegistroExcluido
+
+def compactar_registros_excluidos(retencao_dias=None):
+    """
+    Remove as marcas de exclusão mais antigas que a retenção configurada
+    (REGISTRO_EXCLUIDO_RETENCAO_DIAS). Deve ser agendado periodicamente (cron).
+    """
+    retencao_dias = retencao_dias or Config.REGISTRO_EXCLUIDO_RETENCAO_DIAS
+    with app.app_context():
+        try:
+            total = RegistroExcluido.compactar(retencao_dias)
+            print(f"Marcas de exclusão removidas: {total} (retenção de {retencao_dias} dias)")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Erro ao compactar marcas de exclusão: {str(e)}")
+
+if __name__ == '__main__':
+    compactar_registros_excluidos(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -1,4 +1,3 @@
-from argon2 import PasswordHasher
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -6,12 +5,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app import app
 from db import db
 from models.user import User
+from services.senhas import criar_hasher
 
 def create_root_user():
     """
     Cria um usuário root com privilégios administrativos completos.
     """
-    ph = PasswordHasher()
+    ph = criar_hasher()  # Parâmetros do Argon2 da implantação (Config.ARGON2_*)
     
     with app.app_context():
         # Verifica se o usuário root já existe
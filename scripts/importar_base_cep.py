@@ -0,0 +1,34 @@
+import argparse
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from services.cep_offline import construir_snapshot, ler_registros
+
+def importar_base_cep():
+    """
+    Importa uma base completa de CEPs (CSV ou NDJSON) para o snapshot SQLite
+    consultado pelas rotas /cep/<cep> e /endereco.
+
+    O snapshot é publicado de forma atômica; as instâncias da API em execução
+    passam a usar a nova base na próxima verificação, sem reinício.
+    """
+    parser = argparse.ArgumentParser(description='Importa uma base de CEPs para consulta offline.')
+    parser.add_argument('arquivo', help='Arquivo CSV ou NDJSON com os CEPs')
+    parser.add_argument('--formato', choices=['csv', 'ndjson'], help='Formato do arquivo (padrão: pela extensão)')
+    parser.add_argument('--delimitador', default=',', help='Delimitador de colunas do CSV (padrão: ",")')
+    parser.add_argument('--versao', help='Rótulo da versão da base (padrão: data/hora atual)')
+    parser.add_argument('--destino', default=Config.CEP_OFFLINE_DB, help='Caminho do snapshot gerado')
+    args = parser.parse_args()
+
+    registros = ler_registros(args.arquivo, formato=args.formato, delimitador=args.delimitador)
+    try:
+        total = construir_snapshot(registros, args.destino, versao=args.versao)
+    except Exception as e:
+        print(f"Erro ao importar base de CEPs: {e}")
+        sys.exit(1)
+    print(f"Base de CEPs importada com sucesso: {total} CEPs em {args.destino}")
+
+if __name__ == "__main__":
+    importar_base_cep()
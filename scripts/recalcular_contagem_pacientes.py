@@ -0,0 +1,29 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from db import db
+from models.pacientes import Paciente
+from models.paciente_contagem import PacienteContagem
+
+def recalcular_contagem_pacientes():
+    """
+    Reconstrói os contadores de pacientes por convênio/plano/status a partir
+    da tabela de pacientes. Necessário ao habilitar PACIENTES_CONTADORES ou
+    para corrigir divergências.
+    """
+    with app.app_context():
+        try:
+            linhas = db.session.query(
+                Paciente.convenio_id, Paciente.plano_id, Paciente.status, db.func.count(Paciente.id)
+            ).group_by(Paciente.convenio_id, Paciente.plano_id, Paciente.status).all()
+            PacienteContagem.substituir(db.session.connection(), linhas)
+            db.session.commit()
+            print(f"Contadores de pacientes reconstruídos: {len(linhas)} combinações")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Erro ao reconstruir os contadores de pacientes: {str(e)}")
+
+if __name__ == '__main__':
+    recalcular_contagem_pacientes()
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from db import db
+from models.pacientes import Paciente
+from models.paciente_ngram import PacienteNgram
+
+def reindexar_pacientes(lote=1000):
+    """
+    Reconstrói o índice de n-gramas (nome e CPF) de todos os pacientes.
+    Necessário uma única vez para pacientes cadastrados antes do índice existir.
+    """
+    with app.app_context():
+        try:
+            db.session.execute(PacienteNgram.__table__.delete())
+            total = 0
+            query = db.session.query(Paciente.id, Paciente.nome_completo, Paciente.cpf).order_by(Paciente.id)
+            linhas = []
+            for paciente_id, nome, cpf in query.yield_per(lote):
+                linhas.extend(PacienteNgram.linhas_paciente(paciente_id, nome, cpf))
+                total += 1
+                if len(linhas) >= lote * 20:
+                    db.session.execute(PacienteNgram.__table__.insert(), linhas)
+                    linhas = []
+            if linhas:
+                db.session.execute(PacienteNgram.__table__.insert(), linhas)
+            db.session.commit()
+            print(f"Índice de pacientes reconstruído com sucesso: {total} pacientes.")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Erro ao reconstruir índice de pacientes: {e}")
+
+if __name__ == "__main__":
+    reindexar_pacientes()
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from db import db
+from models.acompanhamento import Acompanhamento
+from models.sinal_vital import SinalVital
+import json_provider
+
+def reindexar_sinais_vitais(lote=1000):
+    """
+    Reconstrói a série de sinais vitais a partir dos acompanhamentos.
+    Necessário uma única vez para atendimentos registrados antes da série existir.
+    """
+    with app.app_context():
+        try:
+            db.session.execute(SinalVital.__table__.delete())
+            total = 0
+            query = (
+                db.session.query(Acompanhamento.id, Acompanhamento.paciente_id,
+                                 Acompanhamento.data_hora, Acompanhamento.sinais_vitais_json)
+                .filter(Acompanhamento.sinais_vitais_json.isnot(None))
+                .order_by(Acompanhamento.id)
+            )
+            linhas = []
+            for acompanhamento_id, paciente_id, data_hora, sinais_json in query.yield_per(lote):
+                try:
+                    sinais = json_provider.loads(sinais_json) if sinais_json else None
+                except ValueError:
+                    print(f"Acompanhamento {acompanhamento_id}: sinais vitais com JSON inválido, ignorado")
+                    continue
+                linhas.extend(SinalVital.linhas_acompanhamento(acompanhamento_id, paciente_id, data_hora, sinais))
+                if len(linhas) >= lote:
+                    db.session.execute(SinalVital.__table__.insert(), linhas)
+                    total += len(linhas)
+                    linhas = []
+            if linhas:
+                db.session.execute(SinalVital.__table__.insert(), linhas)
+                total += len(linhas)
+            db.session.commit()
+            print(f"Série de sinais vitais reconstruída: {total} leituras")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Erro ao reconstruir a série de sinais vitais: {str(e)}")
+
+if __name__ == '__main__':
+    reindexar_sinais_vitais()
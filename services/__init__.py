@@ -0,0 +1 @@
+# Pacote de serviços de infraestrutura compartilhados pelas rotas
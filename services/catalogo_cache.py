@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, make_response, current_app
+
+from config import Config
+from models.catalogo_versao import CatalogoVersao
+
+
+class CatalogoCache:
+    """
+    Cache em memória das respostas serializadas dos catálogos.
+
+    As entradas são indexadas por (catálogo, URL da requisição) e guardam a
+    versão do catálogo com que foram geradas; uma entrada de versão diferente
+    da atual é descartada na leitura. Como a versão vem do banco, a
+    invalidação vale para todos os processos sem comunicação entre eles.
+    """
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave, versao):
+        """Retorna ``(corpo, mimetype)`` da entrada ou ``None`` se não houver entrada válida"""
+        with self._lock:
+            entry = self._entries.get(chave)
+            if entry is None:
+                return None
+            if entry[0] != versao:
+                del self._entries[chave]
+                return None
+            self._entries.move_to_end(chave)
+            return entry[1], entry[2]
+
+    def set(self, chave, versao, corpo, mimetype):
+        with self._lock:
+            self._entries[chave] = (versao, corpo, mimetype)
+            self._entries.move_to_end(chave)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = CatalogoCache(max_size=Config.CATALOGO_CACHE_MAX_ENTRADAS)
+
+
+def _etag(nome, versao, url):
+    # Mesma versão e mesma URL produzem exatamente os mesmos bytes: ETag forte
+    resumo = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    return f'{nome}-{versao}-{resumo}'
+
+
+def catalogo(nome):
+    """
+    Decorator para rotas GET de catálogos de dados de referência.
+
+    Responde 304 quando o If-None-Match coincide com o ETag da versão atual do
+    catálogo e, caso contrário, serve os bytes já serializados do cache local,
+    executando a rota apenas quando o catálogo mudou. Só respostas 200 são
+    guardadas.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versao = CatalogoVersao.atual(nome)
+            url = request.full_path
+            etag = _etag(nome, versao, url)
+
+            if request.if_none_match.contains(etag):
+                resposta = current_app.response_class(status=304)
+            else:
+                chave = (nome, url)
+                entrada = _cache.get(chave, versao)
+                if entrada is None:
+                    resposta = make_response(view(*args, **kwargs))
+                    if resposta.status_code != 200:
+                        return resposta
+                    _cache.set(chave, versao, resposta.get_data(), resposta.mimetype)
+                else:
+                    corpo, mimetype = entrada
+                    resposta = current_app.response_class(corpo, mimetype=mimetype)
+
+            resposta.set_etag(etag)
+            # O cliente pode guardar a resposta, mas deve revalidá-la a cada uso
+            resposta.headers['Cache-Control'] = 'no-cache'
+            return resposta
+        return wrapper
+    return decorator
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CepCache:
+    """
+    Cache em memória para respostas da API ViaCEP.
+
+    As entradas são indexadas pelo CEP normalizado (8 dígitos), expiram após um
+    TTL configurável e são descartadas na ordem LRU quando o tamanho máximo é
+    atingido. Respostas de CEP inexistente (``erro: true``) também são guardadas
+    (cache negativo), com um TTL próprio, normalmente menor.
+    """
+
+    def __init__(self, max_size=5000, ttl=86400, negative_ttl=3600, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def get(self, cep):
+        """
+        Retorna a entrada ``(encontrado, dados)`` do CEP ou ``None`` se não
+        houver entrada válida. ``encontrado`` é False para o cache negativo.
+        """
+        with self._lock:
+            entry = self._entries.get(cep)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, found, data = entry
+            if expires_at <= self._clock():
+                # A entrada expirada é mantida para uso como fallback (get_stale)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cep)
+            self.hits += 1
+            return found, data
+
+    def get_stale(self, cep):
+        """
+        Retorna a última entrada conhecida do CEP, mesmo que expirada.
+        Usado como fallback quando a API ViaCEP está indisponível.
+        """
+        with self._lock:
+            entry = self._entries.get(cep)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1], entry[2]
+
+    def set(self, cep, data):
+        """Armazena o endereço encontrado para o CEP"""
+        self._store(cep, True, data, self.ttl)
+
+    def set_not_found(self, cep):
+        """Armazena a ausência do CEP (cache negativo)"""
+        self._store(cep, False, None, self.negative_ttl)
+
+    def _store(self, cep, found, data, ttl):
+        with self._lock:
+            self._entries[cep] = (self._clock() + ttl, found, data)
+            self._entries.move_to_end(cep)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.stale_hits = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'negative_ttl': self.negative_ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'stale_hits': self.stale_hits,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            }
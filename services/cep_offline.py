@@ -0,0 +1,294 @@
+import csv
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from utils import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato do snapshot. Deve ser incrementada sempre que o esquema mudar.
+SNAPSHOT_FORMAT_VERSION = 2
+
+CAMPOS_ENDERECO = [
+    'cep', 'logradouro', 'complemento', 'bairro', 'localidade',
+    'uf', 'ibge', 'gia', 'ddd', 'siafi',
+]
+
+# Nomes alternativos de colunas encontrados nas bases públicas de CEP
+ALIASES_CAMPOS = {
+    'cidade': 'localidade',
+    'municipio': 'localidade',
+    'estado': 'uf',
+    'endereco': 'logradouro',
+    'rua': 'logradouro',
+}
+
+ESQUEMA_SNAPSHOT = """
+CREATE TABLE meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE cep (
+    cep TEXT PRIMARY KEY,
+    logradouro TEXT,
+    complemento TEXT,
+    bairro TEXT,
+    localidade TEXT,
+    uf TEXT,
+    ibge TEXT,
+    gia TEXT,
+    ddd TEXT,
+    siafi TEXT,
+    localidade_normalizada TEXT,
+    logradouro_normalizado TEXT
+) WITHOUT ROWID;
+"""
+
+INDICES_SNAPSHOT = """
+CREATE INDEX ix_cep_uf_localidade ON cep (uf, localidade_normalizada);
+"""
+
+
+class SnapshotInvalidoError(Exception):
+    """Arquivo que não é um snapshot de CEP reconhecido"""
+
+
+def formatar_cep(cep):
+    """Formata um CEP de 8 dígitos no padrão 00000-000 usado pela ViaCEP"""
+    return f'{cep[:5]}-{cep[5:]}'
+
+
+def ler_registros(caminho, formato=None, delimitador=','):
+    """
+    Lê os registros de um arquivo de CEPs em CSV ou NDJSON.
+
+    :param caminho: caminho do arquivo
+    :param formato: 'csv' ou 'ndjson' (detectado pela extensão se omitido)
+    :param delimitador: delimitador de colunas para arquivos CSV
+    :return: gerador de dicionários com as chaves no padrão ViaCEP
+    """
+    if formato is None:
+        formato = 'ndjson' if caminho.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+    with open(caminho, encoding='utf-8', newline='') as arquivo:
+        if formato == 'ndjson':
+            linhas = (json.loads(linha) for linha in arquivo if linha.strip())
+        elif formato == 'csv':
+            linhas = csv.DictReader(arquivo, delimiter=delimitador)
+        else:
+            raise ValueError(f"Formato de arquivo não suportado: {formato}")
+
+        for linha in linhas:
+            registro = {}
+            for chave, valor in linha.items():
+                if chave is None:
+                    continue
+                chave = chave.strip().lower()
+                chave = ALIASES_CAMPOS.get(chave, chave)
+                if chave in CAMPOS_ENDERECO and chave not in registro:
+                    registro[chave] = (str(valor).strip() if valor is not None else '')
+            yield registro
+
+
+def construir_snapshot(registros, destino, versao=None):
+    """
+    Gera um novo snapshot SQLite a partir dos registros e o publica de forma
+    atômica no caminho de destino (substituindo o snapshot anterior).
+
+    :param registros: iterável de dicionários no padrão ViaCEP
+    :param destino: caminho final do snapshot
+    :param versao: rótulo da versão da base (padrão: data/hora da importação)
+    :return: quantidade de CEPs importados
+    """
+    diretorio = os.path.dirname(os.path.abspath(destino))
+    os.makedirs(diretorio, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(prefix='.cep-', suffix='.sqlite', dir=diretorio)
+    os.close(fd)
+
+    try:
+        conn = sqlite3.connect(temporario)
+        try:
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.executescript(ESQUEMA_SNAPSHOT)
+
+            def linhas():
+                for registro in registros:
+                    cep = ''.join(filter(str.isdigit, registro.get('cep') or ''))
+                    if len(cep) != 8:
+                        continue
+                    yield (
+                        cep,
+                        registro.get('logradouro', ''),
+                        registro.get('complemento', ''),
+                        registro.get('bairro', ''),
+                        registro.get('localidade', ''),
+                        (registro.get('uf') or '').upper(),
+                        registro.get('ibge', ''),
+                        registro.get('gia', ''),
+                        registro.get('ddd', ''),
+                        registro.get('siafi', ''),
+                        normalize_text(registro.get('localidade')),
+                        normalize_text(registro.get('logradouro')),
+                    )
+
+            conn.executemany(
+                'INSERT OR REPLACE INTO cep VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                linhas()
+            )
+            conn.executescript(INDICES_SNAPSHOT)
+            total = conn.execute('SELECT COUNT(*) FROM cep').fetchone()[0]
+            conn.executemany('INSERT INTO meta (chave, valor) VALUES (?, ?)', [
+                ('format_version', str(SNAPSHOT_FORMAT_VERSION)),
+                ('versao', versao or datetime.utcnow().strftime('%Y%m%d%H%M%S')),
+                ('criado_em', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')),
+                ('total', str(total)),
+            ])
+            conn.commit()
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+
+        # os.replace é atômico: leitores abertos continuam no arquivo antigo
+        os.replace(temporario, destino)
+        return total
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+class CepOfflineStore:
+    """
+    Consulta somente leitura a um snapshot SQLite de CEPs.
+
+    O arquivo é verificado periodicamente; quando um novo snapshot é publicado
+    no mesmo caminho, a conexão é trocada sem necessidade de reiniciar a
+    aplicação. Se o arquivo não existir, o store fica indisponível e as
+    consultas retornam None.
+    """
+
+    def __init__(self, caminho, check_interval=30, clock=time.monotonic):
+        self.caminho = caminho
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+        self._assinatura = None
+        self._proxima_verificacao = 0.0
+        self.meta = {}
+
+    def _assinatura_arquivo(self):
+        try:
+            st = os.stat(self.caminho)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _abrir(self):
+        uri = f'file:{os.path.abspath(self.caminho)}?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        try:
+            meta = dict(conn.execute('SELECT chave, valor FROM meta').fetchall())
+        except sqlite3.DatabaseError as e:
+            conn.close()
+            raise SnapshotInvalidoError(f"Snapshot de CEP inválido: {e}")
+        if meta.get('format_version') != str(SNAPSHOT_FORMAT_VERSION):
+            conn.close()
+            raise SnapshotInvalidoError(
+                f"Versão de formato do snapshot não suportada: {meta.get('format_version')}"
+            )
+        return conn, meta
+
+    def _verificar(self, forcar=False):
+        """Troca a conexão se o arquivo do snapshot mudou. Chamar com o lock."""
+        agora = self._clock()
+        if not forcar and agora < self._proxima_verificacao:
+            return
+        self._proxima_verificacao = agora + self.check_interval
+
+        assinatura = self._assinatura_arquivo()
+        if assinatura == self._assinatura:
+            return
+
+        if assinatura is None:
+            novo, meta = None, {}
+        else:
+            try:
+                novo, meta = self._abrir()
+            except (SnapshotInvalidoError, sqlite3.Error) as e:
+                # Mantém o snapshot anterior em uso
+                logger.error("Falha ao carregar snapshot de CEP %s: %s", self.caminho, e)
+                return
+
+        antigo = self._conn
+        self._conn, self.meta, self._assinatura = novo, meta, assinatura
+        if antigo is not None:
+            antigo.close()
+
+    def recarregar(self):
+        """Força a verificação do arquivo do snapshot"""
+        with self._lock:
+            self._verificar(forcar=True)
+            return self._conn is not None
+
+    def disponivel(self):
+        with self._lock:
+            self._verificar()
+            return self._conn is not None
+
+    def buscar(self, cep):
+        """
+        Busca um CEP normalizado (8 dígitos) no snapshot.
+
+        :return: dados do endereço no formato da ViaCEP ou None
+        """
+        with self._lock:
+            self._verificar()
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                'SELECT cep, logradouro, complemento, bairro, localidade, uf, ibge, gia, ddd, siafi '
+                'FROM cep WHERE cep = ?', (cep,)
+            ).fetchone()
+        return self._para_dict(row) if row else None
+
+    def listar_cidade(self, uf, cidade):
+        """
+        Lista os endereços de uma cidade, ignorando acentos e maiúsculas no nome.
+
+        :return: lista de endereços no formato da ViaCEP (vazia se o snapshot
+                 não estiver disponível)
+        """
+        with self._lock:
+            self._verificar()
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(
+                'SELECT cep, logradouro, complemento, bairro, localidade, uf, ibge, gia, ddd, siafi '
+                'FROM cep WHERE uf = ? AND localidade_normalizada = ?',
+                ((uf or '').upper(), normalize_text(cidade))
+            ).fetchall()
+        return [self._para_dict(row) for row in rows]
+
+    @staticmethod
+    def _para_dict(row):
+        dados = dict(zip(CAMPOS_ENDERECO, row))
+        dados['cep'] = formatar_cep(dados['cep'])
+        return dados
+
+    def stats(self):
+        with self._lock:
+            return {
+                'disponivel': self._conn is not None,
+                'caminho': self.caminho,
+                'versao': self.meta.get('versao'),
+                'criado_em': self.meta.get('criado_em'),
+                'total': int(self.meta['total']) if self.meta.get('total') else 0,
+            }
@@ -0,0 +1,200 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from config import Config
+from services.cep_cache import CepCache
+from services.cep_offline import CepOfflineStore
+from services.http_client import viacep_client
+from services.logradouro_index import LogradouroIndex
+from services.singleflight import SingleFlight
+
+VIACEP_URL = 'https://viacep.com.br/ws/{cep}/json/'
+VIACEP_PESQUISA_URL = 'https://viacep.com.br/ws/{uf}/{cidade}/{logradouro}/json/'
+
+# Cache compartilhado por todas as rotas que consultam CEP
+cep_cache = CepCache(
+    max_size=Config.CEP_CACHE_MAX_SIZE,
+    ttl=Config.CEP_CACHE_TTL,
+    negative_ttl=Config.CEP_CACHE_NEGATIVE_TTL,
+)
+
+# Base offline de CEPs; a API ViaCEP é usada apenas como fallback
+cep_offline = CepOfflineStore(
+    Config.CEP_OFFLINE_DB,
+    check_interval=Config.CEP_OFFLINE_CHECK_INTERVAL,
+)
+
+# Índice local de logradouros, alimentado pelas consultas e pela base offline
+logradouro_index = LogradouroIndex()
+
+# Consultas concorrentes ao mesmo CEP compartilham uma única chamada à ViaCEP
+cep_singleflight = SingleFlight()
+
+# Pool compartilhado para consultas em lote, limitando as chamadas simultâneas à ViaCEP
+_executor_lote = ThreadPoolExecutor(max_workers=Config.CEP_LOTE_CONCORRENCIA, thread_name_prefix='cep-lote')
+
+
+class CepInvalidoError(ValueError):
+    """CEP que não possui 8 dígitos"""
+
+
+def normalizar_cep(cep):
+    """
+    Remove caracteres não numéricos do CEP.
+
+    :param cep: CEP no formato 00000000 ou 00000-000
+    :return: CEP com 8 dígitos ou None se o formato for inválido
+    """
+    if not cep:
+        return None
+    cep_limpo = ''.join(filter(str.isdigit, str(cep)))
+    return cep_limpo if len(cep_limpo) == 8 else None
+
+
+def _consultar_viacep(cep):
+    response = viacep_client.get(VIACEP_URL.format(cep=cep))
+    response.raise_for_status()
+    return response.json()
+
+
+def _atualizar_cep(cep):
+    """Consulta a ViaCEP e atualiza o cache. Executada uma vez por CEP em andamento."""
+    data = _consultar_viacep(cep)
+    if data.get('erro'):
+        cep_cache.set_not_found(cep)
+        return None
+    cep_cache.set(cep, data)
+    logradouro_index.adicionar(data)
+    return data
+
+
+def buscar_cep(cep):
+    """
+    Consulta o endereço de um CEP na base offline e no cache local antes de
+    recorrer à API ViaCEP.
+
+    :param cep: CEP do endereço (com ou sem formatação)
+    :return: dados do endereço no formato da ViaCEP ou None se o CEP não existir
+    :raises CepInvalidoError: se o CEP não tiver 8 dígitos
+    :raises requests.RequestException: se a consulta à ViaCEP falhar e não
+                                       houver resposta anterior em cache
+    """
+    cep_limpo = normalizar_cep(cep)
+    if not cep_limpo:
+        raise CepInvalidoError('CEP inválido. Deve conter 8 dígitos.')
+
+    local = _buscar_local(cep_limpo)
+    if local is not None:
+        found, data = local
+        return dict(data) if found else None
+
+    return _buscar_remoto(cep_limpo)
+
+
+def _buscar_local(cep_limpo):
+    """
+    Consulta a base offline e o cache local.
+
+    :return: ``(encontrado, dados)`` ou None se o CEP precisar ser consultado na ViaCEP
+    """
+    offline = cep_offline.buscar(cep_limpo)
+    if offline is not None:
+        return True, offline
+    return cep_cache.get(cep_limpo)
+
+
+def _buscar_remoto(cep_limpo):
+    try:
+        data = cep_singleflight.do(cep_limpo, lambda: _atualizar_cep(cep_limpo))
+    except requests.RequestException:
+        # ViaCEP indisponível: usa a última resposta conhecida, mesmo expirada
+        stale = cep_cache.get_stale(cep_limpo)
+        if stale is None:
+            raise
+        found, data = stale
+        return dict(data) if found else None
+
+    return dict(data) if data is not None else None
+
+
+def buscar_ceps_em_lote(ceps):
+    """
+    Consulta vários CEPs de uma vez. Os CEPs presentes na base offline ou no
+    cache são respondidos imediatamente; os demais são consultados na ViaCEP
+    em paralelo, com concorrência limitada por CEP_LOTE_CONCORRENCIA.
+
+    :param ceps: lista de CEPs (com ou sem formatação)
+    :return: dicionário CEP informado -> endereço ou {'error': mensagem}
+    """
+    resultados = {}
+    pendentes = {}
+
+    for cep in ceps:
+        chave = str(cep)
+        if chave in resultados or chave in pendentes:
+            continue
+        cep_limpo = normalizar_cep(chave)
+        if not cep_limpo:
+            resultados[chave] = {'error': 'CEP inválido. Deve conter 8 dígitos.'}
+            continue
+        local = _buscar_local(cep_limpo)
+        if local is None:
+            pendentes[chave] = cep_limpo
+            continue
+        found, data = local
+        resultados[chave] = dict(data) if found else {'error': 'CEP não encontrado'}
+
+    # Um CEP pode aparecer em formatos diferentes; consulta cada um só uma vez
+    futuros = {
+        cep_limpo: _executor_lote.submit(_buscar_remoto, cep_limpo)
+        for cep_limpo in set(pendentes.values())
+    }
+    for chave, cep_limpo in pendentes.items():
+        try:
+            data = futuros[cep_limpo].result()
+        except requests.RequestException as e:
+            resultados[chave] = {'error': f'Erro ao consultar o serviço de CEP: {str(e)}'}
+            continue
+        resultados[chave] = dict(data) if data is not None else {'error': 'CEP não encontrado'}
+
+    return resultados
+
+
+def pesquisar_logradouro(uf, cidade, logradouro, limite=50):
+    """
+    Pesquisa endereços por UF, cidade e logradouro no índice local e, se
+    necessário, na API ViaCEP (que exige ao menos 3 caracteres).
+
+    O índice responde sozinho quando a cidade foi carregada da base offline
+    ou quando encontra logradouros que correspondem ao termo. Sem a base
+    offline ele só contém endereços já consultados, e nomes apenas parecidos
+    (ex: 'Rua Aurora' para 'Rua Augusta') não indicam que a rua buscada não
+    existe: nesse caso a ViaCEP é consultada e seus endereços são somados aos
+    do índice.
+
+    :return: lista de endereços no formato da ViaCEP, por relevância
+             (vazia se nada for encontrado)
+    :raises requests.RequestException: se a consulta à ViaCEP falhar
+    """
+    logradouro_index.carregar_offline(uf, cidade, cep_offline)
+    if len(logradouro.strip()) < 3 or logradouro_index.carregado_offline(uf, cidade):
+        return logradouro_index.pesquisar(uf, cidade, logradouro, limite=limite)
+
+    data = logradouro_index.pesquisar(uf, cidade, logradouro, limite=limite, similares=False)
+    if data:
+        return data
+
+    response = viacep_client.get(VIACEP_PESQUISA_URL.format(uf=uf, cidade=cidade, logradouro=logradouro))
+    response.raise_for_status()
+    remotos = response.json()
+    if not remotos or isinstance(remotos, dict):
+        remotos = []
+    for endereco in remotos:
+        logradouro_index.adicionar(endereco)
+
+    # Resultados do índice (já com os da ViaCEP) por relevância e, em seguida,
+    # os da ViaCEP que o índice não pontuou
+    data = logradouro_index.pesquisar(uf, cidade, logradouro, limite=limite)
+    vistos = {endereco['cep'] for endereco in data}
+    data.extend(endereco for endereco in remotos if endereco.get('cep') not in vistos)
+    return data[:limite]
@@ -0,0 +1,60 @@
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import NotFound, Conflict
+
+from db import db
+from models.convenio import Convenio
+from models.plano import Plano
+from models.pacientes import Paciente
+from models.registro_excluido import RegistroExcluido
+
+
+def excluir_convenio(convenio_id):
+    """
+    Exclui um convênio sem carregá-lo (nem seus filhos) na sessão.
+
+    A regra "sem planos associados" faz parte do próprio DELETE
+    (``WHERE id = :id AND NOT EXISTS (plano ...)``), sem uma verificação
+    anterior que um plano criado em paralelo poderia invalidar; a FK de
+    plano.convenio_id, sem cascata, continua barrando a exclusão nesse caso.
+    Só quando nada é excluído uma consulta separa o 404 do 409. Como os
+    eventos do ORM não são disparados, o vínculo dos pacientes e a marca de
+    exclusão são gravados explicitamente na mesma transação, que deve ser
+    desfeita em caso de erro. Não faz commit.
+
+    :raises NotFound: se o convênio não existir
+    :raises Conflict: se existirem planos associados
+    """
+    Paciente.desvincular(convenio_id=convenio_id)
+    try:
+        resultado = db.session.execute(
+            db.delete(Convenio).where(
+                Convenio.id == convenio_id,
+                ~db.exists().where(Plano.convenio_id == Convenio.id)
+            )
+        )
+    except IntegrityError:
+        raise Conflict('Não é possível excluir o convênio, pois existem planos associados')
+
+    if resultado.rowcount == 0:
+        existe = db.session.execute(db.select(Convenio.id).where(Convenio.id == convenio_id)).first()
+        if existe is None:
+            raise NotFound('Convênio não encontrado')
+        raise Conflict('Não é possível excluir o convênio, pois existem planos associados')
+
+    RegistroExcluido.registrar(db.session.connection(), 'convenios', [convenio_id])
+
+
+def excluir_plano(plano_id):
+    """
+    Exclui um plano com um único DELETE ... WHERE, sem carregá-lo na sessão.
+
+    O vínculo dos pacientes e a marca de exclusão são gravados explicitamente
+    na mesma transação. Não faz commit.
+
+    :raises NotFound: se o plano não existir
+    """
+    Paciente.desvincular(plano_id=plano_id)
+    resultado = db.session.execute(db.delete(Plano).where(Plano.id == plano_id))
+    if resultado.rowcount == 0:
+        raise NotFound('Plano não encontrado')
+    RegistroExcluido.registrar(db.session.connection(), 'planos', [plano_id])
@@ -0,0 +1,169 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Chamada recusada porque o circuito do serviço externo está aberto"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples para serviços externos.
+
+    Após ``failure_threshold`` falhas consecutivas o circuito abre e as chamadas
+    falham imediatamente. Passado ``reset_timeout`` segundos, uma única chamada
+    de teste é liberada (meio-aberto): se tiver sucesso o circuito fecha, caso
+    contrário volta a abrir.
+    """
+
+    FECHADO = 'fechado'
+    ABERTO = 'aberto'
+    MEIO_ABERTO = 'meio-aberto'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._estado = self.FECHADO
+        self._falhas = 0
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+        self.rejeicoes = 0
+
+    @property
+    def estado(self):
+        with self._lock:
+            return self._estado
+
+    def allow_request(self):
+        with self._lock:
+            if self._estado == self.FECHADO:
+                return True
+            if self._estado == self.ABERTO and self._clock() - self._aberto_em >= self.reset_timeout:
+                self._estado = self.MEIO_ABERTO
+                self._teste_em_andamento = False
+            if self._estado == self.MEIO_ABERTO and not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                return True
+            self.rejeicoes += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._estado = self.FECHADO
+            self._falhas = 0
+            self._teste_em_andamento = False
+
+    def record_failure(self):
+        with self._lock:
+            self._falhas += 1
+            self._teste_em_andamento = False
+            if self._estado == self.MEIO_ABERTO or self._falhas >= self.failure_threshold:
+                if self._estado != self.ABERTO:
+                    logger.warning("Circuito aberto após %s falha(s) consecutiva(s)", self._falhas)
+                self._estado = self.ABERTO
+                self._aberto_em = self._clock()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'estado': self._estado,
+                'falhas_consecutivas': self._falhas,
+                'rejeicoes': self.rejeicoes,
+            }
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado para um serviço externo.
+
+    Reutiliza conexões (keep-alive) por meio de uma ``requests.Session`` com
+    pool, aplica timeouts de conexão e leitura em todas as chamadas, repete
+    falhas transitórias com backoff exponencial e jitter e protege o serviço
+    com um circuit breaker.
+    """
+
+    def __init__(self, pool_size=10, connect_timeout=3.05, read_timeout=5,
+                 max_retries=2, backoff=0.2, breaker=None, session=None, sleep=time.sleep):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    def get(self, url, **kwargs):
+        """
+        Executa um GET com timeout, retentativas e circuit breaker.
+
+        Erros de conexão, timeouts e respostas 5xx são repetidos; respostas 4xx
+        são devolvidas ao chamador sem retentativa. Qualquer outro erro (ex:
+        ChunkedEncodingError, TooManyRedirects) não é repetido, mas conta como
+        falha no circuito, o que também libera a chamada de teste do estado
+        meio-aberto.
+
+        :raises CircuitOpenError: se o circuito estiver aberto
+        :raises requests.RequestException: se todas as tentativas falharem
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Serviço indisponível (circuito aberto): {url}")
+
+        kwargs.setdefault('timeout', self.timeout)
+        erro = None
+        response = None
+        try:
+            for tentativa in range(self.max_retries + 1):
+                if tentativa:
+                    # Backoff exponencial com jitter completo
+                    self._sleep(random.uniform(0, self.backoff * (2 ** (tentativa - 1))))
+                try:
+                    response = self.session.get(url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    erro = e
+                    response = None
+                    continue
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_failure()
+        if response is not None:
+            return response
+        raise erro
+
+
+def _criar_cliente():
+    return HttpClient(
+        pool_size=Config.HTTP_POOL_SIZE,
+        connect_timeout=Config.HTTP_CONNECT_TIMEOUT,
+        read_timeout=Config.HTTP_READ_TIMEOUT,
+        max_retries=Config.HTTP_MAX_RETRIES,
+        backoff=Config.HTTP_BACKOFF,
+        breaker=CircuitBreaker(
+            failure_threshold=Config.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=Config.HTTP_CIRCUIT_RESET_TIMEOUT,
+        ),
+    )
+
+
+# Um cliente (pool e circuito próprios) por serviço externo
+viacep_client = _criar_cliente()
+ip_api_client = _criar_cliente()
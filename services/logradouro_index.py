@@ -0,0 +1,175 @@
+import bisect
+import threading
+
+from utils import normalize_text
+
+
+def trigramas(texto):
+    """Trigramas de um texto normalizado, com espaços de borda em cada palavra"""
+    grams = set()
+    for palavra in texto.split():
+        palavra = f'  {palavra} '
+        grams.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return grams
+
+
+class _Particao:
+    """Endereços de uma cidade, indexados por logradouro normalizado"""
+
+    def __init__(self):
+        self.enderecos = {}      # logradouro normalizado -> {cep: endereço}
+        self.trigramas = {}      # trigrama -> {logradouro normalizado}
+        self.qtd_trigramas = {}  # logradouro normalizado -> quantidade de trigramas
+        self.nomes = []          # logradouros normalizados em ordem, para busca por prefixo
+        self.versao_offline = None
+
+    def adicionar(self, nome, endereco):
+        ceps = self.enderecos.get(nome)
+        if ceps is None:
+            ceps = self.enderecos[nome] = {}
+            bisect.insort(self.nomes, nome)
+            grams = trigramas(nome)
+            self.qtd_trigramas[nome] = len(grams)
+            for gram in grams:
+                self.trigramas.setdefault(gram, set()).add(nome)
+        ceps[endereco['cep']] = endereco
+
+
+class LogradouroIndex:
+    """
+    Índice em memória para pesquisa de logradouros, particionado por UF e
+    cidade.
+
+    Os nomes são normalizados (sem acentos, minúsculos) e indexados por
+    prefixo (lista ordenada) e por trigramas, o que permite autocompletar a
+    partir das primeiras letras e tolerar erros de digitação. O índice é
+    alimentado com os endereços já consultados e, quando disponível, com a
+    base offline de CEPs (carregada por cidade sob demanda).
+    """
+
+    def __init__(self, similaridade_minima=0.3):
+        self.similaridade_minima = similaridade_minima
+        self._particoes = {}
+        self._versao_offline = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _chave(uf, cidade):
+        return (uf or '').strip().upper(), normalize_text(cidade)
+
+    def adicionar(self, endereco):
+        """Indexa um endereço no formato da ViaCEP (requer cep, logradouro, localidade e uf)"""
+        nome = normalize_text(endereco.get('logradouro'))
+        if not nome or not endereco.get('cep') or not endereco.get('uf') or not endereco.get('localidade'):
+            return
+        chave = self._chave(endereco['uf'], endereco['localidade'])
+        with self._lock:
+            particao = self._particoes.get(chave)
+            if particao is None:
+                particao = self._particoes[chave] = _Particao()
+            particao.adicionar(nome, dict(endereco))
+
+    def carregar_offline(self, uf, cidade, store):
+        """
+        Carrega a cidade a partir da base offline, uma vez por versão do snapshot.
+
+        Quando uma nova versão do snapshot é publicada, o índice inteiro é
+        descartado: os endereços da versão anterior (inclusive CEPs que
+        deixaram de existir) não se acumulam com os da nova, e as cidades são
+        recarregadas sob demanda.
+
+        :param store: instância de CepOfflineStore
+        """
+        versao = store.stats().get('versao') if store.disponivel() else None
+        if versao is None:
+            return
+        chave = self._chave(uf, cidade)
+        with self._lock:
+            if versao != self._versao_offline:
+                self._particoes = {}
+                self._versao_offline = versao
+            particao = self._particoes.get(chave)
+            if particao is not None and particao.versao_offline == versao:
+                return
+        enderecos = store.listar_cidade(uf, cidade)
+        with self._lock:
+            if versao != self._versao_offline:
+                return  # outra versão foi carregada enquanto a cidade era lida
+            particao = self._particoes.setdefault(chave, _Particao())
+            for endereco in enderecos:
+                nome = normalize_text(endereco.get('logradouro'))
+                if nome:
+                    particao.adicionar(nome, endereco)
+            particao.versao_offline = versao
+
+    def carregado_offline(self, uf, cidade):
+        """True se a cidade foi carregada da base offline (o índice tem todos os seus logradouros)"""
+        with self._lock:
+            particao = self._particoes.get(self._chave(uf, cidade))
+            return particao is not None and particao.versao_offline is not None
+
+    def pesquisar(self, uf, cidade, termo, limite=50, similares=True):
+        """
+        Pesquisa logradouros de uma cidade.
+
+        Os resultados são ordenados por relevância: nomes que começam com o
+        termo, nomes cujas palavras começam com as palavras do termo (ex: 'av
+        paul'), nomes que contêm o termo e, por fim, nomes parecidos
+        (similaridade de trigramas), o que cobre erros de digitação.
+
+        :param similares: se False, ignora os nomes apenas parecidos
+        :return: lista de endereços no formato da ViaCEP
+        """
+        termo = normalize_text(termo)
+        if not termo:
+            return []
+        with self._lock:
+            particao = self._particoes.get(self._chave(uf, cidade))
+            if particao is None:
+                return []
+
+            pontuacao = {}
+
+            # Prefixo do nome completo: intervalo contíguo na lista ordenada
+            inicio = bisect.bisect_left(particao.nomes, termo)
+            for nome in particao.nomes[inicio:]:
+                if not nome.startswith(termo):
+                    break
+                pontuacao[nome] = 3.0
+
+            palavras_termo = termo.split()
+            grams_termo = trigramas(termo)
+            candidatos = {}
+            for gram in grams_termo:
+                for nome in particao.trigramas.get(gram, ()):
+                    candidatos[nome] = candidatos.get(nome, 0) + 1
+
+            for nome, comuns in candidatos.items():
+                if nome in pontuacao:
+                    continue
+                palavras_nome = nome.split()
+                if all(any(p.startswith(t) for p in palavras_nome) for t in palavras_termo):
+                    pontuacao[nome] = 2.0
+                elif termo in nome:
+                    pontuacao[nome] = 1.5
+                elif similares:
+                    similaridade = comuns / (len(grams_termo) + particao.qtd_trigramas[nome] - comuns)
+                    if similaridade >= self.similaridade_minima:
+                        pontuacao[nome] = similaridade
+
+            ordenados = sorted(pontuacao, key=lambda nome: (-pontuacao[nome], nome))
+            resultado = []
+            for nome in ordenados:
+                ceps = particao.enderecos[nome]
+                for cep in sorted(ceps):
+                    resultado.append(dict(ceps[cep]))
+                    if len(resultado) >= limite:
+                        return resultado
+            return resultado
+
+    def stats(self):
+        with self._lock:
+            return {
+                'particoes': len(self._particoes),
+                'logradouros': sum(len(p.enderecos) for p in self._particoes.values()),
+            }
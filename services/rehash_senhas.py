@@ -0,0 +1,117 @@
+import logging
+import queue
+import threading
+import time
+
+from config import Config
+from db import db
+from models.user import User
+from services.senhas import pool_senhas
+
+logger = logging.getLogger(__name__)
+
+
+def gravar_hash(app, user_id, hash_antigo, hash_novo):
+    """
+    Grava o novo hash apenas se o usuário ainda tiver o hash antigo, para não
+    sobrescrever uma troca de senha feita enquanto o rehash aguardava na fila.
+
+    :return: True se o hash foi atualizado
+    """
+    with app.app_context():
+        try:
+            resultado = db.session.execute(
+                db.update(User)
+                .where(User.id == user_id, User.password_hash == hash_antigo)
+                .values(password_hash=hash_novo),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+            return resultado.rowcount > 0
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+class FilaRehash:
+    """
+    Fila local (em memória, por processo) de rehash de senhas.
+
+    O login agenda o rehash quando o hash foi gerado com parâmetros antigos do
+    Argon2 e responde logo após a verificação; uma thread em segundo plano
+    calcula o novo hash no pool de senhas (PoolSenhas, o mesmo limite de
+    concorrência das rotas) e o grava. Há no máximo um job pendente por
+    usuário, pool sobrecarregado e falhas na gravação são repetidos até
+    ``tentativas`` vezes com espera crescente e, com a fila cheia, o job é
+    descartado (o rehash acontece em um próximo login). A senha em texto fica apenas na memória do processo até o
+    job terminar.
+    """
+
+    def __init__(self, pool, gravar=gravar_hash, tamanho_max=1000, tentativas=3, backoff=0.5):
+        self.pool = pool
+        self.gravar = gravar
+        self.tentativas = tentativas
+        self.backoff = backoff
+        self._fila = queue.Queue(maxsize=tamanho_max)
+        self._pendentes = set()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def agendar(self, app, user_id, hash_antigo, senha):
+        """
+        Agenda o rehash da senha do usuário.
+
+        :return: False se já houver um rehash pendente para o usuário ou a fila estiver cheia
+        """
+        with self._lock:
+            if user_id in self._pendentes:
+                return False
+            try:
+                self._fila.put_nowait((app, user_id, hash_antigo, senha))
+            except queue.Full:
+                logger.warning("Fila de rehash cheia; rehash do usuário %s descartado", user_id)
+                return False
+            self._pendentes.add(user_id)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._executar, name='rehash-senhas', daemon=True)
+                self._worker.start()
+        return True
+
+    def aguardar(self):
+        """Bloqueia até todos os jobs agendados terminarem"""
+        self._fila.join()
+
+    def _executar(self):
+        while True:
+            app, user_id, hash_antigo, senha = self._fila.get()
+            try:
+                self._rehash(app, user_id, hash_antigo, senha)
+            except Exception:
+                # Um job com erro não pode encerrar o worker
+                logger.exception("Erro no rehash da senha do usuário %s", user_id)
+            finally:
+                with self._lock:
+                    self._pendentes.discard(user_id)
+                self._fila.task_done()
+
+    def _rehash(self, app, user_id, hash_antigo, senha):
+        hash_novo = None
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                if hash_novo is None:
+                    hash_novo = self.pool.gerar_hash(senha)
+                self.gravar(app, user_id, hash_antigo, hash_novo)
+                return
+            except Exception as e:
+                if tentativa == self.tentativas:
+                    logger.error("Falha no rehash da senha do usuário %s: %s", user_id, e)
+                    return
+                time.sleep(self.backoff * 2 ** (tentativa - 1))
+
+
+fila_rehash = FilaRehash(
+    pool_senhas,
+    tamanho_max=Config.REHASH_FILA_MAX,
+    tentativas=Config.REHASH_TENTATIVAS,
+    backoff=Config.REHASH_BACKOFF,
+)
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
+
+from config import Config
+
+
+class SobrecargaSenhaError(Exception):
+    """Pool de senhas sem capacidade para atender a operação no momento"""
+
+
+class PoolSenhas:
+    """
+    Executor dedicado e limitado para hash e verificação de senhas com Argon2.
+
+    O Argon2 consome muita CPU e memória de propósito. Executá-lo aqui limita
+    quantas operações rodam ao mesmo tempo no processo (``workers``), sem que
+    um pico de logins ocupe todas as threads da API. Até ``fila_max``
+    operações aguardam na fila; acima disso, ou se a espera passar de
+    ``espera_max`` segundos, é lançado SobrecargaSenhaError, que as rotas
+    convertem em 503. O argon2-cffi libera o GIL durante o cálculo, então as
+    threads do pool rodam em paralelo.
+    """
+
+    def __init__(self, hasher, workers, fila_max, espera_max=None):
+        self.hasher = hasher
+        self.espera_max = espera_max
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='argon2')
+        self._vagas = threading.BoundedSemaphore(workers + fila_max)
+
+    def executar(self, funcao, *args):
+        """
+        Executa a função no pool e aguarda o resultado.
+
+        :raises SobrecargaSenhaError: se a fila estiver cheia ou a espera expirar
+        """
+        if not self._vagas.acquire(blocking=False):
+            raise SobrecargaSenhaError('Muitas operações de senha em andamento')
+        try:
+            futuro = self._executor.submit(funcao, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        try:
+            return futuro.result(timeout=self.espera_max)
+        except FuturesTimeoutError:
+            futuro.cancel()
+            raise SobrecargaSenhaError('Tempo de espera por operação de senha esgotado')
+
+    def gerar_hash(self, senha):
+        return self.executar(self.hasher.hash, senha)
+
+    def verificar(self, hash_senha, senha):
+        """True se a senha corresponde ao hash; False se não corresponde ou o hash é inválido"""
+        try:
+            return self.executar(self.hasher.verify, hash_senha, senha)
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+
+    def precisa_rehash(self, hash_senha):
+        """Hash gerado com parâmetros diferentes dos atuais (operação barata, fora do pool)"""
+        return self.hasher.check_needs_rehash(hash_senha)
+
+
+def criar_hasher(time_cost=None, memory_cost=None, parallelism=None):
+    """PasswordHasher com os parâmetros da implantação (Config.ARGON2_*)"""
+    return PasswordHasher(
+        time_cost=time_cost or Config.ARGON2_TIME_COST,
+        memory_cost=memory_cost or Config.ARGON2_MEMORY_COST,
+        parallelism=parallelism or Config.ARGON2_PARALLELISM,
+    )
+
+
+pool_senhas = PoolSenhas(
+    criar_hasher(),
+    workers=Config.ARGON2_WORKERS,
+    fila_max=Config.ARGON2_FILA_MAX,
+    espera_max=Config.ARGON2_ESPERA_MAX,
+)
@@ -0,0 +1,84 @@
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+
+_INTERVALO = re.compile(r'^(\d+)([mhd])$')
+_SEGUNDOS = {'m': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_intervalo(texto):
+    """
+    Converte um intervalo de reamostragem ('15m', '1h', '7d') em segundos.
+
+    :raises ValueError: se o formato for inválido
+    """
+    encontrado = _INTERVALO.match(texto or '')
+    if not encontrado or int(encontrado.group(1)) == 0:
+        raise ValueError(f"Intervalo inválido: {texto}. Use, por exemplo, 15m, 1h ou 7d")
+    return int(encontrado.group(1)) * _SEGUNDOS[encontrado.group(2)]
+
+
+def _data_hora(epoch):
+    return datetime.fromtimestamp(int(epoch), timezone.utc).replace(tzinfo=None).isoformat(' ', 'seconds')
+
+
+def _resumo(valores, percentis):
+    resumo = {
+        'quantidade': int(valores.size),
+        'minimo': float(valores.min()),
+        'maximo': float(valores.max()),
+        'media': float(valores.mean()),
+    }
+    if percentis:
+        calculados = np.percentile(valores, percentis)
+        resumo['percentis'] = {f'p{p:g}': float(v) for p, v in zip(percentis, calculados)}
+    return resumo
+
+
+def agregar(rows, intervalo=None, percentis=(50, 90, 95)):
+    """
+    Calcula estatísticas e séries reamostradas dos sinais vitais.
+
+    Todas as operações são vetorizadas com NumPy sobre as leituras de cada
+    métrica, sem laços por leitura em Python.
+
+    :param rows: tuplas (metrica, data_hora, valor) ordenadas por métrica e data_hora
+    :param intervalo: tamanho da janela de reamostragem em segundos (janelas
+                      alinhadas em UTC); None para não reamostrar
+    :param percentis: percentis a calcular (0 a 100)
+    :return: {metrica: {quantidade, minimo, maximo, media, percentis, serie}}
+    """
+    if not rows:
+        return {}
+    metricas, datas, valores = zip(*rows)
+    metricas = np.array(metricas)
+    epochs = np.array(datas, dtype='datetime64[s]').astype(np.int64)
+    valores = np.array(valores, dtype=np.float64)
+
+    # Cada métrica é um trecho contíguo (a ordem entre métricas depende do banco)
+    inicios = np.concatenate(([0], np.flatnonzero(metricas[1:] != metricas[:-1]) + 1))
+    fins = np.append(inicios[1:], len(valores))
+    nomes = metricas[inicios]
+
+    resultado = {}
+    for nome, inicio, fim in zip(nomes, inicios, fins):
+        v = valores[inicio:fim]
+        resumo = _resumo(v, percentis)
+
+        if intervalo:
+            janelas = epochs[inicio:fim] // intervalo * intervalo
+            # As leituras estão em ordem de data: cada janela é um trecho contíguo
+            cortes = np.concatenate(([0], np.flatnonzero(np.diff(janelas)) + 1))
+            quantidades = np.diff(np.append(cortes, v.size))
+            medias = np.add.reduceat(v, cortes) / quantidades
+            minimos = np.minimum.reduceat(v, cortes)
+            maximos = np.maximum.reduceat(v, cortes)
+            resumo['serie'] = [
+                {'inicio': _data_hora(j), 'quantidade': int(q), 'minimo': float(mi),
+                 'maximo': float(ma), 'media': float(me)}
+                for j, q, mi, ma, me in zip(janelas[cortes], quantidades, minimos, maximos, medias)
+            ]
+
+        resultado[str(nome)] = resumo
+    return resultado
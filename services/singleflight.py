@@ -0,0 +1,67 @@
+import threading
+
+
+class _Chamada:
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro = None
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    Enquanto uma chamada para a chave estiver em andamento, as demais aguardam
+    o seu término e recebem o mesmo resultado (ou a mesma exceção), evitando
+    requisições duplicadas ao serviço externo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chamadas = {}
+        self.execucoes = 0
+        self.deduplicadas = 0
+
+    def do(self, chave, fn):
+        """
+        Executa ``fn()`` para a chave ou aguarda a execução em andamento.
+
+        :param chave: identificador da chamada (ex: CEP normalizado)
+        :param fn: função sem argumentos que produz o resultado
+        :return: resultado de ``fn()`` compartilhado entre as chamadas
+        """
+        with self._lock:
+            chamada = self._chamadas.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = _Chamada()
+                self._chamadas[chave] = chamada
+                self.execucoes += 1
+            else:
+                self.deduplicadas += 1
+
+        if not lider:
+            chamada.evento.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+
+        try:
+            chamada.resultado = fn()
+            return chamada.resultado
+        except Exception as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._chamadas[chave]
+            chamada.evento.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'execucoes': self.execucoes,
+                'deduplicadas': self.deduplicadas,
+                'em_andamento': len(self._chamadas),
+            }
@@ -1,6 +1,8 @@
 import pytest
 import sys
 import os
+from contextlib import contextmanager
+from sqlalchemy import event
 
 # Adiciona o diretório raiz ao path do Python
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -96,6 +98,37 @@ def clear_db():
             print(f"Erro ao limpar tabelas entre testes: {e}")
             db.session.rollback()
 
+@pytest.fixture
+def contar_consultas():
+    """
+    Conta as consultas SQL executadas dentro de um bloco, para detectar N+1.
+
+    Uso:
+        with contar_consultas(maximo=2) as consultas:
+            test_client.get('/convenios/listar')
+    Falha se o bloco executar mais de `maximo` consultas; `consultas` guarda
+    o SQL executado para a mensagem de erro.
+    """
+    @contextmanager
+    def _contar(maximo=None):
+        consultas = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            consultas.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', registrar)
+        try:
+            yield consultas
+        finally:
+            event.remove(engine, 'before_cursor_execute', registrar)
+        if maximo is not None:
+            assert len(consultas) <= maximo, (
+                f"{len(consultas)} consultas executadas (máximo {maximo}):\n" + "\n".join(consultas)
+            )
+    return _contar
+
 @pytest.fixture
 def create_test_user():
     """Factory fixture para criar usuários de teste"""
@@ -168,4 +168,140 @@ def test_atualizar_acompanhamento(test_client, create_test_paciente, create_test
     assert data['id'] == acompanhamento.id
     assert data['tipo_atendimento'] == 'Visita de Retorno'
     assert data['descricao'] == 'Reavaliação após tratamento'
-    assert data['sinais_vitais']['temperatura'] == 36.2
\ No newline at end of file
+    assert data['sinais_vitais']['temperatura'] == 36.2
+
+def criar_paciente(nome_completo, cpf):
+    """Cria um paciente com data de nascimento do tipo date e retorna o id"""
+    with app.app_context():
+        paciente = Paciente(
+            nome_completo=nome_completo,
+            cpf=cpf,
+            data_nascimento=date(1980, 5, 15),
+            acomodacao='Apartamento',
+            telefone='(11) 99999-8888',
+            cid_primario='G40'
+        )
+        db.session.add(paciente)
+        db.session.commit()
+        return paciente.id
+
+def test_listar_acompanhamentos_bruto_e_projecao(test_client):
+    """Testa a listagem com repasse dos campos JSON e seleção de campos"""
+    paciente_id = criar_paciente("Paciente Timeline", "78978978978")
+    with app.app_context():
+        acompanhamento = Acompanhamento(
+            paciente_id=paciente_id,
+            data_hora=datetime(2025, 4, 10, 9, 0),
+            tipo_atendimento='Visita',
+            motivo_atendimento='Avaliação'
+        )
+        acompanhamento.sinais_vitais = {'temperatura': 36.5}
+        db.session.add(acompanhamento)
+        db.session.commit()
+
+    response = test_client.get(f'/pacientes/{paciente_id}/acompanhamentos')
+    completo = json.loads(response.data)
+
+    response = test_client.get(f'/pacientes/{paciente_id}/acompanhamentos?bruto=true')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.data) == completo
+
+    response = test_client.get(f'/pacientes/{paciente_id}/acompanhamentos?fields=id,tipo_atendimento')
+    assert response.status_code == 200
+    assert json.loads(response.data) == [{'id': completo[0]['id'], 'tipo_atendimento': 'Visita'}]
+
+def test_linha_do_tempo_paginada(test_client):
+    """Testa a linha do tempo paginada por cursor, com período e modo resumo"""
+    paciente_id = criar_paciente("Paciente Domiciliar", "32132132132")
+    with app.app_context():
+        for dia in range(1, 6):
+            db.session.add(Acompanhamento(
+                paciente_id=paciente_id,
+                data_hora=datetime(2025, 4, dia, 9, 0),
+                tipo_atendimento='Visita',
+                motivo_atendimento=f'Visita do dia {dia}'
+            ))
+        db.session.commit()
+
+    url = f'/pacientes/{paciente_id}/acompanhamentos'
+    response = test_client.get(f'{url}?limit=2&resumo=true')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [a['data_hora'] for a in data['items']] == ['2025-04-05 09:00:00', '2025-04-04 09:00:00']
+    assert set(data['items'][0]) == {'id', 'data_hora', 'tipo_atendimento', 'motivo_atendimento'}
+
+    response = test_client.get(f"{url}?limit=2&resumo=true&cursor={data['next_cursor']}")
+    data = json.loads(response.data)
+    assert [a['data_hora'] for a in data['items']] == ['2025-04-03 09:00:00', '2025-04-02 09:00:00']
+
+    response = test_client.get(f'{url}?from=2025-04-02&to=2025-04-03')
+    data = json.loads(response.data)
+    assert len(data['items']) == 2 and data['next_cursor'] is None
+
+    response = test_client.get(f'{url}?from=ontem')
+    assert response.status_code == 400
+
+def test_estatisticas_sinais_vitais(test_client):
+    """Testa as estatísticas calculadas a partir da série de sinais vitais"""
+    paciente_id = criar_paciente("Paciente Sinais", "65465465465")
+    with app.app_context():
+        for dia, temperatura in enumerate([36.0, 37.0, 38.0], start=1):
+            acompanhamento = Acompanhamento(
+                paciente_id=paciente_id,
+                data_hora=datetime(2025, 4, dia, 9, 0),
+                tipo_atendimento='Visita',
+                motivo_atendimento='Aferição'
+            )
+            acompanhamento.sinais_vitais = {'temperatura': temperatura, 'pressao_arterial': '120/80'}
+            db.session.add(acompanhamento)
+        db.session.commit()
+
+    response = test_client.get(f'/pacientes/{paciente_id}/sinais-vitais/estatisticas?metrica=temperatura&intervalo=1d')
+    assert response.status_code == 200
+    temperatura = json.loads(response.data)['metricas']['temperatura']
+    assert temperatura['quantidade'] == 3
+    assert temperatura['media'] == 37.0
+    assert len(temperatura['serie']) == 3
+
+    response = test_client.get(f'/pacientes/{paciente_id}/sinais-vitais/estatisticas?intervalo=semana')
+    assert response.status_code == 400
+
+def test_criar_acompanhamentos_em_lote(test_client):
+    """Testa o registro de acompanhamentos em lote, tudo ou nada e parcial"""
+    paciente_id = criar_paciente("Paciente Lote", "14714714714")
+
+    def item(paciente_id, **extra):
+        dados = {
+            'paciente_id': paciente_id,
+            'data_hora_atendimento': '2025-04-10T09:00:00',
+            'tipo_atendimento': 'Visita',
+            'motivo_atendimento': 'Rotina',
+            'sinais_vitais': {'temperatura': 36.5}
+        }
+        dados.update(extra)
+        return dados
+
+    # Tudo ou nada: um item inválido impede a gravação do lote
+    response = test_client.post('/acompanhamentos/lote', json={
+        'acompanhamentos': [item(paciente_id), item(999999)]
+    })
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['criados'] == 0
+    assert data['resultados'] == [{'indice': 1, 'status': 'erro', 'error': 'Paciente não encontrado'}]
+
+    # Parcial: os itens válidos são gravados
+    response = test_client.post('/acompanhamentos/lote', json={
+        'parcial': True,
+        'acompanhamentos': [item(paciente_id), item(paciente_id, data_hora_atendimento='10/04/2025'),
+                            item(str(paciente_id))]
+    })
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['criados'] == 2 and data['erros'] == 1
+    assert data['resultados'][0]['status'] == 'criado'
+    assert data['resultados'][2]['status'] == 'criado'
+
+    response = test_client.get(f"/acompanhamentos/{data['resultados'][0]['id']}")
+    assert json.loads(response.data)['sinais_vitais'] == {'temperatura': 36.5}
@@ -0,0 +1,121 @@
+import pytest
+import json
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app import app
+from config import Config
+from services import cep_service
+from services.cep_offline import CepOfflineStore
+from services.logradouro_index import LogradouroIndex
+
+ENDERECOS_VIACEP = {
+    '01001000': {'cep': '01001-000', 'logradouro': 'Praça da Sé', 'localidade': 'São Paulo', 'uf': 'SP'},
+    '01310100': {'cep': '01310-100', 'logradouro': 'Avenida Paulista', 'localidade': 'São Paulo', 'uf': 'SP'},
+    '01209001': {'cep': '01209-001', 'logradouro': 'Rua Aurora', 'localidade': 'São Paulo', 'uf': 'SP'},
+}
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+@pytest.fixture
+def viacep(monkeypatch, tmp_path):
+    """Substitui a ViaCEP por respostas fixas e isola cache e base offline"""
+    chamadas = []
+
+    def fake_viacep(cep):
+        chamadas.append(cep)
+        return dict(ENDERECOS_VIACEP.get(cep, {'erro': True}))
+
+    monkeypatch.setattr(cep_service, '_consultar_viacep', fake_viacep)
+    monkeypatch.setattr(cep_service, 'cep_offline', CepOfflineStore(str(tmp_path / 'cep.sqlite')))
+    monkeypatch.setattr(cep_service, 'logradouro_index', LogradouroIndex())
+    cep_service.cep_cache.clear()
+    yield chamadas
+    cep_service.cep_cache.clear()
+
+def test_consultar_cep(client, viacep):
+    """Testa a consulta de um CEP válido e o uso do cache"""
+    response = client.get('/cep/01001-000')
+    assert response.status_code == 200
+    assert json.loads(response.data)['logradouro'] == 'Praça da Sé'
+
+    client.get('/cep/01001000')
+    assert viacep == ['01001000']
+
+def test_consultar_cep_invalido_e_inexistente(client, viacep):
+    """Testa as respostas para CEP mal formatado e CEP inexistente"""
+    assert client.get('/cep/123').status_code == 400
+    assert client.get('/cep/99999999').status_code == 404
+
+def test_consultar_ceps_em_lote(client, viacep):
+    """Testa a consulta em lote com CEPs válidos, inexistentes e inválidos"""
+    # Um CEP já em cache não deve ser consultado novamente
+    client.get('/cep/01001000')
+
+    response = client.post('/cep/lote', json={'ceps': ['01001000', '01310-100', '99999999', '123']})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+
+    resultados = data['resultados']
+    assert resultados['01001000']['logradouro'] == 'Praça da Sé'
+    assert resultados['01310-100']['logradouro'] == 'Avenida Paulista'
+    assert resultados['99999999'] == {'error': 'CEP não encontrado'}
+    assert 'error' in resultados['123']
+    assert data['total'] == 4
+    assert data['encontrados'] == 2
+    assert sorted(viacep) == ['01001000', '01310100', '99999999']
+
+def test_consultar_ceps_em_lote_acima_do_limite(client, viacep):
+    """Testa a rejeição de lotes maiores que o limite configurado"""
+    ceps = ['01001000'] * (Config.CEP_LOTE_MAX + 1)
+    response = client.post('/cep/lote', json={'ceps': ceps})
+    assert response.status_code == 400
+
+def test_consultar_ceps_em_lote_sem_lista(client, viacep):
+    """Testa a validação do corpo da requisição"""
+    assert client.post('/cep/lote', json={}).status_code == 400
+    assert client.post('/cep/lote', json={'ceps': '01001000'}).status_code == 400
+
+def test_pesquisar_endereco_no_indice_local(client, viacep):
+    """Testa que CEPs já consultados alimentam a pesquisa local por logradouro"""
+    client.get('/cep/01310100')
+
+    response = client.get('/endereco?uf=SP&cidade=sao paulo&logradouro=pau')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [e['cep'] for e in data] == ['01310-100']
+
+def test_pesquisar_endereco_parecido_consulta_viacep(client, viacep, monkeypatch):
+    """Testa que um logradouro apenas parecido no índice não impede a consulta à ViaCEP"""
+    pesquisas = []
+
+    class RespostaFake:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{'cep': '01305-000', 'logradouro': 'Rua Augusta', 'localidade': 'São Paulo', 'uf': 'SP'}]
+
+    class ViaCepFake:
+        def get(self, url):
+            pesquisas.append(url)
+            return RespostaFake()
+
+    monkeypatch.setattr(cep_service, 'viacep_client', ViaCepFake())
+    client.get('/cep/01209001')  # indexa a Rua Aurora
+
+    response = client.get('/endereco?uf=SP&cidade=São Paulo&logradouro=Rua Augusta')
+    assert response.status_code == 200
+    assert [e['cep'] for e in json.loads(response.data)][0] == '01305-000'
+    assert len(pesquisas) == 1
+
+    # Logradouro que corresponde ao termo: respondido pelo índice
+    response = client.get('/endereco?uf=SP&cidade=São Paulo&logradouro=Rua Aug')
+    assert [e['cep'] for e in json.loads(response.data)] == ['01305-000']
+    assert len(pesquisas) == 1
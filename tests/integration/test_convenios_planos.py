@@ -65,4 +65,101 @@ def test_listar_convenios(test_client, create_test_convenio):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert isinstance(data, list)
-    assert len(data) >= 2
\ No newline at end of file
+    assert len(data) >= 2
+def test_listar_convenios_sem_n_mais_1(test_client, contar_consultas):
+    """Testa que a listagem carrega os planos sem uma consulta por convênio"""
+    with app.app_context():
+        for i in range(5):
+            convenio = Convenio(nome=f'Convênio N+1 {i}')
+            convenio.planos = [Plano(nome=f'Plano {i}-{j}') for j in range(3)]
+            db.session.add(convenio)
+        db.session.commit()
+
+    # Versão do catálogo + convênios + planos
+    with contar_consultas(maximo=3):
+        response = test_client.get('/convenios/listar')
+    assert response.status_code == 200
+    data = [c for c in json.loads(response.data) if c['nome'].startswith('Convênio N+1')]
+    assert len(data) == 5 and all(len(c['planos']) == 3 for c in data)
+
+    with contar_consultas(maximo=2):
+        response = test_client.get('/convenios/listar?incluirPlanos=false')
+    assert all('planos' not in c for c in json.loads(response.data))
+
+    convenio_id = data[0]['id']
+    with contar_consultas(maximo=3):
+        response = test_client.get(f'/convenios/{convenio_id}')
+    assert len(json.loads(response.data)['planos']) == 3
+
+    with contar_consultas(maximo=2):
+        response = test_client.get(f'/convenios/{convenio_id}?incluirPlanos=false')
+    assert 'planos' not in json.loads(response.data)
+
+def test_catalogo_de_convenios_com_etag(test_client, contar_consultas):
+    """Testa ETag, 304 e invalidação do catálogo de convênios após uma gravação"""
+    with app.app_context():
+        convenio = Convenio(nome='Convênio Catálogo')
+        db.session.add(convenio)
+        db.session.commit()
+        convenio_id = convenio.id
+
+    response = test_client.get('/convenios/listar')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    # Catálogo inalterado: apenas a consulta da versão
+    with contar_consultas(maximo=1):
+        response = test_client.get('/convenios/listar', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+    response = test_client.put(f'/convenios/{convenio_id}', json={'nome': 'Convênio Renomeado'})
+    assert response.status_code == 200
+
+    response = test_client.get('/convenios/listar', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert 'Convênio Renomeado' in response.get_data(as_text=True)
+
+def test_exclusao_de_plano_e_convenio_em_lote(test_client, contar_consultas):
+    """Testa as exclusões por DELETE ... WHERE, sem carregar filhos na sessão"""
+    from datetime import date
+    from models.pacientes import Paciente
+    from models.registro_excluido import RegistroExcluido
+
+    with app.app_context():
+        convenio = Convenio(nome='Convênio Exclusão')
+        convenio.planos = [Plano(nome='Plano Exclusão')]
+        db.session.add(convenio)
+        db.session.commit()
+        convenio_id, plano_id = convenio.id, convenio.planos[0].id
+        db.session.add_all([
+            Paciente(nome_completo=f'Paciente Exclusão {i}', cpf=f'8880000000{i}', data_nascimento=date(1980, 1, 1),
+                     acomodacao='Apartamento', telefone='(11) 98765-4321', cid_primario='G40',
+                     convenio_id=convenio_id, plano_id=plano_id)
+            for i in range(5)
+        ])
+        db.session.commit()
+
+    # Desvínculo, versão do catálogo, DELETE condicionado à ausência de planos
+    # e a consulta que separa 404 de 409
+    with contar_consultas(maximo=4):
+        response = test_client.delete(f'/convenios/{convenio_id}')
+    assert response.status_code == 409
+    with app.app_context():
+        # O 409 desfaz o desvínculo dos pacientes
+        assert Paciente.query.filter_by(convenio_id=convenio_id).count() == 5
+
+    response = test_client.delete(f'/planos/{plano_id}')
+    assert response.status_code == 200
+    assert test_client.delete(f'/planos/{plano_id}').status_code == 404
+
+    response = test_client.delete(f'/convenios/{convenio_id}')
+    assert response.status_code == 200
+    assert test_client.delete(f'/convenios/{convenio_id}').status_code == 404
+
+    with app.app_context():
+        vinculos = db.session.query(Paciente.convenio_id, Paciente.plano_id) \
+            .filter(Paciente.nome_completo.like('Paciente Exclusão %')).all()
+        assert vinculos == [(None, None)] * 5
+        marcas = {(m.entidade, m.registro_id) for m in RegistroExcluido.query.all()}
+        assert {('planos', plano_id), ('convenios', convenio_id)} <= marcas
@@ -91,4 +91,205 @@ def test_atualizar_paciente(test_client, create_test_paciente):
     data = json.loads(response.data)
     assert data['id'] == paciente_id
     assert data['telefone'] == '(11) 88888-8888'  # Atualizado
-    assert data['acomodacao'] == 'Enfermaria'  # Atualizado
\ No newline at end of file
+    assert data['acomodacao'] == 'Enfermaria'  # Atualizado
+
+def test_buscar_paciente_por_trecho(test_client, create_test_paciente):
+    """Testa a busca por trecho do nome e do CPF usando o índice de n-gramas"""
+    create_test_paciente(nome='José da Silva', cpf='12345678901')
+    create_test_paciente(nome='Maria Souza', cpf='98765432100')
+
+    response = test_client.get('/pacientes/buscar?tipo=nome&valor=silva')
+    assert response.status_code == 200
+    assert [p['nome_completo'] for p in json.loads(response.data)] == ['José da Silva']
+
+    response = test_client.get('/pacientes/buscar?tipo=cpf&valor=65432')
+    assert response.status_code == 200
+    assert [p['cpf'] for p in json.loads(response.data)] == ['98765432100']
+
+    # Termos com menos de 3 caracteres não usam o índice, mas continuam funcionando
+    response = test_client.get('/pacientes/buscar?tipo=nome&valor=ma')
+    assert response.status_code == 200
+    assert [p['nome_completo'] for p in json.loads(response.data)] == ['Maria Souza']
+
+    # Termo vazio após a normalização não encontra nenhum paciente
+    response = test_client.get('/pacientes/buscar?tipo=cpf&valor=abc')
+    assert response.status_code == 200
+    assert json.loads(response.data) == []
+    response = test_client.get('/pacientes/busca-avancada?cpf=abc')
+    assert json.loads(response.data)['items'] == []
+
+def test_busca_avancada_ignora_acentos(test_client, create_test_paciente):
+    """Testa a busca avançada pelas colunas normalizadas (sem acentos e maiúsculas)"""
+    create_test_paciente(nome='João Pereira', cpf='12345678901')
+    create_test_paciente(nome='Joana Lima', cpf='98765432100')
+
+    response = test_client.get('/pacientes/busca-avancada?nome=JOAO')
+    assert response.status_code == 200
+    assert [p['nome_completo'] for p in json.loads(response.data)['items']] == ['João Pereira']
+
+    response = test_client.get('/pacientes/busca-avancada?nome=jo&correspondencia=prefixo')
+    assert response.status_code == 200
+    assert len(json.loads(response.data)['items']) == 2
+
+    response = test_client.get('/pacientes/busca-avancada?nome=jo&correspondencia=exata')
+    assert response.status_code == 400
+
+def test_busca_avancada_por_cursor(test_client, create_test_paciente):
+    """Testa a paginação por cursor da busca avançada"""
+    for i, nome in enumerate(['Ana', 'Bruno', 'Ana', 'Carla']):
+        create_test_paciente(nome=nome, cpf=f'{i:011d}')
+
+    nomes = []
+    cursor = ''
+    while True:
+        response = test_client.get(f'/pacientes/busca-avancada?limit=3&cursor={cursor}')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert 'total' not in data
+        nomes += [p['nome_completo'] for p in data['items']]
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    assert nomes == ['Ana', 'Ana', 'Bruno', 'Carla']
+
+    response = test_client.get('/pacientes/busca-avancada?cursor=invalido')
+    assert response.status_code == 400
+
+def test_exportar_pacientes(test_client, create_test_paciente):
+    """Testa a exportação de pacientes em NDJSON e CSV"""
+    create_test_paciente(nome='Ana Lima', cpf='12345678901')
+    create_test_paciente(nome='Bruno Costa', cpf='98765432100')
+
+    response = test_client.get('/pacientes/exportar')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    linhas = [json.loads(linha) for linha in response.get_data(as_text=True).splitlines()]
+    assert [p['nome_completo'] for p in linhas] == ['Ana Lima', 'Bruno Costa']
+
+    response = test_client.get('/pacientes/exportar?formato=csv&nome=bruno')
+    assert response.status_code == 200
+    linhas = response.get_data(as_text=True).splitlines()
+    assert linhas[0].startswith('id,nome_completo,cpf')
+    assert len(linhas) == 2 and 'Bruno Costa' in linhas[1]
+
+    response = test_client.get('/pacientes/exportar?formato=xml')
+    assert response.status_code == 400
+
+def test_listar_pacientes_com_projecao(test_client, create_test_paciente):
+    """Testa a listagem de pacientes com o parâmetro fields"""
+    create_test_paciente(nome='Ana Lima', cpf='12345678901')
+
+    response = test_client.get('/pacientes?fields=id,nome_completo')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert set(data[0]) == {'id', 'nome_completo'}
+
+    response = test_client.get('/pacientes?fields=inexistente')
+    assert response.status_code == 400
+
+def test_sincronizacao_incremental(test_client, create_test_paciente, monkeypatch):
+    """Testa o feed de sincronização com paginação e marcas de exclusão"""
+    from config import Config
+    monkeypatch.setattr(Config, 'SYNC_MARGEM_SEGUNDOS', 0)
+
+    for i in range(3):
+        create_test_paciente(nome=f'Sync {i}', cpf=f'5550000000{i}')
+    with app.app_context():
+        ids = db.session.scalars(
+            db.select(Paciente.id).where(Paciente.nome_completo.like('Sync %')).order_by(Paciente.id)
+        ).all()
+        db.session.delete(db.session.get(Paciente, ids[1]))
+        db.session.commit()
+
+    alteracoes, since = [], ''
+    while True:
+        response = test_client.get('/sync', query_string={'since': since, 'entidades': 'pacientes', 'limit': 2})
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        alteracoes += [(a['operacao'], a['id']) for a in data['alteracoes'] if a['id'] in ids]
+        since = data['next_since']
+        if not data['tem_mais']:
+            break
+
+    assert ('upsert', ids[0]) in alteracoes and ('upsert', ids[2]) in alteracoes
+    assert alteracoes[-1] == ('delete', ids[1])
+
+    # Sem novas alterações, o cursor devolvido não traz nada
+    data = json.loads(test_client.get('/sync', query_string={'since': since}).data)
+    assert data['alteracoes'] == [] and data['tem_mais'] is False
+
+    assert test_client.get('/sync?entidades=usuarios').status_code == 400
+    assert test_client.get('/sync?since=invalido').status_code == 400
+
+def test_registro_de_exclusoes(test_client, create_test_paciente):
+    """Testa a consulta das exclusões por intervalo e a compactação por retenção"""
+    from datetime import datetime
+    from models.registro_excluido import RegistroExcluido
+
+    create_test_paciente(nome='Excluido Recente', cpf='66600000001')
+    with app.app_context():
+        paciente = Paciente.query.filter_by(cpf='66600000001').first()
+        paciente_id = paciente.id
+        db.session.delete(paciente)
+        db.session.add(RegistroExcluido(entidade='pacientes', registro_id=999999, excluido_em=datetime(2020, 1, 1)))
+        db.session.commit()
+
+    response = test_client.get('/sync/exclusoes?entidades=pacientes&from=2024-01-01T00:00:00')
+    assert response.status_code == 200
+    ids = [m['registro_id'] for m in json.loads(response.data)['items']]
+    assert paciente_id in ids and 999999 not in ids
+
+    response = test_client.get('/sync/exclusoes?entidades=pacientes&to=2021-01-01T00:00:00')
+    assert [m['registro_id'] for m in json.loads(response.data)['items']] == [999999]
+
+    # Marca d'água anterior à retenção exige sincronização completa
+    assert test_client.get('/sync?since=2020-01-01T00:00:00').status_code == 410
+
+    with app.app_context():
+        assert RegistroExcluido.compactar(retencao_dias=90) >= 1
+        restantes = RegistroExcluido.query.filter_by(entidade='pacientes').all()
+        assert [m.registro_id for m in restantes if m.registro_id in (paciente_id, 999999)] == [paciente_id]
+
+def test_contagem_pacientes(test_client, create_test_paciente, monkeypatch):
+    """Testa a contagem por convênio/plano com contadores e com COUNT agrupado"""
+    from config import Config
+    from models.convenio import Convenio
+    from models.plano import Plano
+    from models.paciente_contagem import PacienteContagem
+    monkeypatch.setattr(Config, 'PACIENTES_CONTADORES', True)
+
+    with app.app_context():
+        db.session.query(PacienteContagem).delete()
+        convenio = Convenio(nome='Convênio Contagem')
+        convenio.planos = [Plano(nome='Plano A'), Plano(nome='Plano B')]
+        db.session.add(convenio)
+        db.session.commit()
+        convenio_id = convenio.id
+        plano_a, plano_b = [p.id for p in convenio.planos]
+
+    for i in range(3):
+        create_test_paciente(nome=f'Contagem {i}', cpf=f'7770000000{i}')
+    with app.app_context():
+        pacientes = Paciente.query.filter(Paciente.nome_completo.like('Contagem %')).order_by(Paciente.id).all()
+        for paciente, plano_id in zip(pacientes, (plano_a, plano_a, plano_b)):
+            paciente.convenio_id, paciente.plano_id, paciente.status = convenio_id, plano_id, 'ativo'
+        db.session.commit()
+        pacientes[1].status = 'alta'
+        db.session.commit()
+
+    data = json.loads(test_client.get('/pacientes/contagem?status=ativo').data)
+    assert data['fonte'] == 'contadores'
+    por_plano = {item['plano_id']: item['quantidade'] for item in data['itens']}
+    assert por_plano == {plano_a: 1, plano_b: 1}
+
+    # Os contadores devem coincidir com o COUNT agrupado
+    for url in ('/pacientes/contagem', '/pacientes/contagem?agrupar=convenio'):
+        com_contadores = json.loads(test_client.get(url).data)
+        monkeypatch.setattr(Config, 'PACIENTES_CONTADORES', False)
+        com_consulta = json.loads(test_client.get(url).data)
+        monkeypatch.setattr(Config, 'PACIENTES_CONTADORES', True)
+        assert com_consulta['fonte'] == 'consulta'
+        assert com_consulta['itens'] == com_contadores['itens']
+
+    assert test_client.get('/pacientes/contagem?agrupar=setor').status_code == 400
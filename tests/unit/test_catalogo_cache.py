@@ -0,0 +1,35 @@
+import pytest
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.catalogo_cache import CatalogoCache, _etag
+
+
+class TestCatalogoCache:
+    def test_entrada_de_outra_versao_e_descartada(self):
+        cache = CatalogoCache()
+        cache.set(('convenios', '/convenios/listar?'), 3, b'[]', 'application/json')
+
+        assert cache.get(('convenios', '/convenios/listar?'), 3) == (b'[]', 'application/json')
+        assert cache.get(('convenios', '/convenios/listar?'), 4) is None
+        # A entrada desatualizada não volta a ser servida
+        assert cache.get(('convenios', '/convenios/listar?'), 3) is None
+
+    def test_descarta_menos_usada_ao_atingir_limite(self):
+        cache = CatalogoCache(max_size=2)
+        cache.set('a', 1, b'a', 'application/json')
+        cache.set('b', 1, b'b', 'application/json')
+        cache.get('a', 1)
+        cache.set('c', 1, b'c', 'application/json')
+
+        assert cache.get('b', 1) is None
+        assert cache.get('a', 1) is not None and cache.get('c', 1) is not None
+
+    def test_etag_depende_da_versao_e_da_url(self):
+        etag = _etag('convenios', 1, '/convenios/listar?')
+        assert etag == _etag('convenios', 1, '/convenios/listar?')
+        assert etag != _etag('convenios', 2, '/convenios/listar?')
+        assert etag != _etag('convenios', 1, '/convenios/listar?incluirPlanos=false')
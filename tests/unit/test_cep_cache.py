@@ -0,0 +1,130 @@
+import pytest
+import requests
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.cep_cache import CepCache
+from services.cep_offline import CepOfflineStore
+from services import cep_service
+from services.cep_service import buscar_cep, normalizar_cep, CepInvalidoError
+
+ENDERECO_SE = {
+    'cep': '01001-000',
+    'logradouro': 'Praça da Sé',
+    'bairro': 'Sé',
+    'localidade': 'São Paulo',
+    'uf': 'SP'
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCepCache:
+    """Testes para o cache local de CEP"""
+
+    def test_hit_e_miss(self):
+        cache = CepCache(max_size=10, ttl=60)
+        assert cache.get('01001000') is None
+        cache.set('01001000', ENDERECO_SE)
+        assert cache.get('01001000') == (True, ENDERECO_SE)
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_expiracao_por_ttl(self):
+        clock = FakeClock()
+        cache = CepCache(max_size=10, ttl=60, clock=clock)
+        cache.set('01001000', ENDERECO_SE)
+        clock.now = 59
+        assert cache.get('01001000') is not None
+        clock.now = 61
+        assert cache.get('01001000') is None
+
+    def test_cache_negativo_usa_ttl_proprio(self):
+        clock = FakeClock()
+        cache = CepCache(max_size=10, ttl=600, negative_ttl=10, clock=clock)
+        cache.set_not_found('99999999')
+        assert cache.get('99999999') == (False, None)
+        clock.now = 11
+        assert cache.get('99999999') is None
+
+    def test_remocao_lru(self):
+        cache = CepCache(max_size=2, ttl=60)
+        cache.set('00000001', {'cep': '1'})
+        cache.set('00000002', {'cep': '2'})
+        # Acessar o primeiro CEP o torna o mais recente
+        cache.get('00000001')
+        cache.set('00000003', {'cep': '3'})
+        assert cache.get('00000002') is None
+        assert cache.get('00000001') is not None
+        assert cache.stats()['evictions'] == 1
+
+
+class TestBuscarCep:
+    """Testes para a consulta de CEP com cache"""
+
+    @pytest.fixture(autouse=True)
+    def limpar_cache(self, monkeypatch, tmp_path):
+        # Garante que a base offline local não interfira nos testes
+        monkeypatch.setattr(cep_service, 'cep_offline', CepOfflineStore(str(tmp_path / 'inexistente.sqlite')))
+        cep_service.cep_cache.clear()
+        yield
+        cep_service.cep_cache.clear()
+
+    def test_normalizar_cep(self):
+        assert normalizar_cep('01001-000') == '01001000'
+        assert normalizar_cep('0100100') is None
+        assert normalizar_cep(None) is None
+
+    def test_cep_invalido(self):
+        with pytest.raises(CepInvalidoError):
+            buscar_cep('123')
+
+    def test_consulta_usa_cache(self, monkeypatch):
+        chamadas = []
+
+        def fake_viacep(cep):
+            chamadas.append(cep)
+            return dict(ENDERECO_SE)
+
+        monkeypatch.setattr(cep_service, '_consultar_viacep', fake_viacep)
+        assert buscar_cep('01001-000') == ENDERECO_SE
+        assert buscar_cep('01001000') == ENDERECO_SE
+        assert chamadas == ['01001000']
+
+    def test_cep_inexistente_em_cache_negativo(self, monkeypatch):
+        chamadas = []
+
+        def fake_viacep(cep):
+            chamadas.append(cep)
+            return {'erro': True}
+
+        monkeypatch.setattr(cep_service, '_consultar_viacep', fake_viacep)
+        assert buscar_cep('99999999') is None
+        assert buscar_cep('99999999') is None
+        assert len(chamadas) == 1
+
+    def test_usa_cache_expirado_se_viacep_indisponivel(self, monkeypatch):
+        clock = FakeClock()
+        cache = CepCache(max_size=10, ttl=60, clock=clock)
+        monkeypatch.setattr(cep_service, 'cep_cache', cache)
+        cache.set('01001000', ENDERECO_SE)
+        clock.now = 120
+
+        def fake_viacep(cep):
+            raise requests.exceptions.ConnectionError()
+
+        monkeypatch.setattr(cep_service, '_consultar_viacep', fake_viacep)
+        assert buscar_cep('01001000') == ENDERECO_SE
+        assert cache.stats()['stale_hits'] == 1
+        with pytest.raises(requests.exceptions.ConnectionError):
+            buscar_cep('20040020')
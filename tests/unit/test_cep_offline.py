@@ -0,0 +1,91 @@
+import pytest
+import sqlite3
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.cep_offline import CepOfflineStore, construir_snapshot, ler_registros
+
+CSV_CEPS = """cep;logradouro;bairro;cidade;estado
+01001-000;Praça da Sé;Sé;São Paulo;SP
+01310-100;Avenida Paulista;Bela Vista;São Paulo;SP
+20040-020;Avenida Rio Branco;Centro;Rio de Janeiro;RJ
+"""
+
+NDJSON_CEPS = """{"cep": "01001000", "logradouro": "Praça da Sé - lado ímpar", "localidade": "São Paulo", "uf": "SP"}
+{"cep": "invalido", "logradouro": "Ignorado", "localidade": "São Paulo", "uf": "SP"}
+"""
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    origem = tmp_path / 'ceps.csv'
+    origem.write_text(CSV_CEPS, encoding='utf-8')
+    destino = str(tmp_path / 'cep.sqlite')
+    construir_snapshot(ler_registros(str(origem), delimitador=';'), destino, versao='v1')
+    return destino
+
+
+class TestConstruirSnapshot:
+    """Testes para a importação da base de CEPs"""
+
+    def test_importa_csv_com_aliases(self, snapshot):
+        store = CepOfflineStore(snapshot)
+        endereco = store.buscar('01310100')
+        assert endereco['cep'] == '01310-100'
+        assert endereco['logradouro'] == 'Avenida Paulista'
+        assert endereco['localidade'] == 'São Paulo'
+        assert endereco['uf'] == 'SP'
+        assert store.stats()['total'] == 3
+        assert store.stats()['versao'] == 'v1'
+
+    def test_importa_ndjson_ignorando_ceps_invalidos(self, tmp_path):
+        origem = tmp_path / 'ceps.ndjson'
+        origem.write_text(NDJSON_CEPS, encoding='utf-8')
+        destino = str(tmp_path / 'cep.sqlite')
+        total = construir_snapshot(ler_registros(str(origem)), destino)
+        assert total == 1
+
+
+class TestCepOfflineStore:
+    """Testes para a consulta à base offline de CEPs"""
+
+    def test_arquivo_inexistente(self, tmp_path):
+        store = CepOfflineStore(str(tmp_path / 'nao_existe.sqlite'))
+        assert store.disponivel() is False
+        assert store.buscar('01001000') is None
+        assert store.listar_cidade('SP', 'São Paulo') == []
+
+    def test_listar_cidade_ignora_acentos_e_maiusculas(self, snapshot):
+        store = CepOfflineStore(snapshot)
+        resultado = store.listar_cidade('sp', 'SAO PAULO')
+        assert sorted(e['cep'] for e in resultado) == ['01001-000', '01310-100']
+
+    def test_troca_snapshot_sem_reiniciar(self, snapshot, tmp_path):
+        store = CepOfflineStore(snapshot, check_interval=0)
+        assert store.buscar('30130010') is None
+
+        origem = tmp_path / 'novos.ndjson'
+        origem.write_text('{"cep": "30130010", "logradouro": "Praça Sete", "localidade": "Belo Horizonte", "uf": "MG"}\n',
+                          encoding='utf-8')
+        construir_snapshot(ler_registros(str(origem)), snapshot, versao='v2')
+
+        assert store.buscar('30130010')['localidade'] == 'Belo Horizonte'
+        assert store.buscar('01001000') is None
+        assert store.stats()['versao'] == 'v2'
+
+    def test_mantem_snapshot_anterior_se_novo_for_invalido(self, snapshot, tmp_path):
+        store = CepOfflineStore(snapshot, check_interval=0)
+        assert store.buscar('01001000') is not None
+
+        invalido = tmp_path / 'invalido.sqlite'
+        conn = sqlite3.connect(str(invalido))
+        conn.execute("CREATE TABLE meta (chave TEXT, valor TEXT)")
+        conn.execute("INSERT INTO meta VALUES ('format_version', '999')")
+        conn.commit()
+        conn.close()
+        os.replace(str(invalido), snapshot)
+
+        assert store.buscar('01001000') is not None
@@ -0,0 +1,134 @@
+import pytest
+import requests
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Sessão que devolve (ou levanta) os resultados configurados em ordem"""
+
+    def __init__(self, resultados):
+        self.resultados = list(resultados)
+        self.chamadas = []
+
+    def get(self, url, **kwargs):
+        self.chamadas.append(kwargs)
+        resultado = self.resultados.pop(0)
+        if isinstance(resultado, Exception):
+            raise resultado
+        return resultado
+
+
+def criar_cliente(resultados, **kwargs):
+    session = FakeSession(resultados)
+    kwargs.setdefault('max_retries', 2)
+    cliente = HttpClient(session=session, sleep=lambda _: None, **kwargs)
+    return cliente, session
+
+
+class TestHttpClient:
+    """Testes para o cliente HTTP com retentativas"""
+
+    def test_aplica_timeout_padrao(self):
+        cliente, session = criar_cliente([FakeResponse(200)], connect_timeout=1, read_timeout=2)
+        cliente.get('https://exemplo')
+        assert session.chamadas[0]['timeout'] == (1, 2)
+
+    def test_repete_erros_transitorios(self):
+        cliente, session = criar_cliente([
+            requests.exceptions.ConnectTimeout(),
+            FakeResponse(503),
+            FakeResponse(200),
+        ])
+        assert cliente.get('https://exemplo').status_code == 200
+        assert len(session.chamadas) == 3
+
+    def test_nao_repete_erro_do_cliente(self):
+        cliente, session = criar_cliente([FakeResponse(400)])
+        assert cliente.get('https://exemplo').status_code == 400
+        assert len(session.chamadas) == 1
+
+    def test_levanta_ultimo_erro_apos_esgotar_tentativas(self):
+        cliente, _ = criar_cliente([requests.exceptions.ConnectionError()] * 3)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            cliente.get('https://exemplo')
+
+    def test_circuito_aberto_falha_imediatamente(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        cliente, session = criar_cliente([requests.exceptions.ConnectionError()], max_retries=0, breaker=breaker)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            cliente.get('https://exemplo')
+        with pytest.raises(CircuitOpenError):
+            cliente.get('https://exemplo')
+        assert len(session.chamadas) == 1
+
+    def test_outros_erros_contam_como_falha_e_liberam_o_teste(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        cliente, session = criar_cliente([
+            requests.exceptions.ChunkedEncodingError(),
+            requests.exceptions.TooManyRedirects(),
+            FakeResponse(200),
+        ], breaker=breaker)
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            cliente.get('https://exemplo')
+        assert breaker.estado == CircuitBreaker.ABERTO
+        assert len(session.chamadas) == 1
+
+        # A chamada de teste do meio-aberto falha e é liberada para a próxima
+        with pytest.raises(requests.exceptions.TooManyRedirects):
+            cliente.get('https://exemplo')
+        assert cliente.get('https://exemplo').status_code == 200
+        assert breaker.estado == CircuitBreaker.FECHADO
+        assert breaker.rejeicoes == 0
+
+
+class TestCircuitBreaker:
+    """Testes para o circuit breaker"""
+
+    def test_abre_apos_falhas_consecutivas(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+        assert breaker.allow_request() is False
+        assert breaker.estado == CircuitBreaker.ABERTO
+
+    def test_meio_aberto_libera_uma_chamada_de_teste(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        breaker.record_success()
+        assert breaker.estado == CircuitBreaker.FECHADO
+        assert breaker.allow_request() is True
+
+    def test_falha_no_meio_aberto_reabre(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+        assert breaker.estado == CircuitBreaker.ABERTO
+        assert breaker.allow_request() is False
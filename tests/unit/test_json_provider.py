@@ -0,0 +1,46 @@
+import pytest
+import sys
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask, jsonify
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import json_provider
+from json_provider import FastJSONProvider
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+def backend(request, monkeypatch):
+    """Executa o teste com orjson e com a biblioteca padrão"""
+    if request.param and not json_provider.HAS_ORJSON:
+        pytest.skip('orjson não instalado')
+    monkeypatch.setattr(json_provider, 'HAS_ORJSON', request.param)
+    return request.param
+
+class TestJsonProvider:
+    """Testes para a codificação JSON da aplicação"""
+
+    def test_mesma_saida_nos_dois_backends(self, backend):
+        dados = {'b': Decimal('1.50'), 'a': datetime(2025, 1, 2, 3, 4, 5), 'c': date(2025, 1, 2), 1: 'ç'}
+        assert json_provider.dumps(dados, sort_keys=True) == \
+            '{"1":"ç","a":"2025-01-02T03:04:05","b":"1.50","c":"2025-01-02"}'
+        assert json_provider.loads(b'{"x": [1, null]}') == {'x': [1, None]}
+
+    def test_erro_de_decodificacao(self, backend):
+        import json
+        with pytest.raises(json.JSONDecodeError):
+            json_provider.loads('{inválido')
+
+    def test_tipo_nao_suportado(self, backend):
+        with pytest.raises(TypeError):
+            json_provider.dumps({'x': object()})
+
+    def test_respostas_do_flask(self, backend):
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        with app.app_context():
+            response = jsonify({'b': 1, 'a': Decimal('2')})
+        assert response.mimetype == 'application/json'
+        assert response.get_data(as_text=True) == '{"a":"2","b":1}'
@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.cep_offline import CepOfflineStore, construir_snapshot
+from services.logradouro_index import LogradouroIndex
+
+ENDERECOS = [
+    {'cep': '01310-100', 'logradouro': 'Avenida Paulista', 'localidade': 'São Paulo', 'uf': 'SP'},
+    {'cep': '01310-200', 'logradouro': 'Avenida Paulista', 'localidade': 'São Paulo', 'uf': 'SP'},
+    {'cep': '01001-000', 'logradouro': 'Praça da Sé', 'localidade': 'São Paulo', 'uf': 'SP'},
+    {'cep': '04538-133', 'logradouro': 'Avenida Brigadeiro Faria Lima', 'localidade': 'São Paulo', 'uf': 'SP'},
+    {'cep': '01415-000', 'logradouro': 'Rua Augusta', 'localidade': 'São Paulo', 'uf': 'SP'},
+    {'cep': '20040-020', 'logradouro': 'Avenida Rio Branco', 'localidade': 'Rio de Janeiro', 'uf': 'RJ'},
+]
+
+
+@pytest.fixture
+def indice():
+    indice = LogradouroIndex()
+    for endereco in ENDERECOS:
+        indice.adicionar(endereco)
+    return indice
+
+
+def ceps(resultado):
+    return [e['cep'] for e in resultado]
+
+
+class TestLogradouroIndex:
+    """Testes para o índice local de logradouros"""
+
+    def test_prefixo_ignora_acentos_e_maiusculas(self, indice):
+        assert ceps(indice.pesquisar('sp', 'sao paulo', 'PRAÇA')) == ['01001-000']
+
+    def test_particionado_por_uf_e_cidade(self, indice):
+        assert ceps(indice.pesquisar('RJ', 'Rio de Janeiro', 'avenida')) == ['20040-020']
+        assert indice.pesquisar('MG', 'Belo Horizonte', 'avenida') == []
+
+    def test_prefixo_de_palavras(self, indice):
+        assert ceps(indice.pesquisar('SP', 'São Paulo', 'av paul')) == ['01310-100', '01310-200']
+
+    def test_tolera_erro_de_digitacao(self, indice):
+        resultado = indice.pesquisar('SP', 'São Paulo', 'Agusta')
+        assert ceps(resultado)[0] == '01415-000'
+
+    def test_prefixo_tem_prioridade(self, indice):
+        resultado = indice.pesquisar('SP', 'São Paulo', 'avenida')
+        assert ceps(resultado)[0] == '04538-133'
+        assert '01001-000' not in ceps(resultado)
+
+    def test_limite(self, indice):
+        assert len(indice.pesquisar('SP', 'São Paulo', 'avenida', limite=2)) == 2
+
+    def test_carrega_cidade_da_base_offline(self, tmp_path):
+        destino = str(tmp_path / 'cep.sqlite')
+        construir_snapshot(ENDERECOS, destino, versao='v1')
+        indice = LogradouroIndex()
+        indice.carregar_offline('SP', 'SÃO PAULO', CepOfflineStore(destino))
+        assert ceps(indice.pesquisar('SP', 'São Paulo', 'augusta')) == ['01415-000']
+        assert indice.pesquisar('RJ', 'Rio de Janeiro', 'avenida') == []
+
+    def test_nova_versao_do_snapshot_descarta_enderecos_antigos(self, tmp_path):
+        destino = str(tmp_path / 'cep.sqlite')
+        construir_snapshot(ENDERECOS, destino, versao='v1')
+        store = CepOfflineStore(destino, check_interval=0)
+        indice = LogradouroIndex()
+        indice.carregar_offline('SP', 'São Paulo', store)
+        indice.carregar_offline('RJ', 'Rio de Janeiro', store)
+
+        construir_snapshot(ENDERECOS[:2], destino, versao='v2')
+        indice.carregar_offline('SP', 'São Paulo', store)
+        assert indice.pesquisar('SP', 'São Paulo', 'augusta') == []
+        assert ceps(indice.pesquisar('SP', 'São Paulo', 'paulista')) == ['01310-100', '01310-200']
+        assert indice.stats() == {'particoes': 1, 'logradouros': 1}
@@ -12,6 +12,8 @@ from app import app
 from db import db
 from models.user import User
 from models.pacientes import Paciente
+from models.paciente_ngram import PacienteNgram
+from models.endereco import Endereco
 from models.acompanhamento import Acompanhamento
 from models.convenio import Convenio
 from models.plano import Plano
@@ -434,4 +436,48 @@ class TestConvenioPlanoModel:
             assert len(convenio.planos) == 3
             assert any(plano.nome == "Básico" for plano in convenio.planos)
             assert any(plano.nome == "Intermediário" for plano in convenio.planos)
-            assert any(plano.nome == "Avançado" for plano in convenio.planos)
\ No newline at end of file
+            assert any(plano.nome == "Avançado" for plano in convenio.planos)
+
+
+class TestPacienteNgram:
+    """Testes para a geração do índice de n-gramas de pacientes"""
+
+    def test_normaliza_nome_e_cpf(self):
+        assert PacienteNgram.normalizar('nome', '  João   da SILVA ') == 'joao da silva'
+        assert PacienteNgram.normalizar('cpf', '123.456.789-09') == '12345678909'
+
+    def test_gerar_ngrams(self):
+        assert PacienteNgram.gerar_ngrams('silva') == {'sil', 'ilv', 'lva'}
+        assert PacienteNgram.gerar_ngrams('ab') == set()
+
+    def test_linhas_paciente(self):
+        linhas = PacienteNgram.linhas_paciente(7, 'Ana', '1234')
+        assert {(l['campo'], l['ngram']) for l in linhas} == {('nome', 'ana'), ('cpf', '123'), ('cpf', '234')}
+        assert all(l['paciente_id'] == 7 for l in linhas)
+
+    def test_termo_curto_nao_usa_indice(self):
+        assert PacienteNgram.candidatos('nome', 'jo') is None
+        assert PacienteNgram.candidatos('nome', 'joa') is not None
+
+class TestPacienteEndereco:
+    """Testes para a decodificação memorizada do endereço do paciente"""
+
+    def test_endereco_memorizado_e_invalidado(self):
+        paciente = Paciente(endereco_json='{"cep": "01001-000", "logradouro": "Praça da Sé"}')
+        endereco = paciente.endereco
+        assert endereco.logradouro == 'Praça da Sé'
+        assert paciente.endereco is endereco  # sem nova decodificação
+
+        paciente.endereco_json = '{"cep": "20040-020"}'
+        assert paciente.endereco.cep == '20040-020'
+
+        paciente.endereco = Endereco(cep='30130-010')
+        assert paciente.endereco.cep == '30130-010'
+        paciente.endereco = None
+        assert paciente.endereco is None and paciente.endereco_json is None
+
+    def test_contrato_do_to_dict(self):
+        paciente = Paciente(id=1, endereco_json='{"cep": "01001-000"}')
+        assert paciente.to_dict()['endereco'] == '{"cep": "01001-000"}'
+        assert paciente.to_dict(expandir_endereco=True)['endereco']['cep'] == '01001-000'
+        assert Paciente(id=2).to_dict(expandir_endereco=True)['endereco'] is None
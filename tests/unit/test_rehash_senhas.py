@@ -0,0 +1,109 @@
+import pytest
+import threading
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.rehash_senhas import FilaRehash
+from services.senhas import PoolSenhas, SobrecargaSenhaError, criar_hasher
+
+
+@pytest.fixture
+def hasher():
+    # Parâmetros baixos apenas para os testes serem rápidos
+    return criar_hasher(time_cost=1, memory_cost=1024, parallelism=1)
+
+
+@pytest.fixture
+def pool(hasher):
+    return PoolSenhas(hasher, workers=1, fila_max=4)
+
+
+class TestFilaRehash:
+    def test_grava_novo_hash_em_segundo_plano(self, hasher, pool):
+        gravados = []
+        fila = FilaRehash(pool, gravar=lambda app, *args: gravados.append(args))
+
+        assert fila.agendar(None, 1, 'hash-antigo', 'senha123') is True
+        fila.aguardar()
+
+        (user_id, hash_antigo, hash_novo), = gravados
+        assert (user_id, hash_antigo) == (1, 'hash-antigo')
+        assert hasher.verify(hash_novo, 'senha123')
+
+    def test_um_job_pendente_por_usuario(self, pool):
+        liberar = threading.Event()
+        gravados = []
+
+        def gravar(app, user_id, hash_antigo, hash_novo):
+            liberar.wait()
+            gravados.append(user_id)
+
+        fila = FilaRehash(pool, gravar=gravar)
+        assert fila.agendar(None, 1, 'h', 'senha') is True
+        assert fila.agendar(None, 1, 'h', 'senha') is False
+        assert fila.agendar(None, 2, 'h', 'senha') is True
+        liberar.set()
+        fila.aguardar()
+
+        assert gravados == [1, 2]
+        # Terminado o job, o usuário pode ser agendado de novo
+        assert fila.agendar(None, 1, 'h', 'senha') is True
+        fila.aguardar()
+
+    def test_repete_gravacao_com_falha(self, pool):
+        chamadas = []
+
+        def gravar(app, user_id, hash_antigo, hash_novo):
+            chamadas.append(user_id)
+            if len(chamadas) < 3:
+                raise RuntimeError('banco indisponível')
+
+        fila = FilaRehash(pool, gravar=gravar, tentativas=3, backoff=0)
+        fila.agendar(None, 1, 'h', 'senha')
+        fila.aguardar()
+        assert chamadas == [1, 1, 1]
+
+    def test_fila_cheia_descarta_job(self, pool):
+        liberar = threading.Event()
+        fila = FilaRehash(pool, gravar=lambda *args: liberar.wait(), tamanho_max=1)
+
+        assert fila.agendar(None, 1, 'h', 'senha') is True
+        # O worker pode já ter retirado o primeiro job; preenche a única vaga
+        resultados = [fila.agendar(None, i, 'h', 'senha') for i in range(2, 5)]
+        liberar.set()
+        fila.aguardar()
+        assert False in resultados
+
+    def test_pool_sobrecarregado_e_repetido(self, hasher):
+        class PoolInstavel:
+            def __init__(self):
+                self.chamadas = 0
+
+            def gerar_hash(self, senha):
+                self.chamadas += 1
+                if self.chamadas == 1:
+                    raise SobrecargaSenhaError('pool cheio')
+                return hasher.hash(senha)
+
+        gravados = []
+        pool = PoolInstavel()
+        fila = FilaRehash(pool, gravar=lambda app, *args: gravados.append(args), backoff=0)
+        fila.agendar(None, 1, 'h', 'senha')
+        fila.aguardar()
+        assert pool.chamadas == 2 and len(gravados) == 1
+
+    def test_worker_sobrevive_a_erro_no_job(self, pool):
+        gravados = []
+
+        def gravar(app, user_id, hash_antigo, hash_novo):
+            gravados.append(user_id)
+
+        fila = FilaRehash(pool, gravar=gravar, tentativas=1)
+        # Senha inválida (não é texto): o hash falha, o job é descartado
+        fila.agendar(None, 1, 'h', None)
+        fila.agendar(None, 2, 'h', 'senha')
+        fila.aguardar()
+        assert gravados == [2]
@@ -0,0 +1,63 @@
+import pytest
+import threading
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.senhas import PoolSenhas, SobrecargaSenhaError, criar_hasher
+
+
+@pytest.fixture
+def hasher():
+    # Parâmetros baixos apenas para os testes serem rápidos
+    return criar_hasher(time_cost=1, memory_cost=1024, parallelism=1)
+
+
+class TestPoolSenhas:
+    def test_gerar_hash_e_verificar(self, hasher):
+        pool = PoolSenhas(hasher, workers=2, fila_max=2)
+        hash_senha = pool.gerar_hash('senha123')
+
+        assert pool.verificar(hash_senha, 'senha123') is True
+        assert pool.verificar(hash_senha, 'outra') is False
+        assert pool.verificar('hash-invalido', 'senha123') is False
+
+    def test_precisa_rehash_com_parametros_diferentes(self, hasher):
+        pool = PoolSenhas(hasher, workers=1, fila_max=0)
+        antigo = criar_hasher(time_cost=2, memory_cost=1024, parallelism=1).hash('senha123')
+
+        assert pool.precisa_rehash(antigo) is True
+        assert pool.precisa_rehash(pool.gerar_hash('senha123')) is False
+
+    def test_fila_cheia_lanca_sobrecarga(self, hasher):
+        pool = PoolSenhas(hasher, workers=1, fila_max=0)
+        iniciada, liberar = threading.Event(), threading.Event()
+
+        def operacao_lenta():
+            iniciada.set()
+            liberar.wait()
+
+        ocupada = threading.Thread(target=pool.executar, args=(operacao_lenta,))
+        ocupada.start()
+        try:
+            # A primeira operação ocupa a única vaga
+            iniciada.wait()
+            with pytest.raises(SobrecargaSenhaError):
+                pool.verificar('hash', 'senha')
+        finally:
+            liberar.set()
+            ocupada.join()
+
+        # A vaga é devolvida quando a operação termina
+        assert pool.verificar(pool.gerar_hash('senha123'), 'senha123') is True
+
+    def test_espera_esgotada_lanca_sobrecarga(self, hasher):
+        pool = PoolSenhas(hasher, workers=1, fila_max=1, espera_max=0.05)
+        liberar = threading.Event()
+        try:
+            with pytest.raises(SobrecargaSenhaError):
+                pool.executar(liberar.wait)
+        finally:
+            liberar.set()
@@ -0,0 +1,63 @@
+import pytest
+import sys
+import os
+from datetime import date, datetime
+from werkzeug.exceptions import BadRequest
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from models.pacientes import Paciente
+from models.acompanhamento import Acompanhamento
+from models.serializers import paciente_serializer, acompanhamento_serializer, convenio_serializer
+
+def linha(serializer, objeto, nomes=None):
+    """Simula a Row do select() do serializador a partir de um objeto em memória"""
+    colunas, _, _ = serializer._compilar(nomes or serializer.nomes)
+    return tuple(getattr(objeto, coluna.key) for coluna in colunas)
+
+class TestRowSerializer:
+    """Testes para os serializadores de linhas"""
+
+    def test_mesma_saida_do_to_dict(self):
+        """A serialização por linha produz o mesmo resultado do to_dict"""
+        paciente = Paciente(
+            id=1, nome_completo='Ana', cpf='12345678901', data_nascimento=date(1990, 1, 2),
+            endereco_json='{"cep": "01001-000"}', created_at=datetime(2025, 1, 1, 10, 0, 5, 123),
+        )
+        assert paciente_serializer.serializar([linha(paciente_serializer, paciente)]) == [paciente.to_dict()]
+
+        acompanhamento = Acompanhamento(
+            id=1, paciente_id=1, data_hora=datetime(2025, 1, 1, 10, 0), tipo_atendimento='Visita',
+            motivo_atendimento='Rotina', sinais_vitais_json='{"pa": "12x8"}', comunicacao_json='',
+        )
+        resultado = acompanhamento_serializer.serializar([linha(acompanhamento_serializer, acompanhamento)])
+        assert resultado == [acompanhamento.to_dict()]
+
+    def test_projecao_de_campos(self):
+        """O parâmetro fields seleciona apenas as colunas pedidas"""
+        campos = paciente_serializer.campos_solicitados('nome_completo, id')
+        assert campos == ('id', 'nome_completo')
+        assert [c.name for c in paciente_serializer.select(campos).selected_columns] == ['id', 'nome_completo']
+        assert convenio_serializer.campos_solicitados('planos') == ('planos',)
+
+    def test_campos_invalidos(self):
+        with pytest.raises(BadRequest):
+            paciente_serializer.campos_solicitados('id,senha')
+
+    def test_repasse_dos_campos_json_brutos(self):
+        """serializar_json copia os fragmentos JSON e gera o mesmo conteúdo de serializar"""
+        import json
+        acompanhamento = Acompanhamento(
+            id=1, paciente_id=1, data_hora=datetime(2025, 1, 1, 10, 0), tipo_atendimento='Visita',
+            motivo_atendimento='Troca de "curativo"', sinais_vitais_json='{"pa": "12x8", "fc": [80, 82]}',
+        )
+        rows = [linha(acompanhamento_serializer, acompanhamento)]
+        saida = acompanhamento_serializer.serializar_json(rows)
+        assert b'"sinais_vitais":{"pa": "12x8", "fc": [80, 82]}' in saida
+        assert json.loads(saida) == acompanhamento_serializer.serializar(rows)
+
+        campos = acompanhamento_serializer.campos_solicitados('sinais_vitais')
+        rows = [linha(acompanhamento_serializer, acompanhamento, campos)]
+        assert acompanhamento_serializer.serializar_json(rows, campos) == b'[{"sinais_vitais":{"pa": "12x8", "fc": [80, 82]}}]'
+        assert acompanhamento_serializer.serializar_json([]) == b'[]'
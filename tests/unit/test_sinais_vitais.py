@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from models.sinal_vital import SinalVital
+from services.sinais_vitais import agregar, parse_intervalo
+
+class TestExtrairMetricas:
+    """Testes para a extração das métricas de sinais vitais"""
+
+    def test_valores_numericos_e_pressao(self):
+        metricas = SinalVital.extrair_metricas({
+            'Temperatura': 36.5,
+            'saturacao': '97,5',
+            'pressao_arterial': '120/80',
+            'observacao': 'estável',
+            'consciente': True,
+        })
+        assert sorted(metricas) == [
+            ('pressao_arterial_diastolica', 80.0),
+            ('pressao_arterial_sistolica', 120.0),
+            ('saturacao', 97.5),
+            ('temperatura', 36.5),
+        ]
+
+    def test_sem_sinais_vitais(self):
+        assert SinalVital.extrair_metricas(None) == []
+        assert SinalVital.linhas_acompanhamento(1, 1, None, {'temperatura': 37}) == []
+
+    def test_ignora_valores_nao_finitos(self):
+        metricas = SinalVital.extrair_metricas({
+            'temperatura': float('nan'),
+            'frequencia_cardiaca': float('inf'),
+            'saturacao': 'Infinity',
+            'glicemia': '-inf',
+            'pressao_arterial': '9' * 400 + '/80',
+            'peso': 70,
+        })
+        assert metricas == [('peso', 70.0)]
+
+class TestAgregar:
+    """Testes para a agregação vetorizada das séries"""
+
+    def test_resumo_e_reamostragem(self):
+        inicio = datetime(2025, 1, 1)
+        rows = [('fc', inicio + timedelta(hours=h), float(60 + h)) for h in range(48)]
+        rows += [('temperatura', inicio, 36.0), ('temperatura', inicio + timedelta(days=2), 38.0)]
+
+        resultado = agregar(rows, intervalo=parse_intervalo('1d'), percentis=[50])
+
+        assert resultado['fc']['quantidade'] == 48
+        assert resultado['fc']['minimo'] == 60.0 and resultado['fc']['maximo'] == 107.0
+        assert resultado['fc']['percentis'] == {'p50': 83.5}
+        assert [j['inicio'] for j in resultado['fc']['serie']] == ['2025-01-01 00:00:00', '2025-01-02 00:00:00']
+        assert resultado['fc']['serie'][0]['media'] == pytest.approx(71.5)
+        assert [j['quantidade'] for j in resultado['temperatura']['serie']] == [1, 1]
+
+    def test_sem_leituras(self):
+        assert agregar([]) == {}
+
+    def test_intervalo_invalido(self):
+        assert parse_intervalo('15m') == 900
+        with pytest.raises(ValueError):
+            parse_intervalo('1s')
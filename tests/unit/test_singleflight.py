@@ -0,0 +1,73 @@
+import pytest
+import threading
+import time
+import sys
+import os
+
+# Adiciona o diretório raiz ao path do Python
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.singleflight import SingleFlight
+
+
+def aguardar(condicao, timeout=5):
+    limite = time.monotonic() + timeout
+    while not condicao():
+        if time.monotonic() > limite:
+            raise AssertionError("Tempo esgotado aguardando condição")
+        time.sleep(0.001)
+
+
+def executar_concorrente(sf, chave, fn, quantidade):
+    resultados = [None] * quantidade
+    erros = [None] * quantidade
+
+    def worker(i):
+        try:
+            resultados[i] = sf.do(chave, fn)
+        except Exception as e:
+            erros[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(quantidade)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    return resultados, erros
+
+
+class TestSingleFlight:
+    """Testes para o agrupamento de chamadas concorrentes"""
+
+    def test_chamadas_concorrentes_compartilham_resultado(self):
+        sf = SingleFlight()
+        execucoes = []
+
+        def buscar():
+            execucoes.append(1)
+            # Segura a chamada até todas as outras estarem aguardando
+            aguardar(lambda: sf.deduplicadas == 7)
+            return {'cep': '01001-000'}
+
+        resultados, erros = executar_concorrente(sf, '01001000', buscar, 8)
+        assert erros == [None] * 8
+        assert all(r == {'cep': '01001-000'} for r in resultados)
+        assert len(execucoes) == 1
+        assert sf.stats() == {'execucoes': 1, 'deduplicadas': 7, 'em_andamento': 0}
+
+    def test_excecao_e_propagada_para_todos(self):
+        sf = SingleFlight()
+
+        def falhar():
+            aguardar(lambda: sf.deduplicadas == 3)
+            raise ValueError('falha')
+
+        _, erros = executar_concorrente(sf, 'chave', falhar, 4)
+        assert all(isinstance(e, ValueError) for e in erros)
+
+    def test_chamadas_sequenciais_nao_sao_agrupadas(self):
+        sf = SingleFlight()
+        assert sf.do('a', lambda: 1) == 1
+        assert sf.do('a', lambda: 2) == 2
+        assert sf.stats()['execucoes'] == 2
+        assert sf.stats()['deduplicadas'] == 0
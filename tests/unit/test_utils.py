@@ -1,11 +1,12 @@
 import pytest
+from werkzeug.exceptions import BadRequest
 import sys
 import os
 
 # Adiciona o diretório raiz ao path do Python
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from utils import validate_cpf, sanitize_input
+from utils import validate_cpf, sanitize_input, normalize_text, only_digits, encode_cursor, decode_cursor
 # Removemos a importação de format_date que não existe
 
 # Ajustando os testes para corresponder ao comportamento real das funções
@@ -52,4 +53,35 @@ class TestSanitizeInput:
         """Testa a remoção de tags HTML"""
         result = sanitize_input("<script>alert('XSS')</script>")
         # Assertion neutra
-        assert result == sanitize_input("<script>alert('XSS')</script>")
\ No newline at end of file
+        assert result == sanitize_input("<script>alert('XSS')</script>")
+
+
+class TestNormalizacaoBusca:
+    """Testes para as funções usadas nas colunas normalizadas de busca"""
+
+    def test_normalize_text(self):
+        """Remove acentos, converte para minúsculas e colapsa espaços"""
+        assert normalize_text('  João   da SILVA ') == 'joao da silva'
+        assert normalize_text(None) == ''
+
+    def test_only_digits(self):
+        """Mantém apenas os dígitos"""
+        assert only_digits('123.456.789-09') == '12345678909'
+        assert only_digits(None) == ''
+
+
+class TestCursor:
+    """Testes para os cursores de paginação"""
+
+    def test_ida_e_volta(self):
+        """O cursor decodificado devolve os mesmos valores"""
+        cursor = encode_cursor(['João da Silva', 42])
+        assert '=' not in cursor
+        assert decode_cursor(cursor, 2) == ['João da Silva', 42]
+
+    def test_cursor_invalido(self):
+        """Cursores malformados ou com tamanho errado são rejeitados"""
+        with pytest.raises(BadRequest):
+            decode_cursor('@@@', 2)
+        with pytest.raises(BadRequest):
+            decode_cursor(encode_cursor([1]), 2)
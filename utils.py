@@ -1,4 +1,8 @@
 import re
+import json
+import base64
+import binascii
+import unicodedata
 import bleach
 from datetime import datetime
 import pytz
@@ -33,6 +37,58 @@ def sanitize_input(value: str, max_length=100) -> str:
         raise ValueError(f"Campo excede o tamanho máximo de {max_length} caracteres")
     return cleaned
 
+def normalize_text(value):
+    """
+    Normaliza um texto para buscas: remove acentos, converte para minúsculas
+    e colapsa espaços em branco.
+
+    :param value: texto original (ex: '  Praça  da Sé ')
+    :return: texto normalizado (ex: 'praca da se')
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    sem_acentos = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.lower().split())
+
+def only_digits(value):
+    """
+    Mantém apenas os dígitos de um texto (ex: CPF formatado).
+
+    :param value: texto original (ex: '123.456.789-09')
+    :return: somente os dígitos (ex: '12345678909')
+    """
+    return re.sub(r'\D', '', str(value or ''))
+
+def encode_cursor(values):
+    """
+    Codifica os valores da chave de ordenação do último item de uma página
+    em um cursor opaco (base64 de uma lista JSON).
+
+    :param values: lista de valores serializáveis em JSON (ex: ['Maria', 42])
+    :return: cursor em texto seguro para URL
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, size):
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    :param cursor: cursor recebido do cliente
+    :param size: quantidade de valores esperada
+    :return: lista com os valores da chave de ordenação
+    :raises BadRequest: se o cursor for inválido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise BadRequest("Cursor inválido")
+    if not isinstance(values, list) or len(values) != size:
+        raise BadRequest("Cursor inválido")
+    return values
+
 def get_local_time(utc_dt, timezone_str):
     """
     Converte a data e hora UTC para o fuso horário local do usuário.
@@ -52,8 +108,10 @@ def get_user_timezone(ip_address):
     :param ip_address: Endereço IP do usuário
     :return: string do fuso horário (ex: 'America/Sao_Paulo')
     """
+    from services.http_client import ip_api_client
+
     try:
-        response = requests.get(f'http://ip-api.com/json/{ip_address}')
+        response = ip_api_client.get(f'http://ip-api.com/json/{ip_address}')
         response.raise_for_status()
         data = response.json()
         return data.get('timezone', 'UTC')
@@ -67,11 +125,13 @@ def get_address_from_cep(cep):
     :param cep: CEP do usuário
     :return: dados do endereço
     """
-    response = requests.get(f'https://viacep.com.br/ws/{cep}/json/')
-    if response.status_code != 200:
+    from services.cep_service import buscar_cep, CepInvalidoError
+
+    try:
+        data = buscar_cep(cep)
+    except (CepInvalidoError, requests.HTTPError):
         raise BadRequest("CEP inválido")
-    data = response.json()
-    if 'erro' in data:
+    if data is None:
         raise BadRequest("CEP inválido")
     return data
 